@@ -0,0 +1,261 @@
+"""
+Stage benchmark for the analysis pipeline on synthetic data.
+
+For every BOM size, a seeded BOM and supplier catalog are generated
+(bomer.synthetic) and written to a temporary directory, then each stage of
+run_analysis is timed (best of --repeat) and, in a separate pass, its peak
+traced memory is measured: load, normalize, validate, suppliers, optimize,
+cost, risk and write.
+
+The memory pass also reports the in-memory size of the BOM as loaded
+(load) and after normalize_bom_columns() has compacted it (normalize).
+
+Prints one table per size plus the scaling exponent of every stage (slope
+of log time over log size), and compares against a stored baseline:
+
+    python benchmarks/bench.py --sizes 1000,10000,100000 --save-baseline baseline.json
+    python benchmarks/bench.py --sizes 1000,10000,100000 --baseline baseline.json
+
+Exits with status 1 if a stage got slower (or used more memory) than the
+baseline by more than --tolerance.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from bomer.core.catalog_cache import load_catalog_for_config
+from bomer.core.loader import load_bom
+from bomer.core.schema import frame_memory_mb, normalize_bom_columns, validate_bom
+from bomer.engines.cost import analyze_costs
+from bomer.engines.optimizer import optimize_bom
+from bomer.engines.risk import analyze_risk
+from bomer.reporting.report_writer import write_analysis_reports
+from bomer.synthetic import generate_bom, generate_part_numbers, generate_suppliers
+
+STAGES = ("load", "normalize", "validate", "suppliers", "optimize", "cost", "risk", "write")
+
+# Stages whose DataFrame output size is reported
+FRAME_STAGES = ("load", "normalize")
+
+# Differences below these are noise, whatever the relative change
+MIN_SECONDS_DELTA = 0.02
+MIN_MB_DELTA = 1.0
+
+# No catalog cache: the suppliers stage then measures parsing the JSON
+CONFIG: Dict[str, Any] = {"suppliers": {"cache": False}}
+
+
+def _pipeline(workdir: Path) -> List[Tuple[str, Callable[[Dict[str, Any]], Any]]]:
+    """
+    The run_analysis steps, each reading its inputs from and storing its
+    output in a shared state dict.
+    """
+    output_dir = workdir / "output"
+    output_dir.mkdir(exist_ok=True)
+
+    def write(state: Dict[str, Any]) -> None:
+        write_analysis_reports(
+            {
+                "optimized_bom": state["optimize"],
+                "cost_summary": state["cost"],
+                "risk_summary": state["risk"],
+                "issues": state["validate"],
+                "bom_path": workdir / "bom.csv",
+                "suppliers_path": workdir / "suppliers.json",
+            },
+            output_dir,
+        )
+
+    return [
+        ("load", lambda s: load_bom(workdir / "bom.csv")),
+        ("normalize", lambda s: normalize_bom_columns(s["load"], config=CONFIG)),
+        ("validate", lambda s: validate_bom(s["normalize"])),
+        ("suppliers", lambda s: load_catalog_for_config(workdir / "suppliers.json", CONFIG)),
+        ("optimize", lambda s: optimize_bom(s["normalize"])),
+        ("cost", lambda s: analyze_costs(s["optimize"], s["suppliers"], config=CONFIG)),
+        ("risk", lambda s: analyze_risk(s["optimize"], s["suppliers"], config=CONFIG)),
+        ("write", write),
+    ]
+
+
+def _row_count(value: Any) -> int:
+    """
+    Rows a stage produced: DataFrame / issue list length, or the number
+    of lines of a cost or risk summary.
+    """
+    table = getattr(value, "line_table", None)
+    if table is not None:
+        return len(table)
+    return len(value) if hasattr(value, "__len__") else 0
+
+
+def _run_once(workdir: Path, measure_memory: bool) -> Dict[str, Dict[str, float]]:
+    state: Dict[str, Any] = {}
+    stats: Dict[str, Dict[str, float]] = {}
+    if measure_memory:
+        tracemalloc.start()
+    try:
+        for name, stage in _pipeline(workdir):
+            if measure_memory:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            state[name] = stage(state)
+            elapsed = time.perf_counter() - started
+            stats[name] = {"seconds": elapsed, "rows": _row_count(state[name])}
+            if measure_memory:
+                stats[name]["peak_mb"] = (tracemalloc.get_traced_memory()[1] - before) / 2**20
+                if name in FRAME_STAGES:
+                    stats[name]["frame_mb"] = frame_memory_mb(state[name])
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+    return stats
+
+
+def bench_size(n_lines: int, args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    parts = generate_part_numbers(max(int(n_lines * args.parts_ratio), 1), seed=args.seed)
+    suppliers = generate_suppliers(
+        parts, n_suppliers=args.suppliers, coverage=args.coverage, seed=args.seed + 1
+    )
+    bom = generate_bom(
+        parts,
+        n_lines,
+        duplicate_rate=args.duplicate_rate,
+        messiness=args.messiness,
+        seed=args.seed + 2,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="bomer-bench-") as tmp:
+        workdir = Path(tmp)
+        bom.to_csv(workdir / "bom.csv", index=False)
+        with (workdir / "suppliers.json").open("w", encoding="utf-8") as f:
+            json.dump(suppliers, f)
+
+        runs = [_run_once(workdir, measure_memory=False) for _ in range(args.repeat)]
+        stats = {
+            name: {
+                "seconds": round(min(run[name]["seconds"] for run in runs), 4),
+                "rows": runs[0][name]["rows"],
+            }
+            for name in STAGES
+        }
+        if not args.no_memory:
+            memory = _run_once(workdir, measure_memory=True)
+            for name in STAGES:
+                stats[name]["peak_mb"] = round(memory[name]["peak_mb"], 2)
+                if "frame_mb" in memory[name]:
+                    stats[name]["frame_mb"] = round(memory[name]["frame_mb"], 2)
+    return stats
+
+
+def scaling_exponents(results: Dict[str, Dict[str, Dict[str, float]]]) -> Dict[str, float]:
+    """
+    Per stage, the slope of log(seconds) over log(size): ~1 is linear,
+    ~2 quadratic. Needs at least two sizes.
+    """
+    sizes = np.array([int(size) for size in results], dtype=float)
+    if len(sizes) < 2:
+        return {}
+    exponents = {}
+    for name in STAGES:
+        seconds = np.array([results[size][name]["seconds"] for size in results], dtype=float)
+        slope = np.polyfit(np.log(sizes), np.log(np.maximum(seconds, 1e-6)), 1)[0]
+        exponents[name] = round(float(slope), 2)
+    return exponents
+
+
+def compare(
+    results: Dict[str, Dict[str, Dict[str, float]]],
+    baseline: Dict[str, Dict[str, Dict[str, float]]],
+    tolerance: float,
+) -> List[str]:
+    """
+    Regressions of `results` against `baseline`, as readable lines.
+    """
+    regressions = []
+    for size, stages in results.items():
+        for name, stats in stages.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            for metric, floor in (
+                ("seconds", MIN_SECONDS_DELTA),
+                ("peak_mb", MIN_MB_DELTA),
+                ("frame_mb", MIN_MB_DELTA),
+            ):
+                if metric not in stats or metric not in base:
+                    continue
+                new, old = stats[metric], base[metric]
+                if new > old * (1 + tolerance) and new - old > floor:
+                    regressions.append(f"{size} lines / {name}: {metric} {old} -> {new}")
+    return regressions
+
+
+def _print_table(size: str, stages: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{size} lines")
+    print(f"  {'stage':<10}{'seconds':>10}{'peak MB':>10}{'rows':>10}{'frame MB':>10}")
+    for name, stats in stages.items():
+        frame = f"{stats['frame_mb']:>10.2f}" if "frame_mb" in stats else ""
+        print(
+            f"  {name:<10}{stats['seconds']:>10.4f}{stats.get('peak_mb', float('nan')):>10.2f}"
+            f"{int(stats['rows']):>10}{frame}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the bomer analysis stages.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated BOM line counts.")
+    parser.add_argument("--parts-ratio", type=float, default=2.0, help="Catalog parts per BOM line.")
+    parser.add_argument("--suppliers", type=int, default=10, help="Number of suppliers.")
+    parser.add_argument("--coverage", type=float, default=0.9, help="Share of parts with a price.")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1, help="Share of repeated BOM parts.")
+    parser.add_argument("--messiness", type=float, default=0.2, help="Column alias / value messiness (0-1).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per size (best is kept).")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the memory profiling pass.")
+    parser.add_argument("--json", help="Write results and scaling exponents to this file.")
+    parser.add_argument("--baseline", help="Compare against this results file.")
+    parser.add_argument("--save-baseline", help="Store the results as a baseline file.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown.")
+    args = parser.parse_args()
+
+    results = {}
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        results[str(size)] = bench_size(size, args)
+        _print_table(str(size), results[str(size)])
+
+    exponents = scaling_exponents(results)
+    if exponents:
+        print("\nScaling exponent (time ~ size^k):")
+        for name, k in exponents.items():
+            print(f"  {name:<10}{k:>6}")
+
+    document = {"results": results, "scaling": exponents}
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(document, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
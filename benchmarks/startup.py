@@ -0,0 +1,95 @@
+"""
+CLI startup benchmark.
+
+For each subcommand, measures in fresh interpreters:
+- help: wall time of `bomer <subcommand> --help` (argument parsing only)
+- imports: wall time of importing the modules its handler loads
+
+Usage:
+    python benchmarks/startup.py [--repeat 10] [--json results.json]
+"""
+
+import argparse
+import ast
+import inspect
+import json
+import statistics
+import subprocess
+import sys
+import textwrap
+import time
+from typing import Dict, List
+
+from bomer import cli
+
+# bomer.cli handles `bomer <command> [<subcommand>]` in
+# _run_<command>[_<subcommand>]
+HANDLER_PREFIX = "_run_"
+
+
+def subcommand_modules() -> Dict[str, List[str]]:
+    """
+    bomer modules each subcommand handler in bomer.cli imports, read
+    from the handlers' own lazy imports so the table cannot drift.
+    """
+    modules: Dict[str, List[str]] = {}
+    for name, handler in inspect.getmembers(cli, inspect.isfunction):
+        if not name.startswith(HANDLER_PREFIX):
+            continue
+        imported = set()
+        for node in ast.walk(ast.parse(textwrap.dedent(inspect.getsource(handler)))):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                imported.add(node.module)
+            elif isinstance(node, ast.Import):
+                imported.update(alias.name for alias in node.names)
+        command = name[len(HANDLER_PREFIX):].replace("_", " ")
+        modules[command] = sorted(module for module in imported if module.startswith("bomer."))
+    return modules
+
+
+def _time_command(argv: List[str], repeat: int) -> float:
+    """
+    Median wall time in milliseconds of running `argv` `repeat` times.
+    """
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(argv, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return round(statistics.median(samples), 1)
+
+
+def run(repeat: int) -> Dict[str, Dict[str, float]]:
+    cli = [sys.executable, "-m", "bomer.cli"]
+    results: Dict[str, Dict[str, float]] = {
+        "--version": {"help": _time_command(cli + ["--version"], repeat)},
+        "baseline": {"help": _time_command([sys.executable, "-c", "pass"], repeat)},
+    }
+    for command, modules in subcommand_modules().items():
+        imports = "; ".join(f"import {module}" for module in modules)
+        results[command] = {
+            "help": _time_command(cli + command.split() + ["--help"], repeat),
+            "imports": _time_command([sys.executable, "-c", imports], repeat),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark bomer CLI startup per subcommand.")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement (default: 10).")
+    parser.add_argument("--json", help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(f"{'command':<18}{'help ms':>10}{'imports ms':>12}")
+    for command, timings in results.items():
+        imports = timings.get("imports")
+        print(f"{command:<18}{timings['help']:>10}{'' if imports is None else imports:>12}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
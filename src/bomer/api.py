@@ -1,76 +1,379 @@
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
+from bomer.core.catalog import SupplierCatalog
+from bomer.core.catalog_cache import cache_settings, load_catalog_for_config
 from bomer.core.config import load_config
-from bomer.core.loader import load_bom, load_suppliers
-from bomer.core.schema import normalize_bom_columns, validate_bom
+from bomer.core.exceptions import BomStructureError, ConfigError
+from bomer.core.loader import iter_bom_chunks, load_bom
+from bomer.core.scheduler import Stage, StageScheduler, pipeline_settings
+from bomer.core.schema import (
+    ChunkedValidator,
+    bom_columns,
+    normalize_bom_columns,
+    schema_settings,
+    validate_bom,
+)
+from bomer.core.validation import clean_strings
 from bomer.engines.cost import analyze_costs
-from bomer.engines.optimizer import optimize_bom
+from bomer.engines.hierarchy import BomTree, analyze_hierarchy, build_tree, explode_bom, is_hierarchical
+from bomer.engines.optimizer import QuantityAccumulator, optimize_bom
 from bomer.engines.risk import analyze_risk
+from bomer.engines.sweep import sweep_scenarios
+from bomer.instrumentation import StageRecorder
+from bomer.reporting.formats import TableWriter
+from bomer.reporting.report_writer import write_normalized_bom
+
+
+def resolve_suppliers_path(
+    suppliers_path: Optional[Path],
+    config: Dict[str, Any],
+) -> Path:
+    """
+    Use the given suppliers path, else suppliers.path from config, else
+    data/suppliers.json.
+    """
+    if suppliers_path is not None:
+        return suppliers_path
+    suppliers_cfg = config.get("suppliers", {})
+    return Path(suppliers_cfg.get("path", "data/suppliers.json"))
+
+
+def _stream_bom(
+    bom_path: Path,
+    chunksize: int,
+    config: Dict[str, Any],
+    normalized_bom_path: Optional[Path],
+) -> Tuple[List[Dict[str, Any]], pd.DataFrame]:
+    validator = ChunkedValidator()
+    accumulator = QuantityAccumulator()
+    writer = TableWriter(normalized_bom_path) if normalized_bom_path is not None else None
+
+    try:
+        for chunk in iter_bom_chunks(bom_path, chunksize, columns=bom_columns(config)):
+            normalized = normalize_bom_columns(chunk, config=config)
+            if is_hierarchical(normalized):
+                raise BomStructureError(
+                    "Hierarchical BOMs (Parent column) need the whole tree in memory; "
+                    "analyse them without streaming."
+                )
+            validator.add(normalized)
+            accumulator.add(normalized)
+            if writer is not None:
+                writer.write(normalized)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return validator.finish(), accumulator.result()
+
+
+def _needs_bom_parts(config: Dict[str, Any]) -> bool:
+    """
+    Whether loading the catalog keeps only the BOM's parts (stream-parsed
+    suppliers without the cache), so that it has to wait for the BOM.
+    """
+    settings = cache_settings(config)
+    return not settings["enabled"] and settings["streaming"]
+
+
+def _load_catalog(
+    suppliers_path: Path,
+    config: Dict[str, Any],
+    bom: Optional[pd.DataFrame] = None,
+) -> SupplierCatalog:
+    parts = clean_strings(bom["PartNumber"]).unique() if bom is not None else None
+    return load_catalog_for_config(suppliers_path, config, parts=parts)
+
+
+def _optimize(normalized_bom: pd.DataFrame) -> Tuple[Optional[BomTree], pd.DataFrame]:
+    if is_hierarchical(normalized_bom):
+        tree = build_tree(normalized_bom)
+        return tree, explode_bom(tree)
+    return None, optimize_bom(normalized_bom)
+
+
+def _has_tree(tree: Optional[BomTree], *_: Any) -> bool:
+    return tree is not None
+
+
+def analysis_stages(
+    bom_path: Path,
+    suppliers_path: Path,
+    config: Dict[str, Any],
+    chunksize: Optional[int] = None,
+    normalized_bom_path: Optional[Path] = None,
+    load_suppliers: bool = True,
+) -> List[Stage]:
+    """
+    The run_analysis() pipeline as a stage DAG, in sequential order:
+
+    - load -> normalize -> validate / write_normalized / optimize
+      (or a single stream stage with chunksize set)
+    - suppliers, independent of the BOM unless suppliers.streaming
+      keeps only the BOM's parts (skipped with load_suppliers=False:
+      the catalog is then an initial value)
+    - cost and risk, each needing optimized_bom and catalog
+    - hierarchy, only for parent/child BOMs
+    """
+    stages: List[Stage] = []
+    if chunksize is None:
+        stages += [
+            Stage(
+                "load",
+                partial(
+                    load_bom,
+                    bom_path,
+                    columns=bom_columns(config),
+                    fast=schema_settings(config)["fast_parser"],
+                ),
+                outputs=("bom",),
+                rows=lambda df: len(df),
+            ),
+            Stage(
+                "normalize",
+                partial(normalize_bom_columns, config=config),
+                inputs=("bom",),
+                outputs=("normalized_bom",),
+                rows=lambda df, _: len(df),
+            ),
+            Stage(
+                "validate",
+                validate_bom,
+                inputs=("normalized_bom",),
+                outputs=("issues",),
+                rows=lambda issues, _: len(issues),
+            ),
+        ]
+        if normalized_bom_path is not None:
+            stages.append(
+                Stage(
+                    "write_normalized",
+                    partial(write_normalized_bom, path=normalized_bom_path),
+                    inputs=("normalized_bom",),
+                    rows=lambda _, df: len(df),
+                )
+            )
+        parts_source = "normalized_bom"
+    else:
+        # Chunks are read with the default parser, so streamed outputs
+        # could not match an in-memory load by the fast one
+        if schema_settings(config)["fast_parser"]:
+            raise ConfigError("schema.fast_parser cannot be used when streaming the BOM.")
+        stages.append(
+            Stage(
+                "stream",
+                partial(_stream_bom, bom_path, chunksize, config, normalized_bom_path),
+                outputs=("issues", "optimized_bom"),
+                rows=lambda result: len(result[1]),
+            )
+        )
+        parts_source = "optimized_bom"
+
+    if load_suppliers:
+        stages.append(
+            Stage(
+                "suppliers",
+                partial(_load_catalog, suppliers_path, config),
+                inputs=(parts_source,) if _needs_bom_parts(config) else (),
+                outputs=("catalog",),
+                rows=lambda catalog, *_: len(catalog.parts),
+            )
+        )
+
+    # Streaming aggregates chunk by chunk, and trees are never streamed
+    if chunksize is None:
+        stages.append(
+            Stage(
+                "optimize",
+                _optimize,
+                inputs=("normalized_bom",),
+                outputs=("tree", "optimized_bom"),
+                rows=lambda result, _: len(result[1]),
+            )
+        )
+
+    stages += [
+        Stage(
+            "cost",
+            partial(analyze_costs, config=config),
+            inputs=("optimized_bom", "catalog"),
+            outputs=("cost_summary",),
+            rows=lambda summary, *_: len(summary.line_items),
+        ),
+        Stage(
+            "risk",
+            partial(analyze_risk, config=config),
+            inputs=("optimized_bom", "catalog"),
+            outputs=("risk_summary",),
+            rows=lambda summary, *_: len(summary.lines),
+        ),
+    ]
+    if chunksize is None:
+        stages.append(
+            Stage(
+                "hierarchy",
+                partial(analyze_hierarchy, config=config),
+                inputs=("tree", "optimized_bom", "catalog"),
+                when=_has_tree,
+                rows=lambda summary, *_: summary.assembly_count,
+            )
+        )
+    return stages
 
 
 def run_analysis(
     bom_path: Path,
     suppliers_path: Optional[Path] = None,
     config_path: Optional[Path] = None,
+    catalog: Optional[SupplierCatalog] = None,
+    chunksize: Optional[int] = None,
+    normalized_bom_path: Optional[Path] = None,
+    config: Optional[Dict[str, Any]] = None,
+    recorder: Optional[StageRecorder] = None,
+    jobs: Optional[int] = None,
+    executor: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     High-level analysis pipeline.
 
-    - Loads config (bomer.yaml or given path)
-    - Loads BOM and suppliers
+    - Loads config (bomer.yaml or given path), unless a config dict is given
+    - Loads BOM and suppliers (unless a prebuilt catalog is given, which
+      lets many analyses in one process share the same SupplierCatalog)
     - Normalizes and validates the BOM
-    - Optimizes BOM (aggregation)
+    - Optimizes BOM (aggregation), exploding parent/child BOMs into
+      effective leaf quantities
     - Runs cost and risk analysis
 
+    If normalized_bom_path is given, the normalized BOM is written there,
+    in the format implied by its extension (.csv, .csv.gz, .parquet,
+    .feather).
+
+    With chunksize set, the BOM is streamed: each chunk is normalized,
+    validated and folded into a running per-PartNumber quantity total,
+    and normalized rows are appended to normalized_bom_path as they are
+    produced, so the full BOM is never held in memory. Outputs match the
+    in-memory path; normalized_bom is then None in the result.
+
+    The steps run as a stage DAG (analysis_stages) on a StageScheduler:
+    with `jobs` > 1 (default: pipeline.jobs from config, else 1) loading
+    the suppliers overlaps with loading the BOM, and cost, risk and
+    validation run alongside each other, on threads or worker processes
+    (`executor`, default pipeline.executor, else "thread"). Results are
+    the same for any jobs / executor. Every stage is measured by
+    `recorder` (a new StageRecorder if not given), which also notifies
+    the hooks registered with bomer.instrumentation.add_stage_hook().
+
     Returns a dictionary with:
-      - normalized_bom: pd.DataFrame
+      - normalized_bom: pd.DataFrame (None when streaming)
       - optimized_bom: pd.DataFrame
       - issues: list[dict]
       - cost_summary: CostSummary
       - risk_summary: RiskSummary
+      - hierarchy: HierarchySummary (None unless the BOM has a Parent column)
+      - catalog: SupplierCatalog
       - config: dict
       - bom_path: Path
       - suppliers_path: Path
+      - profile: list of per-stage measurements (StageRecord.to_dict())
     """
-    # 1) Load config
-    cfg_path_str = str(config_path) if config_path is not None else None
-    config = load_config(cfg_path_str)
-
-    # 2) Load BOM
-    bom_df = load_bom(bom_path)
-
-    # 3) Normalize columns (passing config in case of schema.aliases)
-    normalized_bom = normalize_bom_columns(bom_df, config=config)
-
-    # 4) Validate
-    issues = validate_bom(normalized_bom)
-
-    # 5) Resolve suppliers path if not given
-    if suppliers_path is None:
-        suppliers_cfg = config.get("suppliers", {})
-        suppliers_path_str = suppliers_cfg.get("path", "data/suppliers.json")
-        suppliers_path = Path(suppliers_path_str)
+    if recorder is None:
+        recorder = StageRecorder()
 
-    # 6) Load suppliers
-    suppliers_data = load_suppliers(suppliers_path)
+    # 1) Load config (unless already loaded by the caller)
+    if config is None:
+        with recorder.stage("config"):
+            cfg_path_str = str(config_path) if config_path is not None else None
+            config = load_config(cfg_path_str)
 
-    # 7) Optimize BOM
-    optimized_bom = optimize_bom(normalized_bom)
+    # 2) Resolve suppliers path if not given
+    suppliers_path = resolve_suppliers_path(suppliers_path, config)
 
-    # 8) Analyze cost and risk
-    cost_summary = analyze_costs(optimized_bom, suppliers_data, config=config)
-    risk_summary = analyze_risk(optimized_bom, suppliers_data, config=config)
+    # 3-8) Load and validate the BOM, load suppliers, optimize, cost and risk
+    settings = pipeline_settings(config)
+    scheduler = StageScheduler(
+        jobs=jobs if jobs is not None else settings["jobs"],
+        executor=executor if executor is not None else settings["executor"],
+        recorder=recorder,
+    )
+    stages = analysis_stages(
+        bom_path,
+        suppliers_path,
+        config,
+        chunksize=chunksize,
+        normalized_bom_path=normalized_bom_path,
+        load_suppliers=catalog is None,
+    )
+    values = scheduler.run(stages, {} if catalog is None else {"catalog": catalog}, release=("bom",))
 
     return {
-        "normalized_bom": normalized_bom,
-        "optimized_bom": optimized_bom,
-        "issues": issues,
-        "cost_summary": cost_summary,
-        "risk_summary": risk_summary,
+        "normalized_bom": values.get("normalized_bom"),
+        "optimized_bom": values["optimized_bom"],
+        "issues": values["issues"],
+        "cost_summary": values["cost_summary"],
+        "risk_summary": values["risk_summary"],
+        "hierarchy": values.get("hierarchy"),
+        "catalog": values["catalog"],
         "config": config,
         "bom_path": bom_path,
         "suppliers_path": suppliers_path,
+        "profile": recorder.to_list(),
     }
+
+
+# analysis_stages() stages that produce optimized_bom and catalog
+_SWEEP_INPUT_STAGES = ("load", "normalize", "stream", "suppliers", "optimize")
+
+
+def run_sweep(
+    bom_path: Path,
+    suppliers_path: Optional[Path] = None,
+    config_path: Optional[Path] = None,
+    weights: Optional[Sequence[Tuple[float, float, float]]] = None,
+    volumes: Optional[Sequence[float]] = None,
+    exclusions: Optional[Sequence[Sequence[str]]] = None,
+    catalog: Optional[SupplierCatalog] = None,
+    chunksize: Optional[int] = None,
+    config: Optional[Dict[str, Any]] = None,
+    recorder: Optional[StageRecorder] = None,
+) -> pd.DataFrame:
+    """
+    What-if sweep of a BOM file: loads, normalizes and optimizes the BOM
+    as run_analysis() does (without validation or reports), then prices
+    and scores every combination of risk weights, build volume and set of
+    excluded suppliers in one pass (see bomer.engines.sweep).
+
+    Returns the scenario table of sweep_scenarios().
+    """
+    if recorder is None:
+        recorder = StageRecorder()
+    if config is None:
+        with recorder.stage("config"):
+            config = load_config(str(config_path) if config_path is not None else None)
+    suppliers_path = resolve_suppliers_path(suppliers_path, config)
+
+    stages = [
+        stage
+        for stage in analysis_stages(
+            bom_path, suppliers_path, config, chunksize=chunksize, load_suppliers=catalog is None
+        )
+        if stage.name in _SWEEP_INPUT_STAGES
+    ]
+    stages.append(
+        Stage(
+            "sweep",
+            partial(
+                sweep_scenarios, weights=weights, volumes=volumes, exclusions=exclusions, config=config
+            ),
+            inputs=("optimized_bom", "catalog"),
+            outputs=("sweep",),
+            rows=lambda table, *_: len(table),
+        )
+    )
+    settings = pipeline_settings(config)
+    scheduler = StageScheduler(jobs=settings["jobs"], executor=settings["executor"], recorder=recorder)
+    values = scheduler.run(stages, {} if catalog is None else {"catalog": catalog}, release=("bom",))
+    return values["sweep"]
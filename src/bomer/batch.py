@@ -0,0 +1,184 @@
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from bomer.api import resolve_suppliers_path, run_analysis
+from bomer.core.catalog import SupplierCatalog
+from bomer.core.catalog_cache import load_catalog_for_config
+from bomer.core.config import load_config
+from bomer.core.exceptions import BomLoadError
+from bomer.core.sources import BOM_FORMATS, split_suffixes
+from bomer.core.validation import issue_count
+from bomer.reporting.report_writer import write_analysis_reports
+
+# Per-process state installed by _init_worker(): config and supplier catalog
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def discover_boms(source: Path) -> List[Path]:
+    """
+    Resolve the BOMs of a batch.
+
+    - a directory: every BOM file in it (sorted by name): .csv / .tsv /
+      .tab, optionally compressed (.csv.gz etc.)
+    - a manifest file: one BOM path per line (.txt) or a JSON list of
+      paths (.json); relative paths are resolved against the manifest
+    """
+    if source.is_dir():
+        return sorted(
+            p for p in source.iterdir() if p.is_file() and split_suffixes(p)[0] in BOM_FORMATS
+        )
+
+    if not source.exists():
+        raise BomLoadError(f"Batch source not found: {source}")
+
+    try:
+        text = source.read_text(encoding="utf-8")
+        if source.suffix.lower() == ".json":
+            entries = json.loads(text)
+            if not isinstance(entries, list):
+                raise ValueError("manifest must be a JSON list of paths")
+        else:
+            entries = [line.strip() for line in text.splitlines()]
+    except (OSError, ValueError) as exc:
+        raise BomLoadError(f"Failed to read batch manifest {source}: {exc}") from exc
+
+    return [
+        path if path.is_absolute() else source.parent / path
+        for path in (Path(str(entry)) for entry in entries if entry and not str(entry).startswith("#"))
+    ]
+
+
+def _output_dirs(boms: List[Path], output_dir: Path) -> List[Path]:
+    """
+    One output directory per BOM, named after the file stem and
+    de-duplicated with a numeric suffix.
+    """
+    used: Dict[str, int] = {}
+    dirs: List[Path] = []
+    for bom in boms:
+        stem = bom.stem
+        n = used.get(stem, 0)
+        used[stem] = n + 1
+        dirs.append(output_dir / (stem if n == 0 else f"{stem}-{n}"))
+    return dirs
+
+
+def _init_worker(config: Dict[str, Any], catalog: SupplierCatalog, suppliers_path: Path) -> None:
+    _WORKER_STATE["config"] = config
+    _WORKER_STATE["catalog"] = catalog
+    _WORKER_STATE["suppliers_path"] = suppliers_path
+
+
+def _analyze_one(task: Tuple[Path, Path, Optional[int]]) -> Dict[str, Any]:
+    bom_path, bom_output_dir, chunksize = task
+    started = time.perf_counter()
+    record: Dict[str, Any] = {"bom": str(bom_path), "output_dir": str(bom_output_dir)}
+
+    try:
+        bom_output_dir.mkdir(parents=True, exist_ok=True)
+        result = run_analysis(
+            bom_path=bom_path,
+            suppliers_path=_WORKER_STATE["suppliers_path"],
+            catalog=_WORKER_STATE["catalog"],
+            config=_WORKER_STATE["config"],
+            chunksize=chunksize,
+            normalized_bom_path=bom_output_dir / "normalized_bom.csv",
+        )
+        write_analysis_reports(result, bom_output_dir)
+    except Exception as exc:
+        record.update(
+            status="failed",
+            error_type=type(exc).__name__,
+            error=str(exc),
+            traceback=traceback.format_exc(),
+        )
+    else:
+        cost_summary = result["cost_summary"]
+        record.update(
+            status="ok",
+            part_count=int(len(result["optimized_bom"])),
+            total_cost=cost_summary.total_cost,
+            currency=cost_summary.currency,
+            risk_score=result["risk_summary"].risk_score,
+            issue_count=issue_count(result["issues"]),
+        )
+
+    record["elapsed_s"] = round(time.perf_counter() - started, 4)
+    return record
+
+
+def _pool_context() -> Any:
+    # fork lets workers inherit the catalog from the parent without pickling
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def run_batch(
+    boms: List[Path],
+    output_dir: Path,
+    suppliers_path: Optional[Path] = None,
+    config_path: Optional[Path] = None,
+    jobs: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Analyse many BOMs with one config and one supplier catalog.
+
+    Config and suppliers are loaded once in the parent; the per-BOM
+    pipeline (run_analysis plus the standard report writers) runs in a
+    process pool of `jobs` workers (default: CPU count, 1 = in-process).
+    Each BOM gets its own directory under output_dir, and the batch
+    writes output_dir/index.json (one record per BOM) and
+    output_dir/failures.json (failed BOMs with their errors).
+
+    Returns {"index": [...], "failures": [...]}.
+    """
+    cfg_path_str = str(config_path) if config_path is not None else None
+    config = load_config(cfg_path_str)
+    suppliers_path = resolve_suppliers_path(suppliers_path, config)
+    catalog = load_catalog_for_config(suppliers_path, config)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [
+        (bom, bom_dir, chunksize)
+        for bom, bom_dir in zip(boms, _output_dirs(boms, output_dir))
+    ]
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(tasks) <= 1:
+        _init_worker(config, catalog, suppliers_path)
+        records = [_analyze_one(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(tasks)),
+            mp_context=_pool_context(),
+            initializer=_init_worker,
+            initargs=(config, catalog, suppliers_path),
+        ) as pool:
+            records = list(pool.map(_analyze_one, tasks))
+
+    index = [{k: v for k, v in record.items() if k != "traceback"} for record in records]
+    failures = [
+        {
+            "bom": record["bom"],
+            "error_type": record["error_type"],
+            "error": record["error"],
+            "traceback": record["traceback"],
+        }
+        for record in records
+        if record["status"] == "failed"
+    ]
+
+    with (output_dir / "index.json").open("w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    with (output_dir / "failures.json").open("w", encoding="utf-8") as f:
+        json.dump(failures, f, indent=2)
+
+    return {"index": index, "failures": failures}
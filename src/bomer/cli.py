@@ -1,17 +1,16 @@
 import argparse
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from bomer import __version__
-from bomer.api import run_analysis
-from bomer.core.exceptions import BomerError
-from bomer.reporting.report_writer import (
-    write_normalized_bom,
-    write_optimized_bom,
-    write_analysis_json,
-    write_issues_json,
-    write_summary_text,
-)
+from bomer.core.exceptions import BomerError, ConfigError
+from bomer.core.scheduler import EXECUTORS
+from bomer.reporting.formats import ARTIFACTS, TABLE_FORMATS
+
+# Subcommand handlers import the analysis stack (pandas, numpy, yaml) on
+# first use, so --version / --help and argument errors stay fast.
+
+DEFAULT_CHUNKSIZE = 100_000
 
 
 def _add_analyze_subparser(subparsers: argparse._SubParsersAction) -> None:
@@ -30,7 +29,9 @@ def _add_analyze_subparser(subparsers: argparse._SubParsersAction) -> None:
         help=(
             "Path to suppliers JSON file. "
             "If omitted, taken from config (suppliers.path in bomer.yaml) "
-            "or defaults to data/suppliers.json."
+            "or defaults to data/suppliers.json. It is compiled into a catalog cache "
+            "in the per-user cache directory, $XDG_CACHE_HOME/bomer or ~/.cache/bomer "
+            "(set suppliers.cache_dir, or suppliers.cache: false to disable)."
         ),
     )
     analyze_parser.add_argument(
@@ -42,6 +43,300 @@ def _add_analyze_subparser(subparsers: argparse._SubParsersAction) -> None:
         "--config",
         help="Path to bomer YAML config file (default: ./bomer.yaml if present).",
     )
+    analyze_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the BOM in chunks instead of loading it into memory at once.",
+    )
+    analyze_parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help=f"Rows per chunk in --stream mode (default: {DEFAULT_CHUNKSIZE}).",
+    )
+    analyze_parser.add_argument(
+        "--format",
+        choices=list(TABLE_FORMATS),
+        default="csv",
+        help=(
+            "Format of the table artifacts (default: csv). parquet and feather need "
+            "pyarrow and fall back to csv.gz without it."
+        ),
+    )
+    analyze_parser.add_argument(
+        "--skip",
+        metavar="ARTIFACTS",
+        help=f"Comma-separated artifacts not to write ({', '.join(ARTIFACTS)}).",
+    )
+    analyze_parser.add_argument(
+        "--compact-json",
+        action="store_true",
+        help="Write analysis.json without indentation or line breaks.",
+    )
+    analyze_parser.add_argument(
+        "--jobs",
+        type=int,
+        help=(
+            "Run up to N independent pipeline stages at once (e.g. supplier loading "
+            "alongside BoM loading, cost alongside risk; default: pipeline.jobs, else 1)."
+        ),
+    )
+    analyze_parser.add_argument(
+        "--executor",
+        choices=EXECUTORS,
+        help=(
+            "Run concurrent stages on threads or worker processes "
+            "(default: pipeline.executor, else thread)."
+        ),
+    )
+    analyze_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Profile the run: writes profile.pstats (cProfile) and trace.json "
+            "(Chrome trace events, one per stage) next to the reports."
+        ),
+    )
+    analyze_parser.add_argument(
+        "--incremental-state",
+        help=(
+            "Directory holding the previous revision's analysis state. Only changed "
+            "parts are recomputed, and delta.json is written next to the reports."
+        ),
+    )
+    analyze_parser.add_argument(
+        "--cost-curve",
+        metavar="VOLUMES",
+        help="Comma-separated build volumes (e.g. 1,100,1000); writes cost_curve.csv.",
+    )
+    analyze_parser.add_argument(
+        "--purchase-plan",
+        action="store_true",
+        help=(
+            "Assign each part to one supplier to minimise landed cost (MOQs, order "
+            "multiples, per-supplier order cost); writes purchase_plan.csv/.json."
+        ),
+    )
+    analyze_parser.add_argument(
+        "--max-suppliers",
+        type=int,
+        help="Use at most N suppliers in the purchase plan.",
+    )
+    analyze_parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help=(
+            "Monte Carlo supply-risk simulation (supplier dropouts, price moves); "
+            "writes simulation.json with cost percentiles and unavailability odds."
+        ),
+    )
+    analyze_parser.add_argument(
+        "--trials",
+        type=int,
+        help="Simulation trials (default: simulation.trials, else 10000).",
+    )
+    analyze_parser.add_argument(
+        "--seed",
+        type=int,
+        help="Simulation random seed (default: simulation.seed, else 0).",
+    )
+    analyze_parser.add_argument(
+        "--budget",
+        type=float,
+        help="Per-board cost budget for the simulation (default: simulation.budget).",
+    )
+
+
+def _add_catalog_subparser(subparsers: argparse._SubParsersAction) -> None:
+    catalog_parser = subparsers.add_parser(
+        "catalog",
+        help="Manage the compiled supplier catalog cache.",
+    )
+    catalog_sub = catalog_parser.add_subparsers(
+        dest="catalog_command",
+        metavar="<action>",
+    )
+
+    compile_parser = catalog_sub.add_parser(
+        "compile",
+        help="Compile a suppliers JSON file into the binary catalog cache.",
+    )
+    compile_parser.add_argument(
+        "--suppliers",
+        help=(
+            "Path to suppliers JSON file. "
+            "If omitted, taken from config (suppliers.path in bomer.yaml) "
+            "or defaults to data/suppliers.json."
+        ),
+    )
+    compile_parser.add_argument(
+        "--cache-dir",
+        help=(
+            "Cache directory (default: suppliers.cache_dir in config, or "
+            "$XDG_CACHE_HOME/bomer, falling back to ~/.cache/bomer)."
+        ),
+    )
+    compile_parser.add_argument(
+        "--config",
+        help="Path to bomer YAML config file (default: ./bomer.yaml if present).",
+    )
+
+
+def _add_batch_subparser(subparsers: argparse._SubParsersAction) -> None:
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Analyze many BOMs in parallel with a shared config and supplier catalog.",
+    )
+
+    batch_parser.add_argument(
+        "--boms",
+        required=True,
+        help=(
+            "Directory of BOM CSV files, or a manifest listing one BOM path per line "
+            "(.txt) or as a JSON list (.json)."
+        ),
+    )
+    batch_parser.add_argument(
+        "--suppliers",
+        help=(
+            "Path to suppliers JSON file. "
+            "If omitted, taken from config (suppliers.path in bomer.yaml) "
+            "or defaults to data/suppliers.json."
+        ),
+    )
+    batch_parser.add_argument(
+        "--output-dir",
+        default="output",
+        help="Directory for per-BOM output directories, index.json and failures.json.",
+    )
+    batch_parser.add_argument(
+        "--config",
+        help="Path to bomer YAML config file (default: ./bomer.yaml if present).",
+    )
+    batch_parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of worker processes (default: CPU count; 1 runs in-process).",
+    )
+    batch_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream each BOM in chunks instead of loading it into memory at once.",
+    )
+    batch_parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help=f"Rows per chunk in --stream mode (default: {DEFAULT_CHUNKSIZE}).",
+    )
+
+
+def _add_sweep_subparser(subparsers: argparse._SubParsersAction) -> None:
+    sweep_parser = subparsers.add_parser(
+        "sweep",
+        help=(
+            "What-if sweep: cost and risk score of a BOM for every combination of risk "
+            "weights, build volumes and excluded suppliers, in one table."
+        ),
+    )
+
+    sweep_parser.add_argument(
+        "--bom",
+        required=True,
+        help="Path to BOM CSV file.",
+    )
+    sweep_parser.add_argument(
+        "--suppliers",
+        help=(
+            "Path to suppliers JSON file. "
+            "If omitted, taken from config (suppliers.path in bomer.yaml) "
+            "or defaults to data/suppliers.json."
+        ),
+    )
+    sweep_parser.add_argument(
+        "--config",
+        help="Path to bomer YAML config file (default: ./bomer.yaml if present).",
+    )
+    sweep_parser.add_argument(
+        "--weights",
+        action="append",
+        metavar="S,M,L",
+        help=(
+            "Risk weights single_source,missing_price,lifecycle (e.g. 0.6,0.2,0.2); "
+            "repeat for several (default: the risk weights from config)."
+        ),
+    )
+    sweep_parser.add_argument(
+        "--volumes",
+        help="Comma-separated build volumes (default: cost.default_volume, else 1).",
+    )
+    sweep_parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="SUPPLIERS",
+        help=(
+            "Comma-separated suppliers to leave out; repeat for several scenarios. "
+            "The scenario without exclusions is always included."
+        ),
+    )
+    sweep_parser.add_argument(
+        "--output-dir",
+        default="output",
+        help="Directory to write sweep table to (default: ./output).",
+    )
+    sweep_parser.add_argument(
+        "--format",
+        choices=list(TABLE_FORMATS),
+        default="csv",
+        help="Format of the sweep table (default: csv).",
+    )
+    sweep_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the BOM in chunks instead of loading it into memory at once.",
+    )
+    sweep_parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help=f"Rows per chunk in --stream mode (default: {DEFAULT_CHUNKSIZE}).",
+    )
+
+
+def _add_serve_subparser(subparsers: argparse._SubParsersAction) -> None:
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Serve analyses over local HTTP/JSON with config and suppliers kept warm.",
+    )
+
+    serve_parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface to bind (default: 127.0.0.1).",
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="Port to listen on (default: 8765).",
+    )
+    serve_parser.add_argument(
+        "--suppliers",
+        help=(
+            "Path to suppliers JSON file. "
+            "If omitted, taken from config (suppliers.path in bomer.yaml) "
+            "or defaults to data/suppliers.json."
+        ),
+    )
+    serve_parser.add_argument(
+        "--config",
+        help="Path to bomer YAML config file (default: ./bomer.yaml if present).",
+    )
+    serve_parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log every request.",
+    )
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -66,52 +361,242 @@ def _build_parser() -> argparse.ArgumentParser:
     )
 
     _add_analyze_subparser(subparsers)
+    _add_catalog_subparser(subparsers)
+    _add_batch_subparser(subparsers)
+    _add_sweep_subparser(subparsers)
+    _add_serve_subparser(subparsers)
 
     return parser
 
 
+def _parse_volumes(text: str, option: str = "--cost-curve") -> List[float]:
+    try:
+        volumes = [float(v) for v in text.split(",") if v.strip()]
+    except ValueError:
+        raise ConfigError(f"{option} expects comma-separated numbers, got {text!r}.")
+    if not volumes or any(v <= 0 for v in volumes):
+        raise ConfigError(f"{option} volumes must be positive numbers.")
+    return volumes
+
+
+def _parse_weights(text: str) -> Tuple[float, float, float]:
+    try:
+        weights = tuple(float(w) for w in text.split(","))
+    except ValueError:
+        weights = ()
+    if len(weights) != 3:
+        raise ConfigError(
+            f"--weights expects SINGLE_SOURCE,MISSING_PRICE,LIFECYCLE weights, got {text!r}."
+        )
+    return weights  # type: ignore[return-value]
+
+
 def _run_analyze(args: argparse.Namespace) -> None:
+    from bomer.api import run_analysis
+    from bomer.core.catalog_cache import load_catalog_for_config
+    from bomer.engines.allocation import allocate_suppliers
+    from bomer.engines.cost import cost_curve
+    from bomer.engines.simulation import simulate_supply_risk
+    from bomer.incremental import run_incremental_analysis
+    from bomer.instrumentation import StageRecorder
+    from bomer.reporting.formats import check_artifacts, resolve_table_format, table_path
+    from bomer.reporting.report_writer import (
+        write_analysis_reports,
+        write_purchase_plan,
+        write_simulation,
+    )
+
+    volumes = _parse_volumes(args.cost_curve) if args.cost_curve else None
+    if args.max_suppliers is not None and args.max_suppliers < 1:
+        raise ConfigError("--max-suppliers must be at least 1.")
+    if args.trials is not None and args.trials < 1:
+        raise ConfigError("--trials must be at least 1.")
+    if args.seed is not None and args.seed < 0:
+        raise ConfigError("--seed must not be negative.")
+    if args.budget is not None and args.budget <= 0:
+        raise ConfigError("--budget must be positive.")
     bom_path = Path(args.bom)
     suppliers_path = Path(args.suppliers) if args.suppliers else None
     config_path = Path(args.config) if args.config else None
 
-    result = run_analysis(
-        bom_path=bom_path,
-        suppliers_path=suppliers_path,
-        config_path=config_path,
+    if args.incremental_state and args.stream:
+        raise ConfigError("--incremental-state cannot be combined with --stream.")
+    if args.jobs is not None and args.jobs < 1:
+        raise ConfigError("--jobs must be at least 1.")
+
+    skip = check_artifacts(name.strip() for name in (args.skip or "").split(",") if name.strip())
+    fmt = resolve_table_format(args.format)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    normalized_bom_path = (
+        None if "normalized_bom" in skip else table_path(output_dir, "normalized_bom", fmt)
     )
 
-    normalized_bom = result["normalized_bom"]
-    optimized_bom = result["optimized_bom"]
-    issues = result["issues"]
-    cost_summary = result["cost_summary"]
-    risk_summary = result["risk_summary"]
-    bom_path = result["bom_path"]
-    suppliers_path = result["suppliers_path"]
+    recorder = StageRecorder()
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        if args.incremental_state:
+            result = run_incremental_analysis(
+                bom_path=bom_path,
+                state_dir=Path(args.incremental_state),
+                suppliers_path=suppliers_path,
+                config_path=config_path,
+                normalized_bom_path=normalized_bom_path,
+                recorder=recorder,
+            )
+        else:
+            result = run_analysis(
+                bom_path=bom_path,
+                suppliers_path=suppliers_path,
+                config_path=config_path,
+                chunksize=args.chunksize if args.stream else None,
+                normalized_bom_path=normalized_bom_path,
+                recorder=recorder,
+                jobs=args.jobs,
+                executor=args.executor,
+            )
+
+        with recorder.stage("write_reports"):
+            write_analysis_reports(
+                result,
+                output_dir,
+                fmt=fmt,
+                skip=skip,
+                compact_json=args.compact_json,
+            )
+    finally:
+        # Also written when a stage failed, which then ends the trace
+        if profiler is not None:
+            import json
+
+            profiler.disable()
+            profiler.dump_stats(str(output_dir / "profile.pstats"))
+            with (output_dir / "trace.json").open("w", encoding="utf-8") as f:
+                json.dump(recorder.chrome_trace(), f, indent=2)
+
+    if volumes is not None or args.purchase_plan or args.simulate:
+        catalog = result["catalog"]
+        if catalog is None:
+            catalog = load_catalog_for_config(result["suppliers_path"], result["config"])
+        if volumes is not None:
+            curve = cost_curve(result["optimized_bom"], catalog, volumes, result["config"])
+            curve.to_csv(output_dir / "cost_curve.csv", index=False)
+        if args.purchase_plan:
+            plan = allocate_suppliers(
+                result["optimized_bom"],
+                catalog,
+                config=result["config"],
+                max_suppliers=args.max_suppliers,
+            )
+            write_purchase_plan(plan, output_dir)
+        if args.simulate:
+            simulation = simulate_supply_risk(
+                result["optimized_bom"],
+                catalog,
+                config=result["config"],
+                trials=args.trials,
+                seed=args.seed,
+                budget=args.budget,
+            )
+            write_simulation(simulation, output_dir)
+
+    print(f"[BOMER] Analysis complete. Artifacts written to: {output_dir}")
+
+
+def _run_batch(args: argparse.Namespace) -> None:
+    from bomer.batch import discover_boms, run_batch
+
+    output_dir = Path(args.output_dir)
+    boms = discover_boms(Path(args.boms))
+
+    batch = run_batch(
+        boms,
+        output_dir,
+        suppliers_path=Path(args.suppliers) if args.suppliers else None,
+        config_path=Path(args.config) if args.config else None,
+        jobs=args.jobs,
+        chunksize=args.chunksize if args.stream else None,
+    )
+
+    n_failed = len(batch["failures"])
+    print(
+        f"[BOMER] Batch complete: {len(boms) - n_failed} succeeded, {n_failed} failed. "
+        f"Index written to: {output_dir / 'index.json'}"
+    )
+    if n_failed:
+        raise SystemExit(1)
+
+
+def _run_sweep(args: argparse.Namespace) -> None:
+    from bomer.api import run_sweep
+    from bomer.reporting.formats import resolve_table_format, table_path, write_table
+
+    weights = [_parse_weights(text) for text in args.weights] if args.weights else None
+    volumes = _parse_volumes(args.volumes, "--volumes") if args.volumes else None
+    exclusions = [()] + [
+        tuple(name.strip() for name in text.split(",") if name.strip()) for text in args.exclude or []
+    ]
+    fmt = resolve_table_format(args.format)
+
+    table = run_sweep(
+        bom_path=Path(args.bom),
+        suppliers_path=Path(args.suppliers) if args.suppliers else None,
+        config_path=Path(args.config) if args.config else None,
+        weights=weights,
+        volumes=volumes,
+        exclusions=exclusions,
+        chunksize=args.chunksize if args.stream else None,
+    )
 
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
+    path = table_path(output_dir, "sweep", fmt)
+    write_table(table, path)
+    print(f"[BOMER] Sweep complete: {len(table)} scenarios written to: {path}")
 
-    write_normalized_bom(normalized_bom, output_dir / "normalized_bom.csv")
-    write_optimized_bom(optimized_bom, output_dir / "optimized_bom.csv")
-    write_analysis_json(
-        optimized_bom,
-        cost_summary,
-        risk_summary,
-        bom_path,
-        suppliers_path,
-        output_dir / "analysis.json",
+
+def _run_serve(args: argparse.Namespace) -> None:
+    from bomer.server import serve
+
+    serve(
+        host=args.host,
+        port=args.port,
+        config_path=Path(args.config) if args.config else None,
+        suppliers_path=Path(args.suppliers) if args.suppliers else None,
+        verbose=args.verbose,
     )
-    write_issues_json(issues, output_dir / "issues.json")
-    write_summary_text(
-        optimized_bom,
-        cost_summary,
-        risk_summary,
-        issues,
-        output_dir / "summary.txt",
+
+
+def _run_catalog_compile(args: argparse.Namespace) -> None:
+    from bomer.api import resolve_suppliers_path
+    from bomer.core.catalog_cache import cache_settings, compile_catalog
+    from bomer.core.config import load_config
+    from bomer.core.exceptions import SupplierLoadError
+
+    config = load_config(args.config)
+    suppliers_path = resolve_suppliers_path(
+        Path(args.suppliers) if args.suppliers else None,
+        config,
     )
+    settings = cache_settings(config)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else settings["cache_dir"]
 
-    print(f"[BOMER] Analysis complete. Artifacts written to: {output_dir}")
+    if not suppliers_path.exists():
+        raise SupplierLoadError(f"Suppliers file not found: {suppliers_path}")
+
+    entry = compile_catalog(
+        suppliers_path,
+        cache_dir,
+        hash_content=settings["hash_content"],
+    )
+    print(f"[BOMER] Compiled supplier catalog for {suppliers_path} into: {entry}")
 
 
 def main(argv: Optional[list] = None) -> None:
@@ -119,13 +604,24 @@ def main(argv: Optional[list] = None) -> None:
     args = parser.parse_args(argv)
 
     if args.command == "analyze":
-        try:
-            _run_analyze(args)
-        except BomerError as e:
-            print(f"[BOMER] Error: {e}")
-            raise SystemExit(1)
+        handler = _run_analyze
+    elif args.command == "batch":
+        handler = _run_batch
+    elif args.command == "sweep":
+        handler = _run_sweep
+    elif args.command == "serve":
+        handler = _run_serve
+    elif args.command == "catalog" and args.catalog_command == "compile":
+        handler = _run_catalog_compile
     else:
         parser.print_help()
+        return
+
+    try:
+        handler(args)
+    except BomerError as e:
+        print(f"[BOMER] Error: {e}")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
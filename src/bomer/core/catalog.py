@@ -0,0 +1,575 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from bomer.core.partnumbers import (
+    DEFAULT_MATCH_MODE,
+    MATCH_EXACT,
+    MATCH_FUZZY,
+    MATCH_NONE,
+    MATCH_NORMALIZED,
+    build_normalized_index,
+    canonicalize,
+    fuzzy_lookup,
+)
+
+# Array fields stored one .npy file each in a compiled catalog directory
+ARRAY_FIELDS = (
+    "parts",
+    "supplier_count",
+    "min_price",
+    "best_supplier",
+    "offsets",
+    "entry_supplier",
+    "entry_price",
+    "entry_moq",
+    "entry_multiple",
+    "tier_offsets",
+    "tier_qty",
+    "tier_price",
+)
+
+# Normalized part-number index, stored alongside ARRAY_FIELDS when compiled
+INDEX_FIELDS = ("norm_keys", "norm_positions")
+
+# Keys accepted for the break quantity of a price tier object
+_TIER_QTY_KEYS = ("min_qty", "qty", "quantity")
+
+# Keys marking a price entry object ({"price": ..., "moq": ...}) rather
+# than a quantity -> price mapping
+_ENTRY_KEYS = ("price", "breaks")
+
+
+@dataclass
+class SupplierCatalog:
+    """
+    Part-keyed index over supplier price lists, built once per run and
+    shared by the cost and risk engines.
+
+    Per-part arrays (aligned with `parts`, which is sorted):
+    - supplier_count: number of supplier entries listing the part
+    - min_price: lowest numeric price (NaN if none is numeric)
+    - best_supplier: index into supplier_names of the cheapest supplier
+      (first in file order on ties, -1 if no numeric price)
+
+    Per-entry arrays, grouped by part: the entries of part i are
+    offsets[i]:offsets[i + 1], in supplier file order.
+    - entry_supplier: index into supplier_names
+    - entry_price: price of the lowest tier (NaN if not numeric)
+    - entry_moq: minimum order quantity (1 if not given)
+    - entry_multiple: order quantity step, e.g. reel size (1 if not given)
+
+    Per-tier arrays, grouped by entry: the price breaks of entry j are
+    tier_offsets[j]:tier_offsets[j + 1], sorted by break quantity.
+    A flat price is a single tier with break quantity 1.
+    - tier_qty: minimum order quantity for the tier price
+    - tier_price: unit price from that quantity on (NaN if not numeric)
+
+    `parts` is either an object array of str (built in memory) or a
+    UTF-8 bytes array (opened from the compiled cache, possibly
+    memory-mapped); both sort identically.
+
+    norm_keys / norm_positions index the canonical form of every part
+    number (see bomer.core.partnumbers); they are built on first use, or
+    loaded from the compiled cache, and back the normalized and fuzzy
+    matching modes of match().
+
+    `supplier_order_cost` is the fixed cost of placing an order with
+    each supplier (0 if not given).
+
+    A catalog opened from a compiled directory remembers it in
+    `compiled_dir` and pickles as a reference to it, so worker processes
+    re-map the files instead of receiving a copy of the arrays.
+    """
+
+    currency: Optional[str]
+    supplier_names: List[str]
+    supplier_order_cost: List[float]
+    parts: np.ndarray
+    supplier_count: np.ndarray
+    min_price: np.ndarray
+    best_supplier: np.ndarray
+    offsets: np.ndarray
+    entry_supplier: np.ndarray
+    entry_price: np.ndarray
+    entry_moq: np.ndarray
+    entry_multiple: np.ndarray
+    tier_offsets: np.ndarray
+    tier_qty: np.ndarray
+    tier_price: np.ndarray
+    norm_keys: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    norm_positions: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    compiled_dir: Optional[str] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def open_compiled(cls, directory: Union[str, Path]) -> "SupplierCatalog":
+        """
+        Open a compiled catalog directory (meta.json plus one .npy file
+        per array) with its arrays memory-mapped.
+        """
+        directory = Path(directory)
+        with (directory / "meta.json").open("r", encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+            for name in ARRAY_FIELDS
+        }
+        for name in INDEX_FIELDS:
+            if (directory / f"{name}.npy").exists():
+                arrays[name] = np.load(directory / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+        return cls(
+            currency=meta.get("currency"),
+            supplier_names=list(meta.get("supplier_names", [])),
+            supplier_order_cost=list(meta.get("supplier_order_cost", [])),
+            compiled_dir=str(directory),
+            **arrays,
+        )
+
+    def __reduce__(self) -> Any:
+        if self.compiled_dir is not None:
+            return (SupplierCatalog.open_compiled, (self.compiled_dir,))
+        return super().__reduce__()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SupplierCatalog":
+        """
+        Build a catalog from the parsed suppliers JSON structure.
+        """
+        builder = CatalogBuilder(currency=data.get("currency"))
+        for supplier in data.get("suppliers", []):
+            idx = builder.add_supplier(supplier.get("name", ""))
+            builder.set_order_cost(idx, supplier.get("order_cost", 0.0))
+            builder.add_prices(idx, supplier.get("prices", {}))
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+    def positions(self, parts: Union[Sequence[str], np.ndarray, pd.Series]) -> np.ndarray:
+        """
+        Return the catalog position of each part, or -1 if it is unknown.
+        """
+        keys = np.asarray(parts, dtype=object)
+        if self.parts.dtype.kind == "S" and len(keys):
+            keys = np.char.encode(keys.astype(str), "utf-8")
+        if len(self.parts) == 0 or len(keys) == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+        idx = np.minimum(np.searchsorted(self.parts, keys), len(self.parts) - 1)
+        found = self.parts[idx] == keys
+        return np.where(found, idx, -1).astype(np.int64)
+
+    def part_names(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Catalog part number at each position ("" where position is -1).
+        """
+        names = np.full(len(positions), "", dtype=object)
+        found = positions >= 0
+        values = np.asarray(self.parts[positions[found]])
+        if values.dtype.kind == "S":
+            values = np.char.decode(values, "utf-8")
+        names[found] = values
+        return names
+
+    def normalized_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (sorted canonical keys, part position of each key), built once.
+        """
+        if self.norm_keys is None or self.norm_positions is None:
+            self.norm_keys, self.norm_positions = build_normalized_index(self.parts)
+        return self.norm_keys, self.norm_positions
+
+    def match(
+        self,
+        parts: Union[Sequence[str], np.ndarray, pd.Series],
+        mode: str = DEFAULT_MATCH_MODE,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Catalog position of each part (-1 if unmatched) and how it was
+        matched: "exact", then (mode "normalized" or "fuzzy") the
+        canonical form, then (mode "fuzzy") the closest canonical key by
+        common prefix; "none" if nothing matched.
+        """
+        keys = np.asarray(parts, dtype=object)
+        positions = self.positions(keys)
+        match_type = np.where(positions >= 0, MATCH_EXACT, MATCH_NONE).astype(object)
+        if mode == "exact" or len(self.parts) == 0:
+            return positions, match_type
+
+        missing = np.flatnonzero(positions < 0)
+        if len(missing) == 0:
+            return positions, match_type
+
+        index_keys, index_positions = self.normalized_index()
+        canonical = canonicalize(keys[missing])
+        if len(index_keys):
+            found = np.minimum(np.searchsorted(index_keys, canonical), len(index_keys) - 1)
+            hit = (np.asarray(index_keys[found]) == canonical) & (canonical != b"")
+            positions[missing[hit]] = index_positions[found[hit]]
+            match_type[missing[hit]] = MATCH_NORMALIZED
+            missing, canonical = missing[~hit], canonical[~hit]
+
+        if mode == "fuzzy" and len(missing):
+            found = fuzzy_lookup(canonical, index_keys)
+            hit = found >= 0
+            positions[missing[hit]] = index_positions[found[hit]]
+            match_type[missing[hit]] = MATCH_FUZZY
+
+        return positions, match_type
+
+    def take(self, values: np.ndarray, positions: np.ndarray, fill: Any) -> np.ndarray:
+        """
+        Gather a per-part array at `positions`, using `fill` where the
+        position is -1. Only the requested elements are read, so this is
+        cheap on memory-mapped arrays.
+        """
+        out = np.full(len(positions), fill, dtype=values.dtype)
+        known = positions >= 0
+        out[known] = values[positions[known]]
+        return out
+
+    def unit_prices(self, positions: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+        """
+        Best unit price for each (part position, order quantity), over
+        all suppliers of the part and applying their price breaks.
+
+        `quantities` has one row per position and may carry extra
+        columns (e.g. one per build volume); the result has the same
+        shape, NaN where the part is unknown or has no numeric price.
+        Quantities below the first break get the first tier's price.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        quantities = np.asarray(quantities, dtype=np.float64)
+        if len(positions) == 0:
+            return np.full(quantities.shape, np.nan)
+        targets = quantities.reshape(len(positions), -1)
+        result = np.full(targets.shape, np.nan)
+
+        pair_line, pair_entry = self.entries_for(positions)
+        if len(pair_entry) == 0:
+            return result.reshape(quantities.shape)
+
+        prices = self.entry_unit_prices(pair_entry, targets[pair_line])
+
+        group_start = np.flatnonzero(np.r_[True, pair_line[1:] != pair_line[:-1]])
+        result[pair_line[group_start]] = np.fmin.reduceat(prices, group_start, axis=0)
+        return result.reshape(quantities.shape)
+
+    def entries_for(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Expand part positions into (index into positions, entry index)
+        pairs, one per supplier entry of each known part, grouped by
+        position in input order.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(self.parts) == 0 or len(positions) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        known = positions >= 0
+        safe = np.where(known, positions, 0)
+        counts = np.where(known, self.offsets[safe + 1] - self.offsets[safe], 0)
+        n_pairs = int(counts.sum())
+
+        pair_line = np.repeat(np.arange(len(positions)), counts)
+        group_start = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        pair_entry = np.repeat(np.asarray(self.offsets[safe]), counts) + (
+            np.arange(n_pairs) - np.repeat(group_start, counts)
+        )
+        return pair_line, pair_entry
+
+    def entry_unit_prices(self, entries: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+        """
+        Tier price of each supplier entry at the given order quantities
+        (one row per entry, any number of columns).
+        """
+        entries = np.asarray(entries, dtype=np.int64)
+        quantities = np.asarray(quantities, dtype=np.float64)
+        if len(entries) == 0:
+            return np.empty((0, quantities.shape[1] if quantities.ndim == 2 else 1))
+        quantities = quantities.reshape(len(entries), -1)
+        starts = np.asarray(self.tier_offsets[entries])[:, None]
+        ends = np.asarray(self.tier_offsets[entries + 1])[:, None]
+        tier = _segmented_bisect(self.tier_qty, starts, ends, quantities)
+        return np.asarray(self.tier_price[np.maximum(tier - 1, starts)])
+
+    def suppliers_for(self, part: str) -> List[str]:
+        return list(self.supplier_prices(part))
+
+    def supplier_prices(self, part: str) -> Dict[str, float]:
+        """
+        Supplier name -> price for a single part, in supplier file order.
+        """
+        pos = int(self.positions([part])[0])
+        if pos < 0:
+            return {}
+        start, end = self.offsets[pos], self.offsets[pos + 1]
+        return {
+            self.supplier_names[s]: float(p)
+            for s, p in zip(self.entry_supplier[start:end], self.entry_price[start:end])
+        }
+
+
+class CatalogBuilder:
+    """
+    Accumulates (supplier, part, price) entries and compiles them into a
+    SupplierCatalog. Entries can be fed incrementally.
+    """
+
+    def __init__(self, currency: Optional[str] = None) -> None:
+        self.currency = currency
+        self._names: List[str] = []
+        self._order_costs: List[float] = []
+        self._parts: List[str] = []
+        self._suppliers: List[int] = []
+        self._prices: List[Any] = []
+
+    def add_supplier(self, name: Any) -> int:
+        self._names.append(str(name))
+        self._order_costs.append(0.0)
+        return len(self._names) - 1
+
+    def rename_supplier(self, supplier_idx: int, name: Any) -> None:
+        self._names[supplier_idx] = str(name)
+
+    def set_order_cost(self, supplier_idx: int, cost: Any) -> None:
+        order_cost = _to_float(cost)
+        self._order_costs[supplier_idx] = order_cost if order_cost == order_cost else 0.0
+
+    def add_prices(
+        self,
+        supplier_idx: int,
+        items: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]],
+    ) -> None:
+        """
+        Add a supplier's price entries, either as a part -> price mapping
+        or as an iterable of (part, price) pairs.
+        """
+        n_before = len(self._parts)
+        if isinstance(items, Mapping):
+            self._parts.extend(items.keys())
+            self._prices.extend(items.values())
+        else:
+            for part, price in items:
+                self._parts.append(part)
+                self._prices.append(price)
+        self._suppliers.extend([supplier_idx] * (len(self._parts) - n_before))
+
+    def build(self) -> "SupplierCatalog":
+        tiered = [i for i, value in enumerate(self._prices) if _is_tiered(value)]
+        n_entries = len(self._prices)
+        flat_values = pd.Series(self._prices, dtype=object)
+        if tiered:
+            flat_values.iloc[tiered] = None
+        flat_prices = pd.to_numeric(flat_values, errors="coerce").to_numpy(dtype=np.float64)
+
+        codes, parts = _factorize_sorted(np.asarray(self._parts, dtype=object))
+
+        order = np.argsort(codes, kind="stable")
+        entry_supplier = np.asarray(self._suppliers, dtype=np.int32)[order]
+        supplier_count = np.bincount(codes, minlength=len(parts)).astype(np.int32)
+        offsets = np.concatenate([[0], np.cumsum(supplier_count, dtype=np.int64)])
+
+        entry_moq = np.ones(n_entries, dtype=np.float64)
+        entry_multiple = np.ones(n_entries, dtype=np.float64)
+        if tiered:
+            entries = [_parse_entry(self._prices[i]) for i in tiered]
+            entry_moq[tiered] = [moq for _, moq, _ in entries]
+            entry_multiple[tiered] = [multiple for _, _, multiple in entries]
+            entry_price, tier_offsets, tier_qty, tier_price = _build_tiers(
+                flat_prices, tiered, [tiers for tiers, _, _ in entries], order
+            )
+        else:
+            entry_price = flat_prices[order]
+            tier_offsets = np.arange(len(entry_price) + 1, dtype=np.int64)
+            tier_qty = np.ones(len(entry_price), dtype=np.float64)
+            tier_price = entry_price
+
+        min_price, best_supplier = _segment_minimum(entry_price, entry_supplier, offsets)
+
+        return SupplierCatalog(
+            currency=self.currency,
+            supplier_names=list(self._names),
+            supplier_order_cost=list(self._order_costs),
+            parts=parts,
+            supplier_count=supplier_count,
+            min_price=min_price,
+            best_supplier=best_supplier,
+            offsets=offsets,
+            entry_supplier=entry_supplier,
+            entry_price=entry_price,
+            entry_moq=entry_moq[order],
+            entry_multiple=entry_multiple[order],
+            tier_offsets=tier_offsets,
+            tier_qty=tier_qty,
+            tier_price=tier_price,
+        )
+
+
+def _is_tiered(value: Any) -> bool:
+    return isinstance(value, (list, tuple, Mapping))
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _parse_entry(value: Any) -> Tuple[List[Tuple[float, float]], float, float]:
+    """
+    Split a structured price entry into (tiers, moq, multiple):
+
+    - {"price": 0.10, "moq": 100, "multiple": 50}
+    - {"breaks": [[100, 0.10], [1000, 0.08]], "moq": 100}
+    - any shape accepted by parse_price_breaks() (moq and multiple 1)
+    """
+    if not (isinstance(value, Mapping) and any(key in value for key in _ENTRY_KEYS)):
+        return parse_price_breaks(value), 1.0, 1.0
+
+    if "breaks" in value and _is_tiered(value["breaks"]):
+        tiers = parse_price_breaks(value["breaks"])
+    else:
+        tiers = [(1.0, _to_float(value.get("price")))]
+
+    moq = _to_float(value.get("moq", 1))
+    multiple = _to_float(value.get("multiple", 1))
+    return (
+        tiers,
+        moq if moq == moq and moq > 0 else 1.0,
+        multiple if multiple == multiple and multiple > 0 else 1.0,
+    )
+
+
+def parse_price_breaks(value: Any) -> List[Tuple[float, float]]:
+    """
+    Normalize a tiered supplier price into (break quantity, unit price)
+    pairs sorted by quantity. Accepted shapes:
+
+    - [[1, 0.10], [1000, 0.08]]
+    - [{"min_qty": 1, "price": 0.10}, {"min_qty": 1000, "price": 0.08}]
+      ("qty" / "quantity" are accepted instead of "min_qty")
+    - {"1": 0.10, "1000": 0.08}
+
+    Tiers without a usable quantity are dropped; an empty result is a
+    single tier at quantity 1 with no price.
+    """
+    if isinstance(value, Mapping):
+        raw = list(value.items())
+    else:
+        raw = []
+        for tier in value:
+            if isinstance(tier, Mapping):
+                qty = next((tier[k] for k in _TIER_QTY_KEYS if k in tier), None)
+                raw.append((qty, tier.get("price")))
+            elif isinstance(tier, (list, tuple)) and len(tier) == 2:
+                raw.append((tier[0], tier[1]))
+
+    tiers = [(_to_float(qty), _to_float(price)) for qty, price in raw]
+    tiers = sorted((qty, price) for qty, price in tiers if qty == qty and qty >= 0)
+    return tiers or [(1.0, float("nan"))]
+
+
+def _build_tiers(
+    flat_prices: np.ndarray,
+    tiered: List[int],
+    parsed: List[List[Tuple[float, float]]],
+    order: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lay out per-entry price tiers (entries in input order, flat prices
+    as one tier) and regroup them in catalog entry `order`. `parsed`
+    holds the tiers of the `tiered` entries.
+
+    Returns entry_price (lowest tier), tier_offsets, tier_qty, tier_price.
+    """
+    n_tiers = np.ones(len(flat_prices), dtype=np.int64)
+    n_tiers[tiered] = [len(tiers) for tiers in parsed]
+    input_offsets = np.concatenate([[0], np.cumsum(n_tiers)])
+
+    tier_qty = np.ones(int(input_offsets[-1]), dtype=np.float64)
+    tier_price = np.repeat(flat_prices, n_tiers)
+    for i, tiers in zip(tiered, parsed):
+        start = input_offsets[i]
+        tier_qty[start:start + len(tiers)] = [qty for qty, _ in tiers]
+        tier_price[start:start + len(tiers)] = [price for _, price in tiers]
+
+    counts = n_tiers[order]
+    tier_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    gather = np.repeat(input_offsets[:-1][order] - tier_offsets[:-1], counts) + np.arange(
+        int(tier_offsets[-1])
+    )
+    tier_qty, tier_price = tier_qty[gather], tier_price[gather]
+    return tier_price[tier_offsets[:-1]], tier_offsets, tier_qty, tier_price
+
+
+def _segmented_bisect(
+    values: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    targets: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized bisect_right of each target within its own sorted segment
+    values[start:end]. Runs log2(longest segment) rounds over all
+    targets at once and only reads the probed elements of `values`.
+    """
+    lo = np.broadcast_to(starts, targets.shape).astype(np.int64)
+    hi = np.broadcast_to(ends, targets.shape).astype(np.int64)
+    while True:
+        active = lo < hi
+        if not active.any():
+            return lo
+        mid = (lo + hi) // 2
+        probe = np.asarray(values[np.where(active, mid, 0)])
+        right = active & (probe <= targets)
+        lo = np.where(right, mid + 1, lo)
+        hi = np.where(active & ~right, mid, hi)
+
+
+def _factorize_sorted(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Like pd.factorize(sort=True), but sorts the uniques as a fixed-width
+    unicode array, which is much faster than sorting Python objects.
+    """
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == 0:
+        return codes, np.asarray(uniques, dtype=object)
+    order = np.argsort(np.asarray(uniques, dtype=object).astype(str), kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[codes], np.asarray(uniques, dtype=object)[order]
+
+
+def _segment_minimum(
+    entry_price: np.ndarray,
+    entry_supplier: np.ndarray,
+    offsets: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-part minimum numeric price and the first supplier offering it.
+    """
+    n_parts = len(offsets) - 1
+    if n_parts == 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int32)
+
+    starts = offsets[:-1]
+    min_price = np.fmin.reduceat(entry_price, starts)
+    is_min = entry_price == np.repeat(min_price, np.diff(offsets))
+    n_entries = len(entry_price)
+    candidate = np.where(is_min, np.arange(n_entries), n_entries)
+    first = np.minimum.reduceat(candidate, starts)
+    padded = np.append(entry_supplier, np.int32(-1))
+    return min_price, padded[first].astype(np.int32)
+
+
+def as_catalog(suppliers: Union[SupplierCatalog, Mapping[str, Any]]) -> SupplierCatalog:
+    """
+    Accept either a SupplierCatalog or the raw suppliers JSON dict.
+    """
+    if isinstance(suppliers, SupplierCatalog):
+        return suppliers
+    return SupplierCatalog.from_dict(suppliers)
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from bomer.core.catalog import ARRAY_FIELDS, INDEX_FIELDS, SupplierCatalog
+from bomer.core.exceptions import ConfigError, SupplierLoadError
+from bomer.core.loader import load_suppliers, stream_suppliers
+from bomer.core.partnumbers import match_mode
+
+# Bump whenever the on-disk layout changes; older entries are recompiled.
+CACHE_FORMAT_VERSION = 5
+
+
+
+def default_cache_dir() -> Path:
+    """
+    Per-user cache directory: $XDG_CACHE_HOME/bomer, else ~/.cache/bomer.
+    """
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "bomer"
+
+
+def _file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path: Path, hash_content: bool = False) -> Dict[str, Any]:
+    """
+    Identify a suppliers file by resolved path, size and mtime, plus an
+    optional SHA-256 of its content.
+    """
+    stat = path.stat()
+    fingerprint: Dict[str, Any] = {
+        "format_version": CACHE_FORMAT_VERSION,
+        "source": str(path.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    if hash_content:
+        fingerprint["sha256"] = _file_digest(path)
+    return fingerprint
+
+
+def _entry_dir(path: Path, cache_dir: Path, fingerprint: Dict[str, Any]) -> Path:
+    """
+    Cache entry of one version of a source: catalog/<source>/<fingerprint>.
+    """
+    source = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+    version = hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return cache_dir / "catalog" / source / version
+
+
+def _remove_stale_versions(entry: Path) -> None:
+    """
+    Best-effort removal of the other compiled versions of the same
+    source. Staging directories (dot-prefixed) of concurrent runs are
+    left alone; catalogs other processes have memory-mapped stay
+    readable on POSIX.
+    """
+    for sibling in entry.parent.iterdir():
+        if sibling == entry or sibling.name.startswith("."):
+            continue
+        if sibling.is_dir():
+            shutil.rmtree(sibling, ignore_errors=True)
+        else:
+            # Files of an entry in the pre-versioned layout
+            sibling.unlink(missing_ok=True)
+
+
+def _read_meta(entry: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with (entry / "meta.json").open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def compile_catalog(
+    path: Path,
+    cache_dir: Path,
+    hash_content: bool = False,
+    catalog: Optional[SupplierCatalog] = None,
+) -> Path:
+    """
+    Compile a suppliers file into the binary cache and return the entry
+    directory. Each array is stored as a .npy file so it can be
+    memory-mapped; part numbers are stored as sorted UTF-8 bytes, next
+    to the normalized part-number index.
+
+    The source is parsed with the streaming loader, so compiling never
+    holds the whole JSON document in memory.
+
+    Every version of the source (by fingerprint) gets its own entry,
+    written to a staging directory and published with one atomic
+    rename, so concurrent runs (batch workers, the server) never see a
+    partial entry or remove one another's. If another run published the
+    same version first, its entry is kept and this one is discarded.
+    """
+    fingerprint = source_fingerprint(path, hash_content=hash_content)
+    if catalog is None:
+        catalog = stream_suppliers(path)
+
+    entry = _entry_dir(path, cache_dir, fingerprint)
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{entry.name}.", dir=entry.parent))
+
+    try:
+        for name in ARRAY_FIELDS:
+            values = getattr(catalog, name)
+            if name == "parts" and values.dtype.kind != "S":
+                values = (
+                    np.char.encode(values.astype(str), "utf-8")
+                    if len(values)
+                    else np.empty(0, dtype="S1")
+                )
+            np.save(staging / f"{name}.npy", values, allow_pickle=False)
+
+        catalog.normalized_index()
+        for name in INDEX_FIELDS:
+            np.save(staging / f"{name}.npy", np.asarray(getattr(catalog, name)), allow_pickle=False)
+
+        meta = {
+            "fingerprint": fingerprint,
+            "currency": catalog.currency,
+            "supplier_names": catalog.supplier_names,
+            "supplier_order_cost": catalog.supplier_order_cost,
+        }
+        with (staging / "meta.json").open("w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            if _read_meta(entry) is None:
+                raise
+            shutil.rmtree(staging, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    _remove_stale_versions(entry)
+    return entry
+
+
+def open_compiled_catalog(
+    path: Path,
+    cache_dir: Path,
+    hash_content: bool = False,
+) -> Optional[SupplierCatalog]:
+    """
+    Open the compiled catalog for `path` if a cache entry exists and its
+    fingerprint still matches the source file; otherwise return None.
+    Arrays are memory-mapped, so only the pages a lookup touches are read.
+    """
+    fingerprint = source_fingerprint(path, hash_content=hash_content)
+    entry = _entry_dir(path, cache_dir, fingerprint)
+    meta = _read_meta(entry)
+    if meta is None or meta.get("fingerprint") != fingerprint:
+        return None
+
+    try:
+        return SupplierCatalog.open_compiled(entry)
+    except (OSError, ValueError):
+        return None
+
+
+def load_cached_catalog(
+    path: Path,
+    cache_dir: Path,
+    hash_content: bool = False,
+) -> SupplierCatalog:
+    """
+    Return the supplier catalog for `path`, opening the compiled cache
+    when it is fresh and (re)compiling it when it is missing or stale.
+
+    If the cache directory cannot be written, the in-memory catalog is
+    returned and a warning is emitted.
+    """
+    if not path.exists():
+        raise SupplierLoadError(f"Suppliers file not found: {path}")
+
+    cached = open_compiled_catalog(path, cache_dir, hash_content=hash_content)
+    if cached is not None:
+        return cached
+
+    catalog = stream_suppliers(path)
+    try:
+        compile_catalog(path, cache_dir, hash_content=hash_content, catalog=catalog)
+    except OSError as exc:
+        warnings.warn(f"Could not write supplier catalog cache in {cache_dir}: {exc}")
+        return catalog
+
+    return open_compiled_catalog(path, cache_dir, hash_content=hash_content) or catalog
+
+
+def cache_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve catalog cache settings from the `suppliers` config section:
+
+    suppliers:
+      cache: true            # use/compile the binary catalog cache
+      cache_dir: ~/.cache/bomer  # default: default_cache_dir()
+      cache_hash: false      # also fingerprint by SHA-256 of the content
+      streaming: false       # without cache: stream-parse, keeping BOM parts only
+    """
+    suppliers_cfg = config.get("suppliers", {})
+    flags = {}
+    for key, default in (("cache", True), ("streaming", False), ("cache_hash", False)):
+        value = suppliers_cfg.get(key, default)
+        if not isinstance(value, bool):
+            raise ConfigError(f"suppliers.{key} must be true or false, got {value!r}.")
+        flags[key] = value
+    cache_dir = suppliers_cfg.get("cache_dir")
+    if cache_dir is not None and not isinstance(cache_dir, str):
+        raise ConfigError(f"suppliers.cache_dir must be a string, got {cache_dir!r}.")
+    return {
+        "enabled": flags["cache"],
+        "streaming": flags["streaming"],
+        "cache_dir": default_cache_dir() if cache_dir is None else Path(cache_dir).expanduser(),
+        "hash_content": flags["cache_hash"],
+    }
+
+
+def load_catalog_for_config(
+    path: Path,
+    config: Dict[str, Any],
+    parts: Optional[Iterable[str]] = None,
+) -> SupplierCatalog:
+    """
+    Load the supplier catalog for `path`, going through the compiled
+    cache unless suppliers.cache is false.
+
+    Without the cache and with suppliers.streaming enabled, the file is
+    stream-parsed and only entries matching `parts` (if given, per
+    matching.mode) are kept.
+    """
+    settings = cache_settings(config)
+    if not settings["enabled"]:
+        if settings["streaming"]:
+            return stream_suppliers(path, parts=parts, match=match_mode(config))
+        return load_suppliers(path)
+    return load_cached_catalog(
+        path,
+        settings["cache_dir"],
+        hash_content=settings["hash_content"],
+    )
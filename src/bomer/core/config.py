@@ -3,7 +3,12 @@ from typing import Any, Dict, Optional
 
 import yaml
 
+from bomer.core.catalog_cache import cache_settings
 from bomer.core.exceptions import ConfigError
+from bomer.core.partnumbers import match_mode
+from bomer.core.scheduler import pipeline_settings
+from bomer.core.schema import schema_settings
+from bomer.engines.simulation import simulation_settings
 
 
 def _load_yaml(path: Path) -> Dict[str, Any]:
@@ -21,8 +26,14 @@ def validate_config(config: Dict[str, Any]) -> None:
     Validate basic structure and ranges of the config.
 
     - risk weights should be in [0, 1]
-    - suppliers.path should be a string if present
+    - suppliers.path / suppliers.cache_dir should be strings if present
+    - suppliers.cache / cache_hash / streaming should be booleans if present
     - cost.default_volume should be positive if present
+    - matching.mode should be one of exact / normalized / fuzzy
+    - schema.compact / schema.prune should be booleans if present
+    - pipeline.jobs should be a positive integer, pipeline.executor
+      thread or process
+    - simulation.* should be in range (see simulation_settings)
     """
     risk_cfg = config.get("risk", {})
     for key in ("single_source_weight", "missing_price_weight", "lifecycle_weight"):
@@ -47,6 +58,12 @@ def validate_config(config: Dict[str, Any]) -> None:
         if vol <= 0:
             raise ConfigError("cost.default_volume must be positive if provided.")
 
+    cache_settings(config)
+    match_mode(config)
+    pipeline_settings(config)
+    schema_settings(config)
+    simulation_settings(config)
+
 
 def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -16,3 +16,8 @@ class BomLoadError(BomerError):
 class SupplierLoadError(BomerError):
     """Raised when supplier data cannot be loaded."""
     pass
+
+
+class BomStructureError(BomerError):
+    """Raised when a hierarchical BOM is malformed (e.g. contains a cycle)."""
+    pass
@@ -0,0 +1,163 @@
+"""
+Minimal incremental JSON reader used to walk large supplier files
+without materialising the whole document.
+
+Only the containers the caller descends into are streamed; any other
+value is decoded in one piece with json.JSONDecoder.raw_decode.
+"""
+
+import json
+import re
+from typing import Any, Iterator, TextIO, Tuple
+
+_WS = re.compile(r"[ \t\n\r]*")
+
+# "key": <number> followed by its delimiter, the common shape of a price entry
+_NUMBER_PAIR = re.compile(
+    r'[ \t\n\r]*"((?:[^"\\]|\\.)*)"[ \t\n\r]*:[ \t\n\r]*'
+    r"(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)"
+    r"[ \t\n\r]*([,}])"
+)
+
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+_DECODER = json.JSONDecoder()
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class JsonStreamReader:
+    """
+    Pull-style reader over a text stream holding one JSON document.
+
+    iter_object() / iter_array() yield once per member; the caller must
+    consume each member (with value(), skip or a nested iter_*) before
+    advancing the iterator.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        data = self._stream.read(self._chunk_size)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Return the next non-whitespace character without consuming it.
+        """
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document.")
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' in JSON document.")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """
+        Decode the next complete JSON value.
+        """
+        self.peek()
+        while True:
+            try:
+                val, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                end = -1
+            # A value ending at the buffer edge, or a number followed by more
+            # number characters, may have been cut off by the chunk boundary
+            if end >= 0 and (
+                self._eof
+                or (end < len(self._buf) and self._buf[end] not in _NUMBER_CHARS)
+            ):
+                self._pos = end
+                return val
+            self._fill()
+
+    def _member_end(self, closer: str) -> bool:
+        char = self.peek()
+        self._pos += 1
+        if char == closer:
+            return True
+        if char != ",":
+            raise ValueError(f"Expected ',' or '{closer}' but found '{char}' in JSON document.")
+        return False
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the next JSON object.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Object keys must be strings in JSON document.")
+            self.expect(":")
+            yield key
+            if self._member_end("}"):
+                return
+
+    def iter_array(self) -> Iterator[int]:
+        """
+        Iterate over the element positions of the next JSON array.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self._member_end("]"):
+                return
+
+    def iter_items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over (key, value) pairs of the next JSON object, with a
+        fast path for numeric values.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            match = _NUMBER_PAIR.match(self._buf, self._pos)
+            if match is not None:
+                key = match.group(1)
+                if "\\" in key:
+                    key = json.loads(f'"{key}"')
+                self._pos = match.end()
+                yield key, float(match.group(2))
+                if match.group(3) == "}":
+                    return
+                continue
+
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Object keys must be strings in JSON document.")
+            self.expect(":")
+            yield key, self.value()
+            if self._member_end("}"):
+                return
@@ -1,26 +1,93 @@
+import importlib.util
 import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+import numpy as np
 import pandas as pd
 
+from bomer.core.catalog import CatalogBuilder, SupplierCatalog
 from bomer.core.exceptions import BomLoadError, SupplierLoadError
+from bomer.core.jsonstream import JsonStreamReader
+from bomer.core.partnumbers import canonical_key
+from bomer.core.sources import (
+    BOM_FORMATS,
+    SUPPLIER_FORMATS,
+    bom_separator,
+    open_binary,
+    open_text,
+    supplier_format,
+)
 
+# Multithreaded CSV parser for load_bom(fast=True), used when pyarrow is
+# installed. It infers some types differently from the default parser
+# (e.g. dates), so iter_bom_chunks() results only match the default one.
+FAST_CSV_ENGINE = "pyarrow"
 
-def load_bom(path: Path) -> pd.DataFrame:
-    """
-    Load a BOM CSV from the given path.
 
-    Raises BomLoadError with a clear message if loading fails.
+def _bom_separator(path: Path) -> str:
+    """
+    Field separator of a BOM source, raising BomLoadError if the file is
+    missing or not a (possibly compressed) CSV/TSV.
     """
     if not path.exists():
         raise BomLoadError(f"BOM file not found: {path}")
+    try:
+        sep = bom_separator(path)
+    except (OSError, ValueError, ImportError):
+        sep = None
+    if sep is None:
+        raise BomLoadError(
+            f"Unsupported BOM format for {path}. Expected {', '.join(BOM_FORMATS)} "
+            "(optionally .gz, .bz2, .xz or .zst compressed)"
+        )
+    return sep
+
+
+def _usecols(path: Path, sep: str, columns: Optional[Callable[[str], bool]]) -> Optional[List[str]]:
+    """
+    Header columns of the BOM that `columns` accepts (None: all).
+    """
+    if columns is None:
+        return None
+    with open_binary(path) as f:
+        header = pd.read_csv(f, sep=sep, nrows=0).columns
+    return [col for col in header if columns(col)]
+
+
+def load_bom(
+    path: Path,
+    columns: Optional[Callable[[str], bool]] = None,
+    fast: bool = False,
+) -> pd.DataFrame:
+    """
+    Load a BOM from the given path: CSV or TSV, optionally gzip, bz2,
+    xz or zstd compressed (see bomer.core.sources; decompressed while
+    parsing).
 
-    if path.suffix.lower() != ".csv":
-        raise BomLoadError(f"Unsupported BOM format for {path}. Expected .csv")
+    - columns: only read the source columns this predicate accepts
+      (see schema.bom_columns)
+    - fast: parse with pyarrow's multithreaded reader when it is
+      installed, falling back to the default parser for files it
+      rejects (schema.fast_parser). Column types may then differ from
+      iter_bom_chunks(), which always uses the default parser.
+
+    Raises BomLoadError with a clear message if loading fails.
+    """
+    sep = _bom_separator(path)
 
     try:
-        df = pd.read_csv(path)
+        usecols = _usecols(path, sep, columns)
+        df = None
+        if fast and importlib.util.find_spec(FAST_CSV_ENGINE) is not None:
+            try:
+                with open_binary(path) as f:
+                    df = pd.read_csv(f, sep=sep, usecols=usecols, engine=FAST_CSV_ENGINE)
+            except Exception:
+                df = None
+        if df is None:
+            with open_binary(path) as f:
+                df = pd.read_csv(f, sep=sep, usecols=usecols)
     except Exception as exc:  # pragma: no cover - generic safety net
         raise BomLoadError(f"Failed to read BOM CSV {path}: {exc}") from exc
 
@@ -30,9 +97,119 @@ def load_bom(path: Path) -> pd.DataFrame:
     return df
 
 
-def load_suppliers(path: Path) -> Dict[str, Any]:
+def _unify_dtype(dtypes: List[Any]) -> Any:
+    """
+    Dtype pandas would have inferred for a column read in one piece,
+    given the dtypes it inferred for each chunk.
+    """
+    if all(dtype == dtypes[0] for dtype in dtypes):
+        return dtypes[0]
+    if all(getattr(dtype, "kind", "O") in "iuf" for dtype in dtypes):
+        return np.dtype("float64")
+    return str
+
+
+def iter_bom_chunks(
+    path: Path,
+    chunksize: int,
+    columns: Optional[Callable[[str], bool]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a BOM in chunks of `chunksize` rows (only the source columns
+    `columns` accepts, if given), in any format load_bom() accepts.
+
+    A first lightweight pass infers the dtype of every column across all
+    chunks, and the second pass reads with that plan, so each chunk has
+    the same dtypes (and formats the same way) as the in-memory load.
+    Row indices continue across chunks.
+
+    Raises BomLoadError with a clear message if loading fails.
+    """
+    sep = _bom_separator(path)
+
+    if chunksize <= 0:
+        raise BomLoadError(f"Chunk size must be positive, got {chunksize}.")
+
+    try:
+        usecols = _usecols(path, sep, columns)
+        seen: Dict[str, List[Any]] = {}
+        n_rows = 0
+        with open_binary(path) as f, pd.read_csv(f, sep=sep, chunksize=chunksize, usecols=usecols) as reader:
+            for chunk in reader:
+                n_rows += len(chunk)
+                for col, dtype in chunk.dtypes.items():
+                    seen.setdefault(col, []).append(dtype)
+    except Exception as exc:  # pragma: no cover - generic safety net
+        raise BomLoadError(f"Failed to read BOM CSV {path}: {exc}") from exc
+
+    if n_rows == 0:
+        raise BomLoadError(f"BOM file {path} is empty.")
+
+    plan = {col: _unify_dtype(dtypes) for col, dtypes in seen.items()}
+
+    try:
+        with open_binary(path) as f, pd.read_csv(
+            f, sep=sep, chunksize=chunksize, usecols=usecols, dtype=plan
+        ) as reader:
+            for chunk in reader:
+                yield chunk
+    except Exception as exc:  # pragma: no cover
+        raise BomLoadError(f"Failed to read BOM CSV {path}: {exc}") from exc
+
+
+def _supplier_format(path: Path) -> str:
+    """
+    "json" or "jsonl", raising SupplierLoadError if the file is missing or
+    in neither format.
+    """
+    if not path.exists():
+        raise SupplierLoadError(f"Suppliers file not found: {path}")
+    try:
+        fmt = supplier_format(path)
+    except (OSError, ValueError, ImportError):
+        fmt = None
+    if fmt is None:
+        raise SupplierLoadError(
+            f"Unsupported suppliers format for {path}. Expected {', '.join(SUPPLIER_FORMATS)} "
+            "(optionally .gz, .bz2, .xz or .zst compressed)"
+        )
+    return fmt
+
+
+def _iter_json_lines(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    The JSON objects of a JSON Lines suppliers file, one per non-blank
+    line, read through open_text() (decompressing on the fly).
+    """
+    with open_text(path) as f:
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"line {lineno}: {exc}") from exc
+            if not isinstance(entry, dict):
+                raise ValueError(f"line {lineno}: expected a JSON object.")
+            yield entry
+
+
+def _is_supplier_entry(entry: Dict[str, Any]) -> bool:
+    """
+    JSON Lines entries with a name or prices are suppliers; others (e.g.
+    {"currency": "EUR"}) set document-level fields.
+    """
+    return "name" in entry or "prices" in entry
+
+
+def load_suppliers(path: Path) -> SupplierCatalog:
     """
-    Load supplier pricing data from JSON.
+    Load supplier pricing data from JSON and compile it into a
+    SupplierCatalog (one pass over the parsed document).
+
+    JSON Lines files (.jsonl / .ndjson) hold one supplier object per line,
+    optionally with a {"currency": ...} line; any format may be gzip, bz2,
+    xz or zstd compressed (see bomer.core.sources).
 
     Structure is expected to be:
     {
@@ -47,19 +224,148 @@ def load_suppliers(path: Path) -> Dict[str, Any]:
 
     Raises SupplierLoadError if anything is invalid.
     """
-    if not path.exists():
-        raise SupplierLoadError(f"Suppliers file not found: {path}")
-
-    if path.suffix.lower() != ".json":
-        raise SupplierLoadError(f"Unsupported suppliers format for {path}. Expected .json")
+    fmt = _supplier_format(path)
 
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        if fmt == "jsonl":
+            data: Any = {"suppliers": []}
+            for entry in _iter_json_lines(path):
+                if _is_supplier_entry(entry):
+                    data["suppliers"].append(entry)
+                elif "currency" in entry:
+                    data["currency"] = entry["currency"]
+        else:
+            with open_text(path) as f:
+                data = json.load(f)
     except Exception as exc:  # pragma: no cover
         raise SupplierLoadError(f"Failed to read suppliers JSON {path}: {exc}") from exc
 
     if not isinstance(data, dict):
         raise SupplierLoadError(f"Suppliers file {path} must contain a JSON object at top level.")
 
-    return data
+    if not isinstance(data.get("suppliers", []), list):
+        raise SupplierLoadError(f"Suppliers file {path}: 'suppliers' must be a list.")
+
+    try:
+        return SupplierCatalog.from_dict(data)
+    except (AttributeError, TypeError) as exc:
+        raise SupplierLoadError(f"Malformed supplier entry in {path}: {exc}") from exc
+
+
+def stream_suppliers(
+    path: Path,
+    parts: Optional[Iterable[str]] = None,
+    match: str = "exact",
+) -> SupplierCatalog:
+    """
+    Build a SupplierCatalog by walking the suppliers JSON incrementally
+    (JSON Lines: line by line; compressed files are decompressed on the
+    fly), feeding price entries straight into the catalog builder.
+
+    Peak memory is proportional to the resulting index rather than to the
+    raw document. If `parts` is given, only entries for those part
+    numbers are kept (the resulting catalog is then specific to that BOM);
+    with match "normalized" entries are compared by canonical key, and
+    with "fuzzy" nothing is filtered out.
+
+    Raises SupplierLoadError if anything is invalid.
+    """
+    fmt = _supplier_format(path)
+
+    keep: Optional[Set[str]] = None
+    if parts is not None and match == "exact":
+        keep = set(parts)
+    elif parts is not None and match == "normalized":
+        keep = {canonical_key(part) for part in parts}
+    builder = CatalogBuilder()
+
+    if fmt == "jsonl":
+        try:
+            for entry in _iter_json_lines(path):
+                if _is_supplier_entry(entry):
+                    _add_supplier_entry(entry, builder, keep, match == "normalized")
+                elif "currency" in entry:
+                    builder.currency = entry["currency"]
+        except (OSError, ValueError, ImportError, AttributeError, TypeError) as exc:
+            raise SupplierLoadError(f"Failed to read suppliers JSON Lines {path}: {exc}") from exc
+        return builder.build()
+
+    try:
+        with open_text(path) as f:
+            reader = JsonStreamReader(f)
+            if reader.peek() != "{":
+                raise SupplierLoadError(
+                    f"Suppliers file {path} must contain a JSON object at top level."
+                )
+            for key in reader.iter_object():
+                if key == "currency":
+                    builder.currency = reader.value()
+                elif key == "suppliers":
+                    if reader.peek() != "[":
+                        raise SupplierLoadError(f"Suppliers file {path}: 'suppliers' must be a list.")
+                    for _ in reader.iter_array():
+                        _stream_supplier(reader, builder, keep, match == "normalized")
+                else:
+                    reader.value()
+    except SupplierLoadError:
+        raise
+    except (OSError, ValueError, ImportError) as exc:
+        raise SupplierLoadError(f"Failed to read suppliers JSON {path}: {exc}") from exc
+
+    return builder.build()
+
+
+def _stream_supplier(
+    reader: JsonStreamReader,
+    builder: CatalogBuilder,
+    keep: Optional[Set[str]],
+    canonical: bool = False,
+) -> None:
+    if reader.peek() != "{":
+        raise ValueError("Each supplier entry must be a JSON object.")
+
+    idx = builder.add_supplier("")
+    for key in reader.iter_object():
+        if key == "name":
+            builder.rename_supplier(idx, reader.value())
+        elif key == "order_cost":
+            builder.set_order_cost(idx, reader.value())
+        elif key == "prices":
+            if reader.peek() != "{":
+                raise ValueError("Supplier 'prices' must be a JSON object.")
+            builder.add_prices(idx, _kept_prices(reader.iter_items(), keep, canonical))
+        else:
+            reader.value()
+
+
+def _kept_prices(
+    items: Iterable[Tuple[str, Any]],
+    keep: Optional[Set[str]],
+    canonical: bool,
+) -> Iterable[Tuple[str, Any]]:
+    """
+    The (part, price) pairs whose part (or its canonical key) is in `keep`.
+    """
+    if keep is not None and canonical:
+        return ((part, price) for part, price in items if canonical_key(part) in keep)
+    if keep is not None:
+        return ((part, price) for part, price in items if part in keep)
+    return items
+
+
+def _add_supplier_entry(
+    entry: Dict[str, Any],
+    builder: CatalogBuilder,
+    keep: Optional[Set[str]],
+    canonical: bool = False,
+) -> None:
+    """
+    Add one already parsed supplier object (a JSON Lines entry).
+    """
+    idx = builder.add_supplier(entry.get("name", ""))
+    if "order_cost" in entry:
+        builder.set_order_cost(idx, entry["order_cost"])
+    prices = entry.get("prices", {})
+    if not isinstance(prices, dict):
+        raise ValueError("Supplier 'prices' must be a JSON object.")
+    builder.add_prices(idx, _kept_prices(prices.items(), keep, canonical))
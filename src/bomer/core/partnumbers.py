@@ -0,0 +1,167 @@
+"""
+Part-number canonicalization and the fuzzy (packaging suffix) lookup
+used when a BOM part number does not match the supplier catalog
+verbatim.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from bomer.core.exceptions import ConfigError
+
+MATCH_MODES = ("exact", "normalized", "fuzzy")
+DEFAULT_MATCH_MODE = "exact"
+
+# How each BOM part was matched against the catalog
+MATCH_EXACT = "exact"
+MATCH_NORMALIZED = "normalized"
+MATCH_FUZZY = "fuzzy"
+MATCH_NONE = "none"
+
+# Distributor packaging / ordering suffixes that do not change the part,
+# stripped (repeatedly) when they follow a "-", "/" or "#" at the end
+PACKAGING_SUFFIXES = frozenset(
+    ("TR", "T&R", "CT", "DKR", "ND", "PBF", "TRPBF", "REEL", "REEL7", "TAPE", "CUT", "BULK")
+)
+_SUFFIX_ENDINGS = tuple(PACKAGING_SUFFIXES)
+
+# Every byte except ASCII digits and upper-case letters
+_NON_ALNUM = bytes(c for c in range(256) if not (48 <= c <= 57 or 65 <= c <= 90))
+
+# A fuzzy match accepts catalog and BOM keys that differ only by up to
+# this many trailing packaging suffixes written without a separator
+# (e.g. "LM358DRTR" vs "LM358DR"); the shorter key must keep at least
+# FUZZY_MIN_PREFIX characters
+FUZZY_MAX_SUFFIXES = 2
+FUZZY_MIN_PREFIX = 4
+
+
+def _canonical_bytes(part: str) -> bytes:
+    key = part.strip().upper()
+    while key.endswith(_SUFFIX_ENDINGS):
+        cut = max(key.rfind("-"), key.rfind("/"), key.rfind("#"))
+        if cut < 0 or key[cut + 1:] not in PACKAGING_SUFFIXES:
+            break
+        key = key[:cut]
+    return key.encode("ascii", "ignore").translate(None, _NON_ALNUM)
+
+
+def canonical_key(part: str) -> str:
+    """
+    Canonical form of a single part number: upper case, without
+    packaging suffixes (-TR, /CT, #PBF, -ND, ...) and without any
+    character other than A-Z and 0-9. "RC0603FR-0710KL" and
+    "rc0603fr0710kl" both become "RC0603FR0710KL".
+    """
+    return _canonical_bytes(str(part)).decode("ascii")
+
+
+def canonicalize(parts: Union[Sequence[str], np.ndarray, pd.Series]) -> np.ndarray:
+    """
+    canonical_key() of every part as an ASCII bytes array (b"" for
+    missing values).
+    """
+    keys = [
+        _canonical_bytes(part) if isinstance(part, str) else _canonical_bytes(str(part)) if pd.notna(part) else b""
+        for part in np.asarray(parts, dtype=object)
+    ]
+    return np.array(keys, dtype="S") if keys else np.empty(0, dtype="S1")
+
+
+def build_normalized_index(parts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sorted canonical keys of the catalog parts and the part position of
+    each key. Keys shared by several parts map to the first of them in
+    catalog order; empty keys are left out.
+    """
+    if parts.dtype.kind == "S":
+        parts = np.char.decode(parts, "utf-8")
+    keys = canonicalize(parts)
+    order = np.argsort(keys, kind="stable")
+    keys, positions = keys[order], order.astype(np.int64)
+
+    first = np.r_[True, keys[1:] != keys[:-1]] if len(keys) else np.zeros(0, dtype=bool)
+    keep = first & (keys != b"")
+    return keys[keep], positions[keep]
+
+
+def _packaging_tails() -> List[bytes]:
+    """
+    Every run of 1..FUZZY_MAX_SUFFIXES canonical packaging suffixes,
+    shortest first.
+    """
+    singles = sorted({_canonical_bytes(suffix) for suffix in PACKAGING_SUFFIXES})
+    tails = set(singles)
+    for _ in range(FUZZY_MAX_SUFFIXES - 1):
+        tails |= {tail + suffix for tail in tails for suffix in singles}
+    return sorted(tails, key=lambda tail: (len(tail), tail))
+
+
+_PACKAGING_TAILS = _packaging_tails()
+
+
+def _exact_positions(index_keys: np.ndarray, probes: np.ndarray) -> np.ndarray:
+    found = np.minimum(np.searchsorted(index_keys, probes), len(index_keys) - 1)
+    return np.where(np.asarray(index_keys[found]) == probes, found, -1)
+
+
+def fuzzy_lookup(keys: np.ndarray, index_keys: np.ndarray) -> np.ndarray:
+    """
+    Packaging-suffix match of canonical `keys` against the sorted
+    `index_keys`.
+
+    A query matches an index key when the shorter of the two is a full
+    prefix of the longer and the rest is a run of PACKAGING_SUFFIXES
+    (e.g. "LM358DRTR" finds "LM358DR", and "LM358DR" finds
+    "LM358DRREEL7"). Anything else, including near misses such as
+    "RC0603FR07100KL" vs "RC0603FR0710KL", is left unmatched rather than
+    priced as a different part. Each candidate tail is one vectorized
+    binary search; the shortest tail wins, stripping the query before
+    extending it. Returns index positions, -1 if nothing qualifies.
+    """
+    result = np.full(len(keys), -1, dtype=np.int64)
+    if len(keys) == 0 or len(index_keys) == 0:
+        return result
+
+    keys = np.asarray(keys, dtype="S")
+    key_len = np.char.str_len(keys)
+    # Only queries that some longer index key starts with can be extended
+    after = np.searchsorted(index_keys, keys)
+    after = after + (np.asarray(index_keys[np.minimum(after, len(index_keys) - 1)]) == keys)
+    extendable = (after < len(index_keys)) & np.char.startswith(
+        np.asarray(index_keys[np.minimum(after, len(index_keys) - 1)]), keys
+    )
+    extendable &= key_len >= FUZZY_MIN_PREFIX
+    for tail in _PACKAGING_TAILS:
+        open_rows = result < 0
+        if not open_rows.any():
+            break
+        # Index key = query without the tail
+        rows = np.flatnonzero(
+            open_rows & (key_len >= FUZZY_MIN_PREFIX + len(tail)) & np.char.endswith(keys, tail)
+        )
+        if len(rows):
+            heads = np.array([key[: -len(tail)] for key in keys[rows]], dtype="S")
+            found = _exact_positions(index_keys, heads)
+            result[rows] = found
+            open_rows = result < 0
+        # Index key = query plus the tail
+        rows = np.flatnonzero(open_rows & extendable)
+        if len(rows):
+            result[rows] = _exact_positions(index_keys, np.char.add(keys[rows], tail))
+    return result
+
+
+def match_mode(config: Dict[str, Any]) -> str:
+    """
+    Part matching mode from config:
+
+    matching:
+      mode: exact   # exact | normalized | fuzzy
+    """
+    mode = config.get("matching", {}).get("mode", DEFAULT_MATCH_MODE)
+    if mode not in MATCH_MODES:
+        raise ConfigError(f"matching.mode must be one of {', '.join(MATCH_MODES)}, got {mode!r}.")
+    return mode
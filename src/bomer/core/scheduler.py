@@ -0,0 +1,225 @@
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from bomer.core.exceptions import ConfigError
+from bomer.instrumentation import StageRecorder
+
+EXECUTORS = ("thread", "process")
+DEFAULT_EXECUTOR = "thread"
+
+
+@dataclass
+class Stage:
+    """
+    One step of a pipeline DAG.
+
+    - fn: called with the values of `inputs` as positional arguments;
+      returns the value of its single output, or a tuple with one value
+      per output when there are several
+    - inputs / outputs: names of the values it reads and produces
+      (outputs default to the stage name)
+    - rows: rows it produced (for the profile), called with its return
+      value followed by its input values
+    - when: called with the input values; the stage is skipped (its
+      outputs set to None, nothing recorded) when it returns False
+    - local: always run in the scheduling process, also with the process
+      executor (cheap stages, or ones whose results do not pickle well)
+
+    With the process executor, `fn` and its arguments must be picklable:
+    module-level functions, or functools.partial objects of them.
+    """
+
+    name: str
+    fn: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    rows: Optional[Callable[..., Optional[int]]] = field(default=None, repr=False)
+    when: Optional[Callable[..., bool]] = field(default=None, repr=False)
+    local: bool = False
+
+    def __post_init__(self) -> None:
+        if not self.outputs:
+            self.outputs = (self.name,)
+
+
+def pipeline_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stage scheduling settings from config:
+
+    pipeline:
+      jobs: 1            # stages run at once; 1 runs them in order
+      executor: thread   # thread | process
+    """
+    pipeline_cfg = config.get("pipeline", {})
+    jobs = pipeline_cfg.get("jobs", 1)
+    if isinstance(jobs, bool) or not isinstance(jobs, int) or jobs < 1:
+        raise ConfigError(f"pipeline.jobs must be a positive integer, got {jobs!r}.")
+    executor = pipeline_cfg.get("executor", DEFAULT_EXECUTOR)
+    if executor not in EXECUTORS:
+        raise ConfigError(f"pipeline.executor must be one of {', '.join(EXECUTORS)}, got {executor!r}.")
+    return {"jobs": jobs, "executor": executor}
+
+
+def _check_graph(stages: Sequence[Stage], available: Iterable[str]) -> None:
+    """
+    Raise ConfigError unless every input is produced by exactly one stage
+    (or given) and the stages are listed in dependency order.
+    """
+    produced: Set[str] = set(available)
+    for stage in stages:
+        missing = [name for name in stage.inputs if name not in produced]
+        if missing:
+            raise ConfigError(
+                f"Pipeline stage {stage.name!r} needs {', '.join(missing)}, "
+                "which no earlier stage produces."
+            )
+        duplicate = [name for name in stage.outputs if name in produced]
+        if duplicate:
+            raise ConfigError(f"Pipeline stage {stage.name!r} redefines {', '.join(duplicate)}.")
+        produced.update(stage.outputs)
+
+
+def _store(stage: Stage, value: Any, values: Dict[str, Any]) -> None:
+    if len(stage.outputs) == 1:
+        values[stage.outputs[0]] = value
+    else:
+        values.update(zip(stage.outputs, value))
+
+
+def _release(stage: Stage, values: Dict[str, Any], readers: Dict[str, int]) -> None:
+    """
+    Count `stage` as done reading its inputs; drop the released values
+    nobody else reads.
+    """
+    for name in stage.inputs:
+        if name in readers:
+            readers[name] -= 1
+            if readers[name] == 0:
+                values.pop(name, None)
+
+
+class StageScheduler:
+    """
+    Runs a list of Stages, overlapping the ones that do not depend on each
+    other.
+
+    With jobs=1 the stages run one after the other in list order, exactly
+    like straight-line code. Otherwise every stage starts as soon as its
+    inputs are ready, with at most `jobs` running at once, on threads or
+    (executor="process") in worker processes. Results do not depend on
+    jobs or executor.
+
+    The first exception raised by a stage (a BomerError or anything else)
+    stops the scheduling of new stages; the running ones are waited for
+    and the exception is re-raised unchanged.
+
+    With jobs > 1 stages overlap, so the CPU time and memory recorded for
+    a stage include whatever ran alongside it; with the process executor
+    the CPU time of the workers is not counted at all.
+
+        scheduler = StageScheduler(jobs=4, recorder=recorder)
+        values = scheduler.run(stages, {"config": config})
+    """
+
+    def __init__(
+        self,
+        jobs: int = 1,
+        executor: str = DEFAULT_EXECUTOR,
+        recorder: Optional[StageRecorder] = None,
+    ) -> None:
+        if jobs < 1:
+            raise ConfigError(f"jobs must be at least 1, got {jobs}.")
+        if executor not in EXECUTORS:
+            raise ConfigError(f"executor must be one of {', '.join(EXECUTORS)}, got {executor!r}.")
+        self.jobs = jobs
+        self.executor = executor
+        self.recorder = recorder if recorder is not None else StageRecorder()
+
+    def run(
+        self,
+        stages: Sequence[Stage],
+        values: Optional[Dict[str, Any]] = None,
+        release: Iterable[str] = (),
+    ) -> Dict[str, Any]:
+        """
+        Run `stages` given the initial `values`; returns all values by name.
+
+        Values named in `release` (intermediates such as the raw BOM) are
+        dropped as soon as the last stage reading them has finished, so
+        they do not stay in memory for the rest of the run, and are not
+        returned.
+        """
+        values = dict(values or {})
+        _check_graph(stages, values)
+        readers: Dict[str, int] = {name: 0 for name in release}
+        for stage in stages:
+            for name in stage.inputs:
+                if name in readers:
+                    readers[name] += 1
+
+        if self.jobs == 1:
+            for stage in stages:
+                self._run_stage(stage, values, None)
+                _release(stage, values, readers)
+            return values
+
+        workers: Optional[Executor] = None
+        if self.executor == "process":
+            workers = ProcessPoolExecutor(max_workers=self.jobs)
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="bomer-stage") as threads:
+                self._run_concurrently(stages, values, readers, threads, workers)
+        finally:
+            if workers is not None:
+                workers.shutdown(cancel_futures=True)
+        return values
+
+    def _run_concurrently(
+        self,
+        stages: Sequence[Stage],
+        values: Dict[str, Any],
+        readers: Dict[str, int],
+        threads: ThreadPoolExecutor,
+        workers: Optional[Executor],
+    ) -> None:
+        pending: List[Stage] = list(stages)
+        running: Dict[Future, Stage] = {}
+        while pending or running:
+            for stage in [s for s in pending if all(name in values for name in s.inputs)]:
+                pending.remove(stage)
+                args = tuple(values[name] for name in stage.inputs)
+                running[threads.submit(self._call, stage, args, workers)] = stage
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    wait(running)
+                    raise error
+                _store(stage, future.result(), values)
+                _release(stage, values, readers)
+
+    def _run_stage(self, stage: Stage, values: Dict[str, Any], workers: Optional[Executor]) -> None:
+        args = tuple(values[name] for name in stage.inputs)
+        _store(stage, self._call(stage, args, workers), values)
+
+    def _call(self, stage: Stage, args: Tuple[Any, ...], workers: Optional[Executor]) -> Any:
+        if stage.when is not None and not stage.when(*args):
+            return None if len(stage.outputs) == 1 else (None,) * len(stage.outputs)
+        with self.recorder.stage(stage.name) as record:
+            if workers is None or stage.local:
+                result = stage.fn(*args)
+            else:
+                result = workers.submit(stage.fn, *args).result()
+            if stage.rows is not None:
+                record.rows = stage.rows(result, *args)
+        return result
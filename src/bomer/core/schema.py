@@ -1,7 +1,18 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
+from bomer.core.exceptions import ConfigError
+from bomer.core.validation import (
+    DEFAULT_RULES,
+    DEFAULT_SAMPLE_SIZE,
+    ValidationRule,
+    make_issue,
+    merge_issues,
+    run_rules,
+)
+
 # Canonical columns we want in the BOM
 CANONICAL_COLUMNS: List[str] = [
     "PartNumber",
@@ -12,6 +23,28 @@ CANONICAL_COLUMNS: List[str] = [
     "RoHS",
 ]
 
+# How normalize_bom_columns stores each column (schema.compact):
+# - "text": stripped strings, equal values sharing one string object
+# - "category": like "text", as a Categorical unless more than
+#   CATEGORY_MAX_RATIO of its values are distinct
+# - "quantity": integer quantities in the smallest integer type that
+#   holds them; fractional or malformed quantities are left as read
+COLUMN_PLAN: Dict[str, str] = {
+    "PartNumber": "text",
+    "Quantity": "quantity",
+    "Manufacturer": "category",
+    "Description": "category",
+    "LifecycleStatus": "category",
+    "RoHS": "category",
+    "Designator": "text",
+    "Parent": "text",
+}
+
+CATEGORY_MAX_RATIO = 0.5
+
+# Rows sampled to estimate how many distinct values a column has
+CARDINALITY_SAMPLE = 10_000
+
 # Default alias map: lowercased source column -> canonical column
 _DEFAULT_ALIAS_MAP: Dict[str, str] = {
     "mpn": "PartNumber",
@@ -27,6 +60,17 @@ _DEFAULT_ALIAS_MAP: Dict[str, str] = {
     "lifecycle status": "LifecycleStatus",
     "rohs": "RoHS",
     "rohs status": "RoHS",
+    "designator": "Designator",
+    "designators": "Designator",
+    "refdes": "Designator",
+    "ref des": "Designator",
+    "reference": "Designator",
+    "parent": "Parent",
+    "parent part": "Parent",
+    "parent part number": "Parent",
+    "parent pn": "Parent",
+    "assembly": "Parent",
+    "parent assembly": "Parent",
 }
 
 
@@ -55,6 +99,117 @@ def _build_alias_map(config: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
     return alias_map
 
 
+def schema_settings(config: Optional[Dict[str, Any]] = None) -> Dict[str, bool]:
+    """
+    BOM storage settings from the `schema` config section:
+
+    schema:
+      compact: true        # store columns per COLUMN_PLAN
+      prune: false         # only load the columns in COLUMN_PLAN
+      fast_parser: false   # pyarrow CSV parser for in-memory loads
+    """
+    schema_cfg = (config or {}).get("schema", {})
+    settings = {}
+    for key, default in (("compact", True), ("prune", False), ("fast_parser", False)):
+        value = schema_cfg.get(key, default)
+        if not isinstance(value, bool):
+            raise ConfigError(f"schema.{key} must be true or false if provided.")
+        settings[key] = value
+    return settings
+
+
+class PlannedColumns:
+    """
+    Column predicate: whether a source column maps, through `alias_map`,
+    to a column in COLUMN_PLAN. A plain class (not a closure) so it can
+    be pickled into process-pool stages.
+    """
+
+    def __init__(self, alias_map: Dict[str, str]) -> None:
+        self.alias_map = alias_map
+
+    def __call__(self, col: str) -> bool:
+        return self.alias_map.get(str(col).strip().lower(), col) in COLUMN_PLAN
+
+
+def bom_columns(config: Optional[Dict[str, Any]] = None) -> Optional[Callable[[str], bool]]:
+    """
+    With schema.prune, a predicate telling load_bom() which source
+    columns to read: those that map to a column in COLUMN_PLAN. None
+    (read everything) otherwise.
+    """
+    if not schema_settings(config)["prune"]:
+        return None
+    return PlannedColumns(_build_alias_map(config))
+
+
+def _mostly_distinct(series: pd.Series) -> bool:
+    """
+    Whether more than CATEGORY_MAX_RATIO of the values are distinct,
+    estimated on an evenly spaced sample of at most CARDINALITY_SAMPLE.
+    """
+    sample = series.iloc[:: max(len(series) // CARDINALITY_SAMPLE, 1)]
+    return sample.nunique(dropna=False) > CATEGORY_MAX_RATIO * len(sample)
+
+
+def _compact_text(series: pd.Series, categorical: bool) -> pd.Series:
+    """
+    Strip every distinct string once and share one object per value;
+    with `categorical`, return a Categorical. Mostly distinct columns
+    (nothing to share) and Arrow-backed strings (stored inline, no
+    objects to share) are just stripped.
+    """
+    arrow = getattr(series.dtype, "storage", None) == "pyarrow"
+    if (arrow and not categorical) or _mostly_distinct(series):
+        return series.str.strip()
+
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Index(uniques, dtype=object)
+    stripped = uniques.str.strip()
+    if not (stripped != uniques).any():
+        values = uniques
+    else:
+        # Stripping can make distinct values equal
+        merged, values = pd.factorize(stripped)
+        codes = np.append(merged, -1)[codes]
+    if categorical:
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=values),
+            index=series.index,
+            name=series.name,
+        )
+    lookup = np.append(np.asarray(values, dtype=object), np.nan)
+    return pd.Series(lookup[codes], index=series.index, name=series.name, dtype=series.dtype)
+
+
+def compact_bom(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store the columns of a canonical BOM as COLUMN_PLAN says. Text
+    columns holding anything but strings (e.g. numeric part numbers) are
+    left as read.
+    """
+    result = df.copy(deep=False)
+    for col, kind in COLUMN_PLAN.items():
+        if col not in result.columns:
+            continue
+        series = result[col]
+        if kind == "quantity":
+            if pd.api.types.is_integer_dtype(series.dtype):
+                result[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_string_dtype(series.dtype) and pd.api.types.infer_dtype(
+            series, skipna=True
+        ) in ("string", "empty"):
+            result[col] = _compact_text(series, categorical=kind == "category")
+    return result
+
+
+def frame_memory_mb(df: pd.DataFrame) -> float:
+    """
+    Memory held by a DataFrame in MB, including the strings it points to.
+    """
+    return float(df.memory_usage(index=True, deep=True).sum()) / 2**20
+
+
 def normalize_bom_columns(
     df: pd.DataFrame,
     config: Optional[Dict[str, Any]] = None,
@@ -64,8 +219,13 @@ def normalize_bom_columns(
 
     - Uses default alias map plus optional overrides from config.
     - Ensures canonical columns exist via ensure_canonical_columns().
+    - With schema.prune, drops columns outside COLUMN_PLAN.
+    - Unless schema.compact is false, stores columns per COLUMN_PLAN
+      (compact_bom): strings stripped once here, categoricals, compact
+      integer quantities.
     """
     alias_map = _build_alias_map(config)
+    settings = schema_settings(config)
 
     # Build rename map based on current columns
     rename_map: Dict[str, str] = {}
@@ -74,8 +234,12 @@ def normalize_bom_columns(
         if key in alias_map:
             rename_map[col] = alias_map[key]
 
-    result = df.rename(columns=rename_map).copy()
-    result = ensure_canonical_columns(result)
+    result = df.rename(columns=rename_map)
+    if settings["prune"]:
+        result = result[[col for col in result.columns if col in COLUMN_PLAN]]
+    result = ensure_canonical_columns(result.copy(deep=False))
+    if settings["compact"]:
+        result = compact_bom(result)
     return result
 
 
@@ -91,62 +255,94 @@ def ensure_canonical_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def validate_bom(df: pd.DataFrame) -> List[Dict[str, Any]]:
+def _required_column_issues(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    if "PartNumber" in df.columns and "Quantity" in df.columns:
+        return []
+    return [
+        make_issue(
+            rule="missing_columns",
+            field="schema",
+            message="Required columns PartNumber and Quantity are missing.",
+            count=1,
+        )
+    ]
+
+
+def validate_bom(
+    df: pd.DataFrame,
+    rules: Optional[List[ValidationRule]] = None,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> List[Dict[str, Any]]:
     """
-    Perform simple BOM validation.
+    Run column-wise validation rules over the BOM.
 
-    Returns a list of issue dictionaries, e.g.:
+    Returns one grouped issue per violated rule (see make_issue()), e.g.:
 
     {
-      "row_index": 0,
+      "rule": "quantity_not_numeric",
       "field": "Quantity",
-      "message": "Quantity is missing or not numeric"
+      "message": "Quantity is missing or not numeric.",
+      "row_indices": array([1, 7]),
+      "count": 2,
+      "sample": [None, "abc"]
     }
     """
-    issues: List[Dict[str, Any]] = []
+    schema_issues = _required_column_issues(df)
+    if schema_issues:
+        return schema_issues
+
+    return run_rules(df, DEFAULT_RULES if rules is None else rules, sample_size=sample_size)
+
+
+class ChunkedValidator:
+    """
+    Validate a BOM that arrives in consecutive chunks.
+
+    Row-local rules run on each chunk as it arrives. Rules comparing rows
+    with each other run once at the end over the columns they need, which
+    are the only columns retained between chunks. finish() returns the
+    same issues validate_bom() would on the concatenated BOM.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[List[ValidationRule]] = None,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+    ) -> None:
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.sample_size = sample_size
+        self._local_issues: List[List[Dict[str, Any]]] = []
+        self._keys: List[pd.DataFrame] = []
+        self._schema_issue: Optional[List[Dict[str, Any]]] = None
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        if self._schema_issue is not None:
+            return
+        schema_issues = _required_column_issues(chunk)
+        if schema_issues:
+            self._schema_issue = schema_issues
+            return
+
+        local = [rule for rule in self.rules if rule.row_local]
+        self._local_issues.append(run_rules(chunk, local, sample_size=self.sample_size))
 
-    if "PartNumber" not in df.columns or "Quantity" not in df.columns:
-        issues.append(
-            {
-                "row_index": None,
-                "field": "schema",
-                "message": "Required columns PartNumber and Quantity are missing.",
-            }
+        key_columns = sorted(
+            {col for rule in self.rules if not rule.row_local for col in rule.columns}
+            & set(chunk.columns)
         )
-        return issues
-
-    for idx, row in df.iterrows():
-        part = str(row.get("PartNumber", "")).strip()
-        qty = row.get("Quantity", None)
-
-        if not part:
-            issues.append(
-                {
-                    "row_index": int(idx),
-                    "field": "PartNumber",
-                    "message": "PartNumber is empty.",
-                }
-            )
-
-        try:
-            qty_val = float(qty)
-        except (TypeError, ValueError):
-            issues.append(
-                {
-                    "row_index": int(idx),
-                    "field": "Quantity",
-                    "message": "Quantity is missing or not numeric.",
-                }
-            )
-            continue
+        if key_columns:
+            self._keys.append(chunk[key_columns])
+
+    def finish(self) -> List[Dict[str, Any]]:
+        if self._schema_issue is not None:
+            return self._schema_issue
+
+        by_rule = {issue["rule"]: issue for issue in merge_issues(self._local_issues, self.sample_size)}
 
-        if qty_val <= 0:
-            issues.append(
-                {
-                    "row_index": int(idx),
-                    "field": "Quantity",
-                    "message": "Quantity must be positive.",
-                }
-            )
+        cross = [rule for rule in self.rules if not rule.row_local]
+        if cross and self._keys:
+            keys = pd.concat(self._keys)
+            for issue in run_rules(keys, cross, sample_size=self.sample_size):
+                by_rule[issue["rule"]] = issue
 
-    return issues
+        return [by_rule[rule.name] for rule in self.rules if rule.name in by_rule]
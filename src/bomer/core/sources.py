@@ -0,0 +1,142 @@
+"""
+Input file formats: detection and streaming decompression.
+
+A source is `<name><format suffix>[<compression suffix>]`, e.g.
+bom.csv, bom.tsv.gz, suppliers.jsonl.zst. Compression is taken from the
+suffix, else from the file's magic bytes; it is undone on the fly while
+reading, never through a temporary file.
+"""
+
+import bz2
+import gzip
+import io
+import json
+import lzma
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, TextIO, Tuple
+
+COMPRESSION_SUFFIXES: Dict[str, str] = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
+
+_MAGIC_BYTES: Tuple[Tuple[bytes, str], ...] = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+
+# BOM format suffix -> field separator
+BOM_FORMATS: Dict[str, str] = {".csv": ",", ".tsv": "\t", ".tab": "\t"}
+
+# Supplier format suffix -> format
+SUPPLIER_FORMATS: Dict[str, str] = {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def split_suffixes(path: Path) -> Tuple[str, Optional[str]]:
+    """
+    (format suffix, compression from the suffix) of a path, lower-cased:
+    bom.csv.gz -> (".csv", "gzip"), bom.csv -> (".csv", None).
+    """
+    suffixes = [s.lower() for s in path.suffixes]
+    if suffixes and suffixes[-1] in COMPRESSION_SUFFIXES:
+        return (suffixes[-2] if len(suffixes) > 1 else ""), COMPRESSION_SUFFIXES[suffixes[-1]]
+    return (suffixes[-1] if suffixes else ""), None
+
+
+def detect_compression(path: Path) -> Optional[str]:
+    """
+    Compression of a file from its suffix, else from its magic bytes.
+    """
+    compression = split_suffixes(path)[1]
+    if compression is not None:
+        return compression
+    with path.open("rb") as f:
+        head = f.read(8)
+    for magic, name in _MAGIC_BYTES:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def _open_zstd(path: Path) -> BinaryIO:
+    try:
+        from compression import zstd  # Python 3.14+
+
+        return zstd.open(path, "rb")
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ImportError(
+            f"Reading zstd-compressed {path} needs the zstandard package "
+            "(pip install bomer[zstd])."
+        ) from exc
+    raw = path.open("rb")
+    return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+
+
+def open_binary(path: Path) -> BinaryIO:
+    """
+    Open a source for reading, decompressing it as it is read.
+    """
+    compression = detect_compression(path)
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "bz2":
+        return bz2.open(path, "rb")
+    if compression == "xz":
+        return lzma.open(path, "rb")
+    if compression == "zstd":
+        return _open_zstd(path)
+    return path.open("rb")
+
+
+def open_text(path: Path) -> TextIO:
+    """
+    open_binary() decoded as UTF-8 (a leading BOM is skipped).
+    """
+    return io.TextIOWrapper(open_binary(path), encoding="utf-8-sig")
+
+
+def bom_separator(path: Path) -> Optional[str]:
+    """
+    Field separator of a BOM source from its format suffix; without a
+    known suffix, sniffed from the header line (tab if it has tabs but no
+    commas). None if the header has neither.
+    """
+    suffix = split_suffixes(path)[0]
+    if suffix in BOM_FORMATS:
+        return BOM_FORMATS[suffix]
+    with open_text(path) as f:
+        header = f.readline()
+    if "\t" in header and "," not in header:
+        return "\t"
+    if "," in header:
+        return ","
+    return None
+
+
+def supplier_format(path: Path) -> Optional[str]:
+    """
+    "json" or "jsonl" from the format suffix; without a known suffix, a
+    file whose first line is a complete JSON object followed by more
+    lines is JSON Lines, anything else starting with "{" is JSON. None if
+    it does not look like either.
+    """
+    suffix = split_suffixes(path)[0]
+    if suffix in SUPPLIER_FORMATS:
+        return SUPPLIER_FORMATS[suffix]
+    with open_text(path) as f:
+        first = f.readline()
+        if not first.lstrip().startswith("{"):
+            return None
+        try:
+            json.loads(first)
+        except ValueError:
+            return "json"
+        return "jsonl" if any(line.strip() for line in f) else "json"
@@ -0,0 +1,233 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Maximum number of offending values kept per issue group
+DEFAULT_SAMPLE_SIZE = 5
+
+
+@dataclass(frozen=True)
+class ValidationRule:
+    """
+    A single column-wise validation rule.
+
+    `check` receives the whole BOM and returns a boolean mask aligned with
+    the frame (True = offending row). The rule only runs if every column
+    in `columns` is present; `field` must be one of them.
+
+    `row_local` marks rules whose verdict for a row only depends on that
+    row; rules that compare rows with each other (duplicates, conflicts)
+    set it to False so chunked pipelines can run them on the full key set.
+    """
+
+    name: str
+    field: str
+    message: str
+    columns: Tuple[str, ...]
+    check: Callable[[pd.DataFrame], pd.Series]
+    row_local: bool = True
+
+
+def clean_strings(series: pd.Series) -> pd.Series:
+    """
+    Stringify and strip a column, mapping missing values to "".
+    Categoricals are cleaned once per category.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = clean_strings(pd.Series(series.cat.categories, dtype=object)).to_numpy()
+        # Missing values have code -1, which picks the trailing ""
+        values = np.append(categories.astype(object), "")[series.cat.codes.to_numpy()]
+        return pd.Series(values, index=series.index, name=series.name).astype(str)
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip()
+
+
+def _split_designators(series: pd.Series) -> pd.Series:
+    """
+    Explode reference designator cells like "R1, R2 R3" into one
+    designator per entry, keeping the original row index.
+    """
+    tokens = clean_strings(series).str.upper().str.split(r"[,;\s]+", regex=True).explode()
+    return tokens[tokens.notna() & (tokens != "")]
+
+
+def _empty_part_number(df: pd.DataFrame) -> pd.Series:
+    return clean_strings(df["PartNumber"]) == ""
+
+
+def _quantity_not_numeric(df: pd.DataFrame) -> pd.Series:
+    return pd.to_numeric(df["Quantity"], errors="coerce").isna()
+
+
+def _quantity_not_positive(df: pd.DataFrame) -> pd.Series:
+    qty = pd.to_numeric(df["Quantity"], errors="coerce")
+    return qty.notna() & (qty <= 0)
+
+
+def _duplicate_designator(df: pd.DataFrame) -> pd.Series:
+    tokens = _split_designators(df["Designator"])
+    if "Parent" in df.columns:
+        # Hierarchical BOMs: designators only need to be unique per assembly
+        keys = pd.DataFrame(
+            {
+                "Parent": clean_strings(df["Parent"]).loc[tokens.index].to_numpy(),
+                "Designator": tokens.to_numpy(),
+            }
+        )
+        duplicated = keys.duplicated(keep=False).to_numpy()
+    else:
+        duplicated = tokens.duplicated(keep=False).to_numpy()
+    dup_rows = tokens.index[duplicated]
+    return pd.Series(df.index.isin(dup_rows), index=df.index)
+
+
+def _conflicting_manufacturer(df: pd.DataFrame) -> pd.Series:
+    parts = clean_strings(df["PartNumber"])
+    mfrs = clean_strings(df["Manufacturer"]).str.upper()
+    known = (parts != "") & (mfrs != "")
+    counts = mfrs[known].groupby(parts[known]).nunique()
+    conflicted = counts.index[counts.to_numpy() > 1]
+    return known & parts.isin(conflicted)
+
+
+DEFAULT_RULES: List[ValidationRule] = [
+    ValidationRule(
+        name="empty_part_number",
+        field="PartNumber",
+        message="PartNumber is empty.",
+        columns=("PartNumber",),
+        check=_empty_part_number,
+    ),
+    ValidationRule(
+        name="quantity_not_numeric",
+        field="Quantity",
+        message="Quantity is missing or not numeric.",
+        columns=("Quantity",),
+        check=_quantity_not_numeric,
+    ),
+    ValidationRule(
+        name="quantity_not_positive",
+        field="Quantity",
+        message="Quantity must be positive.",
+        columns=("Quantity",),
+        check=_quantity_not_positive,
+    ),
+    ValidationRule(
+        name="duplicate_designator",
+        field="Designator",
+        message="Reference designator is used on more than one line.",
+        columns=("Designator",),
+        check=_duplicate_designator,
+        row_local=False,
+    ),
+    ValidationRule(
+        name="conflicting_manufacturer",
+        field="Manufacturer",
+        message="PartNumber is listed with more than one Manufacturer.",
+        columns=("PartNumber", "Manufacturer"),
+        check=_conflicting_manufacturer,
+        row_local=False,
+    ),
+]
+
+
+def _sample_values(values: pd.Series, sample_size: int) -> List[Any]:
+    sample: List[Any] = []
+    for value in values.head(sample_size).tolist():
+        if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NA:
+            sample.append(None)
+        elif isinstance(value, np.generic):
+            sample.append(value.item())
+        else:
+            sample.append(value)
+    return sample
+
+
+def make_issue(
+    rule: str,
+    field: str,
+    message: str,
+    row_indices: Optional[np.ndarray] = None,
+    count: Optional[int] = None,
+    sample: Optional[List[Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Build a grouped issue record:
+
+    {
+      "rule": "quantity_not_numeric",
+      "field": "Quantity",
+      "message": "Quantity is missing or not numeric.",
+      "row_indices": np.array([...]),
+      "count": 2,
+      "sample": [None, "abc"]
+    }
+    """
+    if row_indices is None:
+        row_indices = np.empty(0, dtype=np.int64)
+    return {
+        "rule": rule,
+        "field": field,
+        "message": message,
+        "row_indices": row_indices,
+        "count": int(len(row_indices) if count is None else count),
+        "sample": sample or [],
+    }
+
+
+def run_rules(
+    df: pd.DataFrame,
+    rules: Iterable[ValidationRule],
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate each rule as a vectorized mask over the whole frame and
+    return one grouped issue per rule that matched at least one row.
+    """
+    issues: List[Dict[str, Any]] = []
+    for rule in rules:
+        if any(col not in df.columns for col in rule.columns):
+            continue
+        mask = np.asarray(rule.check(df), dtype=bool)
+        if not mask.any():
+            continue
+        offending = df[rule.field][mask]
+        issues.append(
+            make_issue(
+                rule=rule.name,
+                field=rule.field,
+                message=rule.message,
+                row_indices=df.index[mask].to_numpy(dtype=np.int64),
+                sample=_sample_values(offending, sample_size),
+            )
+        )
+    return issues
+
+
+def merge_issues(
+    parts: List[List[Dict[str, Any]]],
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Merge issue lists computed on consecutive slices of one BOM into one
+    grouped issue per rule (first-seen rule order, capped sample).
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for issues in parts:
+        for issue in issues:
+            current = merged.get(issue["rule"])
+            if current is None:
+                merged[issue["rule"]] = dict(issue)
+                continue
+            current["row_indices"] = np.concatenate([current["row_indices"], issue["row_indices"]])
+            current["count"] += issue["count"]
+            current["sample"] = (current["sample"] + issue["sample"])[:sample_size]
+    return list(merged.values())
+
+
+def issue_count(issues: List[Dict[str, Any]]) -> int:
+    """
+    Total number of offending rows across grouped issues.
+    """
+    return int(sum(issue["count"] for issue in issues))
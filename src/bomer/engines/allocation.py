@@ -0,0 +1,399 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from bomer.core.catalog import SupplierCatalog, as_catalog
+from bomer.core.partnumbers import match_mode
+from bomer.core.validation import clean_strings
+from bomer.engines.cost import cost_currency, cost_volume
+from bomer.engines.models import PurchasePlan
+
+PLAN_LINE_COLUMNS: List[str] = [
+    "PartNumber",
+    "Supplier",
+    "RequiredQuantity",
+    "OrderQuantity",
+    "UnitPrice",
+    "LineCost",
+]
+
+PLAN_SUPPLIER_COLUMNS: List[str] = ["Supplier", "Parts", "ItemCost", "OrderCost", "TotalCost"]
+
+# Instances are solved exactly (every supplier subset) when there are at
+# most this many candidate suppliers and the enumeration stays small.
+EXACT_MAX_SUPPLIERS = 12
+EXACT_MAX_CELLS = 5_000_000
+
+# Closed suppliers tried per local-search swap round: all of them while
+# candidates x offers stays within SWAP_BUDGET, else at least this many
+SWAP_CANDIDATES = 8
+SWAP_BUDGET = 20_000_000
+
+# Local-search starts (each opening a different supplier first)
+RESTARTS = 4
+
+
+@dataclass
+class _Problem:
+    """
+    Sparse (part, supplier) offer table, sorted by part, then cost, then
+    supplier, so the first open offer of a part is its cheapest.
+    """
+
+    n_parts: int
+    part: np.ndarray
+    supplier: np.ndarray
+    cost: np.ndarray
+    fixed: np.ndarray
+    penalty: float
+
+
+def _required_quantities(bom: pd.DataFrame, volume: float) -> Tuple[np.ndarray, np.ndarray]:
+    parts = clean_strings(bom["PartNumber"])
+    qty = pd.to_numeric(bom["Quantity"], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+    codes, names = pd.factorize(parts.to_numpy())
+    required = np.bincount(codes, weights=qty, minlength=len(names)) * volume
+    names = np.asarray(names, dtype=object)
+    keep = (names != "") & (required > 0)
+    return names[keep], required[keep]
+
+
+def order_quantities(required: np.ndarray, moq: np.ndarray, multiple: np.ndarray) -> np.ndarray:
+    """
+    Smallest orderable quantity covering `required`: at least the MOQ and
+    a whole number of order multiples (e.g. reels).
+    """
+    quantity = np.maximum(required, moq)
+    return np.ceil(quantity / multiple - 1e-9) * multiple
+
+
+def _assign(problem: _Problem, open_mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cheapest and second-cheapest open offer per part (offer index, -1 if none).
+    """
+    best = np.full(problem.n_parts, -1, dtype=np.int64)
+    runner_up = np.full(problem.n_parts, -1, dtype=np.int64)
+    offers = np.flatnonzero(open_mask[problem.supplier])
+    if len(offers) == 0:
+        return best, runner_up
+
+    part = problem.part[offers]
+    group_start = np.r_[True, part[1:] != part[:-1]]
+    second = np.r_[False, group_start[:-1] & ~group_start[1:]]
+    best[part[group_start]] = offers[group_start]
+    runner_up[part[second]] = offers[second]
+    return best, runner_up
+
+
+def _offer_costs(problem: _Problem, offers: np.ndarray) -> np.ndarray:
+    return np.where(offers >= 0, problem.cost[np.maximum(offers, 0)], problem.penalty)
+
+
+def _objective(problem: _Problem, best: np.ndarray) -> float:
+    used = np.unique(problem.supplier[best[best >= 0]])
+    return float(_offer_costs(problem, best).sum() + problem.fixed[used].sum())
+
+
+def _used_mask(problem: _Problem, best: np.ndarray) -> np.ndarray:
+    used = np.zeros(len(problem.fixed), dtype=bool)
+    used[problem.supplier[best[best >= 0]]] = True
+    return used
+
+
+def _add_gains(problem: _Problem, open_mask: np.ndarray, best: np.ndarray) -> np.ndarray:
+    """
+    Objective decrease from opening each supplier (-inf for open ones).
+    """
+    current = _offer_costs(problem, best)
+    saving = np.maximum(current[problem.part] - problem.cost, 0.0)
+    gains = np.bincount(problem.supplier, weights=saving, minlength=len(problem.fixed)) - problem.fixed
+    gains[open_mask] = -np.inf
+    return gains
+
+
+def _drop_deltas(problem: _Problem, open_mask: np.ndarray, best: np.ndarray, runner_up: np.ndarray) -> np.ndarray:
+    """
+    Objective change from closing each open supplier (+inf for closed
+    ones): its parts fall back to their runner-up offers and its fixed
+    order cost is saved.
+    """
+    assigned = np.flatnonzero(best >= 0)
+    moved = _offer_costs(problem, runner_up[assigned]) - problem.cost[best[assigned]]
+    deltas = (
+        np.bincount(problem.supplier[best[assigned]], weights=moved, minlength=len(problem.fixed))
+        - problem.fixed
+    )
+    deltas[~open_mask] = np.inf
+    return deltas
+
+
+def _local_search(problem: _Problem, max_suppliers: Optional[int]) -> np.ndarray:
+    """
+    Multi-start local search. Each start opens one of the most valuable
+    suppliers first, then runs _improve(); the cheapest result wins
+    (earliest start on ties). Small instances get RESTARTS starts,
+    large ones fewer so the total work stays within SWAP_BUDGET.
+    """
+    n_suppliers = len(problem.fixed)
+    closed = np.zeros(n_suppliers, dtype=bool)
+    best, _ = _assign(problem, closed)
+    gains = _add_gains(problem, closed, best)
+
+    n_starts = max(1, min(RESTARTS, SWAP_BUDGET // max(len(problem.cost) * n_suppliers, 1)))
+    starts = [s for s in np.argsort(-gains, kind="stable")[:n_starts] if gains[s] > 0] or [None]
+
+    result, result_objective = closed, np.inf
+    for first in starts:
+        open_mask = closed.copy()
+        if first is not None:
+            open_mask[first] = True
+        open_mask, objective = _improve(problem, open_mask, max_suppliers)
+        if objective < result_objective:
+            result, result_objective = open_mask, objective
+    return result
+
+
+def _improve(
+    problem: _Problem,
+    open_mask: np.ndarray,
+    max_suppliers: Optional[int],
+) -> Tuple[np.ndarray, float]:
+    """
+    Greedy construction (open the supplier with the largest objective
+    decrease until none helps or the cap is reached), then add / drop /
+    swap moves until no move improves the objective. Every accepted move
+    strictly lowers the objective, and ties go to the lowest supplier
+    index, so the result is deterministic.
+    """
+    n_suppliers = len(problem.fixed)
+    cap = n_suppliers if max_suppliers is None else min(max_suppliers, n_suppliers)
+    best, runner_up = _assign(problem, open_mask)
+    objective = _objective(problem, best)
+    tolerance = 1e-9 * max(1.0, abs(objective))
+
+    while True:
+        if open_mask.sum() < cap:
+            gains = _add_gains(problem, open_mask, best)
+            candidate = int(np.argmax(gains))
+            if gains[candidate] > tolerance:
+                open_mask[candidate] = True
+                best, runner_up = _assign(problem, open_mask)
+                objective = _objective(problem, best)
+                continue
+
+        deltas = _drop_deltas(problem, open_mask, best, runner_up)
+        if open_mask.any():
+            candidate = int(np.argmin(deltas))
+            if deltas[candidate] < -tolerance:
+                open_mask[candidate] = False
+                best, runner_up = _assign(problem, open_mask)
+                objective = _objective(problem, best)
+                continue
+
+        swapped = _best_swap(problem, open_mask, best, objective, tolerance)
+        if swapped is None:
+            break
+        open_mask, best, runner_up, objective = swapped
+
+    return open_mask & _used_mask(problem, best), objective
+
+
+def _best_swap(
+    problem: _Problem,
+    open_mask: np.ndarray,
+    best: np.ndarray,
+    objective: float,
+    tolerance: float,
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, float]]:
+    """
+    Best improving swap: open a closed supplier and close the open
+    supplier that then hurts least. Incoming suppliers are tried in
+    order of how much they would save; on large instances only the
+    first SWAP_CANDIDATES of them.
+    """
+    current = _offer_costs(problem, best)
+    saving = np.maximum(current[problem.part] - problem.cost, 0.0)
+    raw_gain = np.bincount(problem.supplier, weights=saving, minlength=len(problem.fixed))
+    raw_gain[open_mask] = -np.inf
+    n_candidates = max(SWAP_CANDIDATES, SWAP_BUDGET // max(len(problem.cost), 1))
+    candidates = np.argsort(-raw_gain, kind="stable")[:n_candidates]
+
+    # Small instances: try every open supplier as the outgoing one
+    exhaustive = len(candidates) * int(open_mask.sum()) * len(problem.cost) <= SWAP_BUDGET
+
+    found = None
+    for incoming in candidates:
+        if not np.isfinite(raw_gain[incoming]) or raw_gain[incoming] <= 0:
+            break
+        trial = open_mask.copy()
+        trial[incoming] = True
+        if exhaustive:
+            outgoing_options = np.flatnonzero(open_mask)
+        else:
+            trial_best, trial_runner_up = _assign(problem, trial)
+            deltas = _drop_deltas(problem, trial, trial_best, trial_runner_up)
+            deltas[incoming] = np.inf
+            outgoing_options = np.array([int(np.argmin(deltas))])
+        for outgoing in outgoing_options:
+            swapped = trial.copy()
+            swapped[outgoing] = False
+            trial_best, trial_runner_up = _assign(problem, swapped)
+            trial_objective = _objective(problem, trial_best)
+            if trial_objective < objective - tolerance:
+                found = (swapped, trial_best, trial_runner_up, trial_objective)
+                objective = trial_objective
+    return found
+
+
+def _exact(problem: _Problem, max_suppliers: Optional[int]) -> np.ndarray:
+    """
+    Enumerate every supplier subset (within the cap) on a dense part x
+    supplier cost matrix and keep the cheapest; ties go to the subset
+    with the lowest bitmask.
+    """
+    n_suppliers = len(problem.fixed)
+    dense = np.full((problem.n_parts, n_suppliers), np.inf)
+    np.minimum.at(dense, (problem.part, problem.supplier), problem.cost)
+
+    masks = (np.arange(1 << n_suppliers)[:, None] >> np.arange(n_suppliers)) & 1
+    masks = masks.astype(bool)
+    if max_suppliers is not None:
+        masks = masks[masks.sum(axis=1) <= max_suppliers]
+
+    per_part = np.where(masks[:, None, :], dense[None, :, :], np.inf).min(axis=2)
+    per_part[np.isinf(per_part)] = problem.penalty
+    totals = per_part.sum(axis=1) + masks.astype(np.float64) @ problem.fixed
+    open_mask = masks[int(np.argmin(totals))]
+
+    best, _ = _assign(problem, open_mask)
+    return open_mask & _used_mask(problem, best)
+
+
+def allocate_suppliers(
+    bom: pd.DataFrame,
+    suppliers: Union[SupplierCatalog, Dict[str, Any]],
+    config: Optional[Dict[str, Any]] = None,
+    max_suppliers: Optional[int] = None,
+) -> PurchasePlan:
+    """
+    Assign each part to one supplier, minimising total landed cost:
+
+    - order quantity: Quantity x cost.default_volume, raised to the
+      supplier's MOQ and rounded up to its order multiple
+    - item cost: order quantity x the price tier for that quantity
+    - order cost: fixed `order_cost` of every supplier ordered from
+
+    At most `max_suppliers` suppliers are used if given. Small instances
+    are solved exactly; larger ones with greedy construction plus
+    add/drop/swap local search. Parts no supplier prices are reported as
+    unassigned.
+
+    Returns a PurchasePlan with per-part lines and per-supplier totals.
+    """
+    if config is None:
+        config = {}
+    if max_suppliers is not None and max_suppliers < 1:
+        raise ValueError("max_suppliers must be at least 1.")
+
+    catalog = as_catalog(suppliers)
+    names, required = _required_quantities(bom, cost_volume(config))
+
+    positions, _ = catalog.match(names, match_mode(config))
+    pair_part, pair_entry = catalog.entries_for(positions)
+    order_qty = order_quantities(
+        required[pair_part],
+        np.asarray(catalog.entry_moq[pair_entry]),
+        np.asarray(catalog.entry_multiple[pair_entry]),
+    )
+    unit_price = catalog.entry_unit_prices(pair_entry, order_qty)[:, 0]
+    priced = ~np.isnan(unit_price)
+    pair_part, pair_entry = pair_part[priced], pair_entry[priced]
+    order_qty, unit_price = order_qty[priced], unit_price[priced]
+    line_cost = order_qty * unit_price
+
+    candidate_ids, pair_supplier = np.unique(
+        np.asarray(catalog.entry_supplier[pair_entry]), return_inverse=True
+    )
+    if len(candidate_ids) == 0:
+        # No part has a priced supplier: nothing to order
+        return PurchasePlan(
+            currency=cost_currency(catalog, config),
+            method="exact",
+            total_cost=0.0,
+            item_cost=0.0,
+            order_cost=0.0,
+            supplier_count=0,
+            unassigned=sorted(str(p) for p in names),
+            lines=pd.DataFrame(columns=PLAN_LINE_COLUMNS),
+            suppliers=pd.DataFrame(columns=PLAN_SUPPLIER_COLUMNS),
+        )
+    all_costs = np.asarray(catalog.supplier_order_cost, dtype=np.float64)
+    fixed = all_costs[candidate_ids] if len(all_costs) else np.zeros(len(candidate_ids))
+
+    order = np.lexsort((pair_supplier, line_cost, pair_part))
+    problem = _Problem(
+        n_parts=len(names),
+        part=pair_part[order],
+        supplier=pair_supplier[order],
+        cost=line_cost[order],
+        fixed=fixed,
+        penalty=float(line_cost.sum() + fixed.sum() + 1.0),
+    )
+
+    n_candidates = len(candidate_ids)
+    exact = (
+        n_candidates <= EXACT_MAX_SUPPLIERS
+        and (1 << n_candidates) * max(len(names), 1) * max(n_candidates, 1) <= EXACT_MAX_CELLS
+    )
+    open_mask = _exact(problem, max_suppliers) if exact else _local_search(problem, max_suppliers)
+
+    best, _ = _assign(problem, open_mask)
+    assigned = np.flatnonzero(best >= 0)
+    chosen = order[best[assigned]]
+    supplier_names = np.asarray(catalog.supplier_names, dtype=object)
+
+    lines = pd.DataFrame(
+        {
+            "PartNumber": names[assigned],
+            "Supplier": supplier_names[candidate_ids[pair_supplier[chosen]]],
+            "RequiredQuantity": required[assigned],
+            "OrderQuantity": order_qty[chosen],
+            "UnitPrice": unit_price[chosen],
+            "LineCost": np.round(line_cost[chosen], 4),
+        },
+        columns=PLAN_LINE_COLUMNS,
+    ).sort_values(["Supplier", "PartNumber"], kind="stable", ignore_index=True)
+
+    used = np.flatnonzero(open_mask)
+    n_candidates = len(candidate_ids)
+    supplier_table = pd.DataFrame(
+        {
+            "Supplier": supplier_names[candidate_ids[used]],
+            "Parts": np.bincount(pair_supplier[chosen], minlength=n_candidates)[used],
+            "ItemCost": np.round(
+                np.bincount(pair_supplier[chosen], weights=line_cost[chosen], minlength=n_candidates)[used],
+                4,
+            ),
+            "OrderCost": fixed[used],
+        }
+    )
+    supplier_table["TotalCost"] = (supplier_table["ItemCost"] + supplier_table["OrderCost"]).round(4)
+    supplier_table = supplier_table[PLAN_SUPPLIER_COLUMNS].sort_values(
+        "Supplier", kind="stable", ignore_index=True
+    )
+
+    item_cost = float(round(float(line_cost[chosen].sum()), 4))
+    order_cost = float(round(float(fixed[used].sum()), 4))
+    return PurchasePlan(
+        currency=cost_currency(catalog, config),
+        method="exact" if exact else "local_search",
+        total_cost=round(item_cost + order_cost, 4),
+        item_cost=item_cost,
+        order_cost=order_cost,
+        supplier_count=int(len(used)),
+        unassigned=sorted(str(p) for p in names[best < 0]),
+        lines=lines,
+        suppliers=supplier_table,
+    )
@@ -1,84 +1,166 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Union
 
+import numpy as np
 import pandas as pd
 
-from bomer.engines.models import CostLineItem, CostSummary
+from bomer.core.catalog import SupplierCatalog, as_catalog
+from bomer.core.partnumbers import DEFAULT_MATCH_MODE, match_mode
+from bomer.core.validation import clean_strings
+from bomer.engines.models import CostLines, CostSummary
 
+COST_LINE_COLUMNS: List[str] = [
+    "PartNumber",
+    "Quantity",
+    "UnitPrice",
+    "LineCost",
+    "MatchedPart",
+    "MatchType",
+]
 
-def _build_price_index(suppliers_data: Dict[str, Any]) -> Dict[str, float]:
+
+def _bom_lines(bom: pd.DataFrame) -> pd.DataFrame:
     """
-    Build a simple PartNumber -> UnitPrice index using the
-    minimum price found across all suppliers.
+    Extract stripped PartNumber keys and numeric quantities (missing or
+    non-numeric quantities count as 0) from the BOM.
     """
-    index: Dict[str, float] = {}
+    if "PartNumber" in bom.columns:
+        parts = clean_strings(bom["PartNumber"])
+    else:
+        parts = pd.Series("", index=bom.index, dtype=object)
 
-    for supplier in suppliers_data.get("suppliers", []):
-        prices = supplier.get("prices", {})
-        for part, price in prices.items():
-            try:
-                p = float(price)
-            except (TypeError, ValueError):
-                continue
-            if part not in index or p < index[part]:
-                index[part] = p
+    if "Quantity" in bom.columns:
+        qty = pd.to_numeric(bom["Quantity"], errors="coerce").fillna(0.0).astype(float)
+    else:
+        qty = pd.Series(0.0, index=bom.index)
 
-    return index
+    return pd.DataFrame({"PartNumber": parts.to_numpy(), "Quantity": qty.to_numpy()})
 
 
-def analyze_costs(
+def price_lines(
     bom: pd.DataFrame,
-    suppliers_data: Dict[str, Any],
-    config: Optional[Dict[str, Any]] = None,
-) -> CostSummary:
+    catalog: SupplierCatalog,
+    volume: float = 1.0,
+    match: str = DEFAULT_MATCH_MODE,
+) -> pd.DataFrame:
     """
-    Compute per-line and total cost from a BOM and supplier pricing.
+    Per-BOM-line PartNumber, Quantity and best UnitPrice (NaN where the
+    part has no price), aligned positionally with `bom`.
+
+    Each part is priced at the supplier tier matching the order quantity
+    Quantity x volume, where volume is the number of boards built.
+    Parts are looked up with catalog.match() in the given mode;
+    MatchedPart and MatchType record the catalog part used and how it
+    was found.
+    """
+    lines = _bom_lines(bom)
+    positions, match_type = catalog.match(lines["PartNumber"].to_numpy(), match)
+    lines["UnitPrice"] = catalog.unit_prices(positions, lines["Quantity"].to_numpy() * volume)
+    lines["MatchedPart"] = catalog.part_names(positions)
+    lines["MatchType"] = match_type
+    return lines
 
-    Returns a CostSummary dataclass with:
-    - currency
-    - total_cost
-    - line_items (list of CostLineItem)
-    - missing_prices (list of PartNumber)
+
+def summarize_costs(lines: pd.DataFrame, currency: str, volume: float = 1.0) -> CostSummary:
     """
-    if config is None:
-        config = {}
+    Build a CostSummary from price_lines() output. Costs are per board;
+    `volume` records the build volume the tiers were picked for.
+    """
+    missing = lines["UnitPrice"].isna().to_numpy()
+
+    line_table = lines.loc[~missing].reset_index(drop=True)
+    line_table["LineCost"] = line_table["Quantity"] * line_table["UnitPrice"]
+    line_table = line_table[COST_LINE_COLUMNS]
 
+    return CostSummary(
+        currency=str(currency),
+        total_cost=float(round(float(line_table["LineCost"].sum()), 4)),
+        line_items=CostLines(line_table),
+        missing_prices=lines.loc[missing, "PartNumber"].tolist(),
+        volume=float(volume),
+        line_table=line_table,
+    )
+
+
+def cost_currency(catalog: SupplierCatalog, config: Dict[str, Any]) -> str:
     cost_cfg = config.get("cost", {})
-    currency = cost_cfg.get("currency") or suppliers_data.get("currency", "USD")
+    return str(cost_cfg.get("currency") or catalog.currency or "USD")
+
+
+def cost_volume(config: Dict[str, Any]) -> float:
+    """
+    Build volume from cost.default_volume (1 board if not configured).
+    """
+    return float(config.get("cost", {}).get("default_volume", 1))
 
-    price_index = _build_price_index(suppliers_data)
 
-    line_items: List[CostLineItem] = []
-    missing_prices: List[str] = []
-    total_cost = 0.0
+def cost_curve(
+    bom: pd.DataFrame,
+    suppliers: Union[SupplierCatalog, Dict[str, Any]],
+    volumes: Sequence[float],
+    config: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Cost of the BOM at several build volumes in one pass.
+
+    All (line, volume) order quantities are priced together with a single
+    tier lookup. Returns one row per volume with:
+    - volume
+    - unit_cost: cost per board at that volume
+    - total_cost: unit_cost x volume
+    - missing_prices: number of lines without a price
+    """
+    if config is None:
+        config = {}
 
-    for _, row in bom.iterrows():
-        part = str(row.get("PartNumber", "")).strip()
-        try:
-            qty = float(row.get("Quantity", 0))
-        except (TypeError, ValueError):
-            qty = 0.0
+    catalog = as_catalog(suppliers)
+    volumes_arr = np.asarray(volumes, dtype=np.float64)
+    lines = _bom_lines(bom)
+    qty = lines["Quantity"].to_numpy()
+
+    positions, _ = catalog.match(lines["PartNumber"].to_numpy(), match_mode(config))
+    unit_prices = catalog.unit_prices(positions, np.outer(qty, volumes_arr))
+    line_costs = qty[:, None] * unit_prices
+
+    unit_cost = np.round(np.nansum(line_costs, axis=0), 4)
+    return pd.DataFrame(
+        {
+            "volume": volumes_arr,
+            "unit_cost": unit_cost,
+            "total_cost": np.round(unit_cost * volumes_arr, 4),
+            "missing_prices": np.isnan(unit_prices).sum(axis=0),
+        }
+    )
 
-        unit_price = price_index.get(part)
 
-        if unit_price is None:
-            missing_prices.append(part)
-            continue
+def analyze_costs(
+    bom: pd.DataFrame,
+    suppliers: Union[SupplierCatalog, Dict[str, Any]],
+    config: Optional[Dict[str, Any]] = None,
+) -> CostSummary:
+    """
+    Compute per-line and total cost from a BOM and supplier pricing.
 
-        line_cost = qty * unit_price
-        total_cost += line_cost
+    `suppliers` is a SupplierCatalog (or the raw suppliers JSON dict).
+    Each line is priced at the cheapest supplier tier for its quantity
+    times cost.default_volume (default 1) and line costs are computed
+    column-wise. Parts are matched per matching.mode (see
+    bomer.core.partnumbers).
 
-        line_items.append(
-            CostLineItem(
-                PartNumber=part,
-                Quantity=qty,
-                UnitPrice=unit_price,
-                LineCost=line_cost,
-            )
-        )
+    Returns a CostSummary dataclass with:
+    - currency
+    - total_cost (per board)
+    - line_items (CostLines: columnar, rows read as CostLineItem)
+    - missing_prices (list of PartNumber)
+    - volume (build volume used for tier selection)
+    - line_table (DataFrame with the same content as line_items)
+    """
+    if config is None:
+        config = {}
 
-    return CostSummary(
-        currency=str(currency),
-        total_cost=float(round(total_cost, 4)),
-        line_items=line_items,
-        missing_prices=missing_prices,
+    catalog = as_catalog(suppliers)
+    volume = cost_volume(config)
+    return summarize_costs(
+        price_lines(bom, catalog, volume, match_mode(config)),
+        cost_currency(catalog, config),
+        volume,
     )
@@ -0,0 +1,314 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from bomer.core.catalog import SupplierCatalog
+from bomer.core.exceptions import BomStructureError
+from bomer.core.partnumbers import match_mode
+from bomer.core.validation import clean_strings
+from bomer.engines.cost import cost_volume, price_lines
+from bomer.engines.models import HierarchySummary
+from bomer.engines.risk import risk_lines, risk_weights
+
+PARENT_COLUMN = "Parent"
+
+ASSEMBLY_COLUMNS: List[str] = [
+    "PartNumber",
+    "Level",
+    "Multiplicity",
+    "UnitCost",
+    "ExtendedCost",
+    "LeafQuantity",
+    "MissingPriceQuantity",
+    "SingleSourceRatio",
+    "MissingPriceRatio",
+    "ObsoleteRatio",
+    "RiskScore",
+]
+
+LEVEL_COLUMNS: List[str] = ["Level", "Assemblies", "Parts", "ExtendedCost"]
+
+# Per-unit quantities rolled up from the leaves: cost, leaf units, flagged units
+_ROLLUP_FIELDS = ("cost", "leaf_qty", "single_source", "missing_price", "obsolete")
+
+
+def is_hierarchical(bom: pd.DataFrame) -> bool:
+    """
+    True if the BOM has a Parent column with at least one value.
+    """
+    return PARENT_COLUMN in bom.columns and bool((clean_strings(bom[PARENT_COLUMN]) != "").any())
+
+
+@dataclass
+class BomTree:
+    """
+    Parent/child structure of a hierarchical BOM as a DAG over distinct
+    part numbers (shared subassemblies are a single node).
+
+    - nodes: part number of each node
+    - edge_parent / edge_child / edge_qty: one edge per distinct
+      (parent, child) pair, quantity of child per parent unit (summed
+      over duplicate lines)
+    - root_qty: quantity ordered at the top level (lines without a
+      Parent); assemblies that are never a child default to 1
+    - level: longest distance from a root, so every child sits on a
+      deeper level than all its parents
+    """
+
+    nodes: np.ndarray
+    edge_parent: np.ndarray
+    edge_child: np.ndarray
+    edge_qty: np.ndarray
+    root_qty: np.ndarray
+    level: np.ndarray
+
+    @property
+    def is_leaf(self) -> np.ndarray:
+        return np.bincount(self.edge_parent, minlength=len(self.nodes)) == 0
+
+    @property
+    def depth(self) -> int:
+        return int(self.level.max()) + 1 if len(self.level) else 0
+
+    def leaves(self) -> np.ndarray:
+        """
+        Leaf node indices sorted by part number (the row order of explode_bom()).
+        """
+        leaves = np.flatnonzero(self.is_leaf)
+        return leaves[np.argsort(self.nodes[leaves].astype(str), kind="stable")]
+
+    def _edges_by_level(self) -> List[np.ndarray]:
+        """
+        Edge indices grouped by the level of their parent node.
+        """
+        parent_level = self.level[self.edge_parent]
+        order = np.argsort(parent_level, kind="stable")
+        bounds = np.searchsorted(parent_level[order], np.arange(self.depth + 1))
+        return [order[bounds[i]:bounds[i + 1]] for i in range(self.depth)]
+
+    def multiplicity(self) -> np.ndarray:
+        """
+        Total units of every node needed for the top-level quantities,
+        propagated level by level from the roots.
+        """
+        mult = self.root_qty.astype(np.float64)
+        for edges in self._edges_by_level():
+            parents, children = self.edge_parent[edges], self.edge_child[edges]
+            np.add.at(mult, children, mult[parents] * self.edge_qty[edges])
+        return mult
+
+    def rollup(self, leaf_values: np.ndarray) -> np.ndarray:
+        """
+        Roll per-unit leaf values (one row per node, zero for assemblies)
+        up to every assembly, deepest level first. Each subassembly is
+        summed once, however many parents share it.
+        """
+        values = np.array(leaf_values, dtype=np.float64)
+        for edges in reversed(self._edges_by_level()):
+            parents, children = self.edge_parent[edges], self.edge_child[edges]
+            np.add.at(values, parents, values[children] * self.edge_qty[edges][:, None])
+        return values
+
+
+def build_tree(bom: pd.DataFrame) -> BomTree:
+    """
+    Build the part DAG of a normalized BOM with a Parent column.
+
+    Each line reads "Quantity units of PartNumber per unit of Parent";
+    lines without a Parent are top-level. Lines without a PartNumber are
+    ignored and missing quantities count as 0.
+
+    Raises BomStructureError if the parent/child relation has a cycle.
+    """
+    parts = clean_strings(bom["PartNumber"]).to_numpy()
+    parents = clean_strings(bom[PARENT_COLUMN]).to_numpy()
+    qty = pd.to_numeric(bom["Quantity"], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+
+    keep = parts != ""
+    parts, parents, qty = parts[keep], parents[keep], qty[keep]
+    top = parents == ""
+
+    codes, nodes = pd.factorize(np.concatenate([parts, parents[~top]]))
+    nodes = np.asarray(nodes, dtype=object)
+    n_nodes = len(nodes)
+    child_codes = codes[: len(parts)]
+    parent_codes = codes[len(parts):]
+
+    # Sum duplicate (parent, child) lines into one edge
+    pair_keys = parent_codes.astype(np.int64) * n_nodes + child_codes[~top]
+    unique_keys, inverse = np.unique(pair_keys, return_inverse=True)
+    edge_qty = np.bincount(inverse, weights=qty[~top], minlength=len(unique_keys))
+    edge_parent, edge_child = np.divmod(unique_keys, n_nodes)
+
+    root_qty = np.bincount(child_codes[top], weights=qty[top], minlength=n_nodes)
+    listed_top = np.bincount(child_codes[top], minlength=n_nodes) > 0
+    in_degree = np.bincount(edge_child, minlength=n_nodes)
+    root_qty[(in_degree == 0) & ~listed_top] = 1.0
+
+    level = _levels(n_nodes, edge_parent, edge_child, in_degree, nodes)
+    return BomTree(
+        nodes=nodes,
+        edge_parent=edge_parent,
+        edge_child=edge_child,
+        edge_qty=edge_qty,
+        root_qty=root_qty,
+        level=level,
+    )
+
+
+def _levels(
+    n_nodes: int,
+    edge_parent: np.ndarray,
+    edge_child: np.ndarray,
+    in_degree: np.ndarray,
+    nodes: np.ndarray,
+) -> np.ndarray:
+    """
+    Level-synchronous topological sort (Kahn): a node gets the first
+    level at which all its parents have been placed.
+    """
+    order = np.argsort(edge_parent, kind="stable")
+    csr_child = edge_child[order]
+    out_degree = np.bincount(edge_parent, minlength=n_nodes)
+    starts = np.concatenate([[0], np.cumsum(out_degree)])
+
+    remaining = in_degree.copy()
+    level = np.full(n_nodes, -1, dtype=np.int64)
+    frontier = np.flatnonzero(remaining == 0)
+    depth = 0
+    while len(frontier):
+        level[frontier] = depth
+        counts = out_degree[frontier]
+        first = np.repeat(starts[frontier] - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+        children, hits = np.unique(csr_child[first + np.arange(counts.sum())], return_counts=True)
+        remaining[children] -= hits
+        frontier = children[remaining[children] == 0]
+        depth += 1
+
+    if (level < 0).any():
+        cycle = _find_cycle(level < 0, csr_child, starts)
+        raise BomStructureError(
+            "Cycle detected in BOM hierarchy: " + " -> ".join(str(nodes[i]) for i in cycle)
+        )
+    return level
+
+
+def _find_cycle(unplaced: np.ndarray, csr_child: np.ndarray, starts: np.ndarray) -> List[int]:
+    """
+    Walk unplaced nodes (each has an unplaced parent) backwards from any
+    of them until a node repeats, then return that cycle in edge order.
+    """
+    parent_of: Dict[int, int] = {}
+    for parent in np.flatnonzero(unplaced):
+        for child in csr_child[starts[parent]:starts[parent + 1]]:
+            if unplaced[child]:
+                parent_of.setdefault(int(child), int(parent))
+
+    node = int(np.flatnonzero(unplaced)[0])
+    seen: Dict[int, int] = {}
+    path: List[int] = []
+    while node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        node = parent_of[node]
+    cycle = path[seen[node]:][::-1]
+    return cycle + [cycle[0]]
+
+
+def explode_bom(tree: BomTree) -> pd.DataFrame:
+    """
+    Flatten the tree into effective leaf quantities, in the shape
+    optimize_bom() produces (PartNumber, Quantity, Optimized).
+    """
+    leaves = tree.leaves()
+    exploded = pd.DataFrame(
+        {
+            "PartNumber": tree.nodes[leaves],
+            "Quantity": tree.multiplicity()[leaves],
+        }
+    )
+    exploded["Optimized"] = True
+    return exploded
+
+
+def analyze_hierarchy(
+    tree: BomTree,
+    exploded: pd.DataFrame,
+    catalog: SupplierCatalog,
+    config: Dict[str, Any],
+) -> HierarchySummary:
+    """
+    Per-assembly and per-level cost and risk rollups.
+
+    Leaf parts are priced and flagged exactly as in the flat analysis of
+    `exploded` (explode_bom() output). For every assembly:
+    - UnitCost: cost of one unit including all descendants (unpriced
+      parts count as 0, see MissingPriceQuantity)
+    - ExtendedCost: Multiplicity x UnitCost
+    - risk ratios: share of the assembly's leaf units that are single
+      source / without price / obsolete, and the weighted RiskScore
+
+    The levels table sums ExtendedCost over the nodes of each level.
+    """
+    leaves = tree.leaves()
+    match = match_mode(config)
+    prices = price_lines(exploded, catalog, cost_volume(config), match)["UnitPrice"].to_numpy()
+    flags = risk_lines(exploded, catalog, match)
+
+    leaf_values = np.zeros((len(tree.nodes), len(_ROLLUP_FIELDS)))
+    leaf_values[leaves, 0] = np.nan_to_num(prices, nan=0.0)
+    leaf_values[leaves, 1] = 1.0
+    leaf_values[leaves, 2] = flags["single_source"].to_numpy()
+    leaf_values[leaves, 3] = flags["missing_price"].to_numpy()
+    leaf_values[leaves, 4] = flags["obsolete"].to_numpy()
+
+    values = tree.rollup(leaf_values)
+    mult = tree.multiplicity()
+    extended = mult * values[:, 0]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratios = np.nan_to_num(values[:, 2:5] / values[:, 1:2], nan=0.0)
+    w_single, w_missing_price, w_lifecycle = risk_weights(config)
+    risk_score = 100 * (
+        w_single * ratios[:, 0] + w_missing_price * ratios[:, 1] + w_lifecycle * ratios[:, 2]
+    )
+
+    is_leaf = tree.is_leaf
+    assemblies = np.flatnonzero(~is_leaf)
+    assemblies = assemblies[np.lexsort((tree.nodes[assemblies].astype(str), tree.level[assemblies]))]
+    assembly_table = pd.DataFrame(
+        {
+            "PartNumber": tree.nodes[assemblies],
+            "Level": tree.level[assemblies],
+            "Multiplicity": mult[assemblies],
+            "UnitCost": np.round(values[assemblies, 0], 4),
+            "ExtendedCost": np.round(extended[assemblies], 4),
+            "LeafQuantity": values[assemblies, 1],
+            "MissingPriceQuantity": values[assemblies, 3],
+            "SingleSourceRatio": ratios[assemblies, 0],
+            "MissingPriceRatio": ratios[assemblies, 1],
+            "ObsoleteRatio": ratios[assemblies, 2],
+            "RiskScore": np.round(risk_score[assemblies], 2),
+        },
+        columns=ASSEMBLY_COLUMNS,
+    )
+
+    depth = tree.depth
+    level_table = pd.DataFrame(
+        {
+            "Level": np.arange(depth),
+            "Assemblies": np.bincount(tree.level[~is_leaf], minlength=depth),
+            "Parts": np.bincount(tree.level[is_leaf], minlength=depth),
+            "ExtendedCost": np.round(np.bincount(tree.level, weights=extended, minlength=depth), 4),
+        },
+        columns=LEVEL_COLUMNS,
+    )
+
+    return HierarchySummary(
+        depth=depth,
+        assembly_count=int(len(assemblies)),
+        assemblies=assembly_table,
+        levels=level_table,
+    )
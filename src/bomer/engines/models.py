@@ -1,5 +1,13 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, Type, TypeVar, Union, overload
+
+import numpy as np
+import pandas as pd
+
+RowT = TypeVar("RowT")
+
+# Rows converted to Python objects at a time when iterating a LineTable
+_ROW_BATCH = 8192
 
 
 @dataclass
@@ -8,14 +16,9 @@ class CostLineItem:
     Quantity: float
     UnitPrice: float
     LineCost: float
-
-
-@dataclass
-class CostSummary:
-    currency: str
-    total_cost: float
-    line_items: List[CostLineItem]
-    missing_prices: List[str]
+    # Catalog part the line was priced as, and how it was matched
+    MatchedPart: str = ""
+    MatchType: str = "exact"
 
 
 @dataclass
@@ -27,10 +30,164 @@ class RiskLine:
     obsolete: bool
 
 
+class LineTable(Sequence[RowT], Generic[RowT]):
+    """
+    Read-only columnar sequence of result lines backed by a DataFrame
+    (one column per field of `row_type`).
+
+    - lines[i] and iteration build `row_type` objects on access only, so
+      attribute access (lines[0].PartNumber) works as with a list
+    - lines[a:b] and lines.where(mask or bool column name) return a
+      LineTable over the selected rows
+    - lines.frame and lines.column(name) expose the data without copies
+      (what the report writers consume)
+    """
+
+    row_type: Type[Any]
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self.frame = frame
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[RowT]) -> "LineTable[RowT]":
+        names = [f.name for f in fields(cls.row_type)]
+        return cls(pd.DataFrame([[getattr(row, n) for n in names] for row in rows], columns=names))
+
+    def _names(self) -> List[str]:
+        return [f.name for f in fields(self.row_type) if f.name in self.frame.columns]
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @overload
+    def __getitem__(self, index: int) -> RowT: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "LineTable[RowT]": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return type(self)(self.frame.iloc[index])
+        row = self.frame.iloc[index]
+        return self.row_type(**{name: _python_value(row[name]) for name in self._names()})
+
+    def __iter__(self) -> Iterator[RowT]:
+        names = self._names()
+        for start in range(0, len(self.frame), _ROW_BATCH):
+            batch = self.frame.iloc[start:start + _ROW_BATCH]
+            for values in zip(*(batch[name].tolist() for name in names)):
+                yield self.row_type(**dict(zip(names, values)))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LineTable):
+            return self.frame.reset_index(drop=True).equals(other.frame.reset_index(drop=True))
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} lines)"
+
+    def where(self, mask: Union[str, np.ndarray, pd.Series]) -> "LineTable[RowT]":
+        """
+        Lines where `mask` (a boolean array, or the name of a boolean
+        column such as "single_source") is true.
+        """
+        if isinstance(mask, str):
+            mask = self.frame[mask]
+        return type(self)(self.frame[np.asarray(mask, dtype=bool)])
+
+    def column(self, name: str) -> np.ndarray:
+        return self.frame[name].to_numpy()
+
+
+def _python_value(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class CostLines(LineTable[CostLineItem]):
+    row_type = CostLineItem
+
+
+class RiskLines(LineTable[RiskLine]):
+    row_type = RiskLine
+
+
+@dataclass
+class CostSummary:
+    currency: str
+    total_cost: float
+    # CostLines (columnar) from the engines; a plain list also works
+    line_items: Sequence[CostLineItem]
+    missing_prices: List[str]
+    # Build volume the supplier price tiers were picked for
+    volume: float = 1.0
+    # DataFrame behind line_items (one column per CostLineItem field)
+    line_table: Optional[pd.DataFrame] = field(default=None, repr=False, compare=False)
+
+
 @dataclass
 class RiskSummary:
     risk_score: float
     single_source_ratio: float
     missing_price_ratio: float
     obsolete_ratio: float
-    lines: List[RiskLine]
+    # RiskLines (columnar) from the engines; a plain list also works
+    lines: Sequence[RiskLine]
+    # DataFrame behind lines (PartNumber, supplier_count, flags)
+    line_table: Optional[pd.DataFrame] = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class HierarchySummary:
+    depth: int
+    assembly_count: int
+    # One row per assembly (ASSEMBLY_COLUMNS in engines.hierarchy)
+    assemblies: pd.DataFrame
+    # One row per level of the tree (LEVEL_COLUMNS in engines.hierarchy)
+    levels: pd.DataFrame
+
+
+@dataclass
+class PurchasePlan:
+    currency: str
+    # "exact" (all supplier subsets enumerated) or "local_search"
+    method: str
+    total_cost: float
+    item_cost: float
+    order_cost: float
+    supplier_count: int
+    # PartNumbers no allowed supplier could source
+    unassigned: List[str]
+    # One row per part (PLAN_LINE_COLUMNS in engines.allocation)
+    lines: pd.DataFrame
+    # One row per supplier ordered from (PLAN_SUPPLIER_COLUMNS in engines.allocation)
+    suppliers: pd.DataFrame
+
+
+@dataclass
+class SimulationSummary:
+    currency: str
+    trials: int
+    seed: int
+    # Per-board cost at quoted prices with every supplier available
+    baseline_cost: float
+    # Mean per-board cost of the trials in which every part could be
+    # bought (None if there were none)
+    mean_cost: Optional[float]
+    # "p5", "p50", ... -> per-board cost at that percentile of the same
+    # trials (None if there were none)
+    cost_percentiles: Dict[str, Optional[float]]
+    # Share of trials in which at least one part could not be bought
+    # (blocked trials)
+    unavailable_probability: float
+    budget: Optional[float]
+    # Share of trials costing more than budget or blocked (None without
+    # a budget)
+    over_budget_probability: Optional[float]
+    # PartNumbers no supplier prices (left out of the simulation)
+    unpriced: List[str]
+    # One row per simulated line (SIMULATION_LINE_COLUMNS in engines.simulation)
+    line_table: pd.DataFrame = field(repr=False, compare=False)
+    # Per-board cost of every trial, NaN for blocked trials
+    trial_costs: np.ndarray = field(repr=False, compare=False)
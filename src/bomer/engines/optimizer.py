@@ -1,3 +1,5 @@
+from typing import Optional
+
 import pandas as pd
 
 
@@ -24,3 +26,34 @@ def optimize_bom(bom: pd.DataFrame) -> pd.DataFrame:
 
     aggregated["Optimized"] = True
     return aggregated
+
+
+class QuantityAccumulator:
+    """
+    Running per-PartNumber quantity totals for BOMs processed in chunks.
+
+    Feeding every chunk through add() and calling result() gives the same
+    frame as optimize_bom() on the concatenated BOM, while only keeping
+    one row per distinct PartNumber in memory.
+    """
+
+    def __init__(self) -> None:
+        self._totals: Optional[pd.Series] = None
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        if "PartNumber" not in chunk.columns or "Quantity" not in chunk.columns:
+            raise ValueError("BOM must contain PartNumber and Quantity columns.")
+
+        partial = chunk.groupby("PartNumber")["Quantity"].sum()
+        if self._totals is None:
+            self._totals = partial
+        else:
+            self._totals = pd.concat([self._totals, partial]).groupby(level=0).sum()
+
+    def result(self) -> pd.DataFrame:
+        if self._totals is None:
+            raise ValueError("No BOM chunks were added.")
+
+        aggregated = self._totals.sort_index().rename_axis("PartNumber").reset_index()
+        aggregated["Optimized"] = True
+        return aggregated
@@ -1,76 +1,86 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from bomer.engines.models import RiskLine, RiskSummary
+from bomer.core.catalog import SupplierCatalog, as_catalog
+from bomer.core.partnumbers import DEFAULT_MATCH_MODE, match_mode
+from bomer.core.validation import clean_strings
+from bomer.engines.models import RiskLines, RiskSummary
 
+OBSOLETE_STATUSES = {"obsolete", "eol", "end of life"}
 
-def _supplier_count_for_part(part: str, suppliers_data: Dict[str, Any]) -> int:
-    count = 0
-    for supplier in suppliers_data.get("suppliers", []):
-        prices = supplier.get("prices", {})
-        if part in prices:
-            count += 1
-    return count
+RISK_LINE_COLUMNS: List[str] = [
+    "PartNumber",
+    "supplier_count",
+    "single_source",
+    "missing_price",
+    "obsolete",
+]
 
 
-def analyze_risk(
-    bom: pd.DataFrame,
-    suppliers_data: Dict[str, Any],
-    config: Optional[Dict[str, Any]] = None,
-) -> RiskSummary:
+def obsolete_flags(bom: pd.DataFrame) -> np.ndarray:
     """
-    Basic risk model:
+    Per-BOM-line flag: LifecycleStatus is one of OBSOLETE_STATUSES.
+    """
+    if "LifecycleStatus" not in bom.columns:
+        return np.zeros(len(bom), dtype=bool)
+    return clean_strings(bom["LifecycleStatus"]).str.lower().isin(OBSOLETE_STATUSES).to_numpy()
 
-    - penalize single-sourced parts
-    - penalize missing prices
-    - penalize 'Obsolete' lifecycle status if present
 
-    Returns a RiskSummary dataclass.
+def risk_lines(
+    bom: pd.DataFrame,
+    catalog: SupplierCatalog,
+    match: str = DEFAULT_MATCH_MODE,
+) -> pd.DataFrame:
     """
-    if config is None:
-        config = {}
+    Per-BOM-line supplier count and risk flags, aligned positionally
+    with `bom` (columns RISK_LINE_COLUMNS). Parts are looked up with
+    catalog.match() in the given mode.
+    """
+    if "PartNumber" in bom.columns:
+        parts = clean_strings(bom["PartNumber"]).to_numpy()
+    else:
+        parts = np.full(len(bom), "", dtype=object)
+
+    obsolete = obsolete_flags(bom)
+    positions, _ = catalog.match(parts, match)
+    supplier_count = catalog.take(catalog.supplier_count, positions, 0).astype(int)
+
+    return pd.DataFrame(
+        {
+            "PartNumber": parts,
+            "supplier_count": supplier_count,
+            "single_source": supplier_count == 1,
+            "missing_price": supplier_count == 0,
+            "obsolete": obsolete,
+        },
+        columns=RISK_LINE_COLUMNS,
+    )
+
 
+def risk_weights(config: Dict[str, Any]) -> Tuple[float, float, float]:
+    """
+    (single_source, missing_price, lifecycle) weights from the risk config.
+    """
     risk_cfg = config.get("risk", {})
-    w_single = float(risk_cfg.get("single_source_weight", 0.4))
-    w_missing_price = float(risk_cfg.get("missing_price_weight", 0.3))
-    w_lifecycle = float(risk_cfg.get("lifecycle_weight", 0.3))
-
-    line_risks: List[RiskLine] = []
-    total_single_source = 0
-    total_missing_price = 0
-    total_obsolete = 0
-
-    for _, row in bom.iterrows():
-        part = str(row.get("PartNumber", "")).strip()
-        lifecycle = str(row.get("LifecycleStatus", "")).strip().lower()
-
-        supplier_count = _supplier_count_for_part(part, suppliers_data)
-        single_source = supplier_count == 1
-        missing_price = supplier_count == 0
-        obsolete = lifecycle in {"obsolete", "eol", "end of life"}
-
-        if single_source:
-            total_single_source += 1
-        if missing_price:
-            total_missing_price += 1
-        if obsolete:
-            total_obsolete += 1
-
-        line_risks.append(
-            RiskLine(
-                PartNumber=part,
-                supplier_count=supplier_count,
-                single_source=single_source,
-                missing_price=missing_price,
-                obsolete=obsolete,
-            )
-        )
-
-    n_parts = max(len(bom), 1)
-    single_source_ratio = total_single_source / n_parts
-    missing_price_ratio = total_missing_price / n_parts
-    obsolete_ratio = total_obsolete / n_parts
+    return (
+        float(risk_cfg.get("single_source_weight", 0.4)),
+        float(risk_cfg.get("missing_price_weight", 0.3)),
+        float(risk_cfg.get("lifecycle_weight", 0.3)),
+    )
+
+
+def summarize_risk(line_table: pd.DataFrame, config: Dict[str, Any]) -> RiskSummary:
+    """
+    Build a RiskSummary from risk_lines() output and the risk weights.
+    """
+    w_single, w_missing_price, w_lifecycle = risk_weights(config)
+
+    n_parts = max(len(line_table), 1)
+    single_source_ratio = float(line_table["single_source"].sum()) / n_parts
+    missing_price_ratio = float(line_table["missing_price"].sum()) / n_parts
+    obsolete_ratio = float(line_table["obsolete"].sum()) / n_parts
 
     risk_score = 100 * (
         w_single * single_source_ratio
@@ -83,5 +93,31 @@ def analyze_risk(
         single_source_ratio=single_source_ratio,
         missing_price_ratio=missing_price_ratio,
         obsolete_ratio=obsolete_ratio,
-        lines=line_risks,
+        lines=RiskLines(line_table),
+        line_table=line_table,
     )
+
+
+def analyze_risk(
+    bom: pd.DataFrame,
+    suppliers: Union[SupplierCatalog, Dict[str, Any]],
+    config: Optional[Dict[str, Any]] = None,
+) -> RiskSummary:
+    """
+    Basic risk model:
+
+    - penalize single-sourced parts
+    - penalize missing prices
+    - penalize 'Obsolete' lifecycle status if present
+
+    `suppliers` is a SupplierCatalog (or the raw suppliers JSON dict);
+    supplier counts are looked up in its part index, so per-line flags
+    are computed column-wise.
+
+    Returns a RiskSummary dataclass.
+    """
+    if config is None:
+        config = {}
+
+    catalog = as_catalog(suppliers)
+    return summarize_risk(risk_lines(bom, catalog, match_mode(config)), config)
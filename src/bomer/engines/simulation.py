@@ -0,0 +1,248 @@
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from bomer.core.catalog import SupplierCatalog, as_catalog
+from bomer.core.exceptions import ConfigError
+from bomer.core.partnumbers import match_mode
+from bomer.engines.cost import _bom_lines, cost_currency, cost_volume
+from bomer.engines.models import SimulationSummary
+
+SIMULATION_LINE_COLUMNS: List[str] = ["PartNumber", "supplier_count", "unavailable_probability"]
+
+DEFAULT_TRIALS = 10_000
+DEFAULT_DROPOUT = 0.05
+DEFAULT_VOLATILITY = 0.1
+DEFAULT_PERCENTILES = (5.0, 50.0, 95.0)
+
+# Trials x line groups evaluated per block (bounds the working set)
+BLOCK_CELLS = 2_000_000
+
+
+def _probability(value: Any, key: str) -> float:
+    try:
+        p = float(value)
+    except (TypeError, ValueError):
+        raise ConfigError(f"simulation.{key} must be a number.")
+    if not (0.0 <= p <= 1.0):
+        raise ConfigError(f"simulation.{key} must be between 0 and 1, got {p}.")
+    return p
+
+
+def simulation_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Monte Carlo settings from config:
+
+    simulation:
+      trials: 10000
+      seed: 0
+      supplier_dropout: 0.05     # or {default: 0.05, SupplierA: 0.2}
+      price_volatility: 0.1      # sigma of the log price move
+      budget: 250.0              # per board; optional
+      percentiles: [5, 50, 95]
+    """
+    sim_cfg = config.get("simulation", {})
+    trials = sim_cfg.get("trials", DEFAULT_TRIALS)
+    if isinstance(trials, bool) or not isinstance(trials, int) or trials < 1:
+        raise ConfigError(f"simulation.trials must be a positive integer, got {trials!r}.")
+    seed = sim_cfg.get("seed", 0)
+    if isinstance(seed, bool) or not isinstance(seed, int) or seed < 0:
+        raise ConfigError(f"simulation.seed must be a non-negative integer, got {seed!r}.")
+
+    dropout_cfg = sim_cfg.get("supplier_dropout", DEFAULT_DROPOUT)
+    if isinstance(dropout_cfg, Mapping):
+        dropout = {
+            str(name): _probability(p, f"supplier_dropout.{name}") for name, p in dropout_cfg.items()
+        }
+        dropout.setdefault("default", DEFAULT_DROPOUT)
+    else:
+        dropout = {"default": _probability(dropout_cfg, "supplier_dropout")}
+
+    try:
+        volatility = float(sim_cfg.get("price_volatility", DEFAULT_VOLATILITY))
+    except (TypeError, ValueError):
+        raise ConfigError("simulation.price_volatility must be a number.")
+    if not volatility >= 0:
+        raise ConfigError(f"simulation.price_volatility must not be negative, got {volatility}.")
+
+    budget = sim_cfg.get("budget")
+    if budget is not None:
+        try:
+            budget = float(budget)
+        except (TypeError, ValueError):
+            raise ConfigError("simulation.budget must be numeric if provided.")
+        if budget <= 0:
+            raise ConfigError("simulation.budget must be positive if provided.")
+
+    try:
+        percentiles = [float(q) for q in sim_cfg.get("percentiles", DEFAULT_PERCENTILES)]
+    except (TypeError, ValueError):
+        raise ConfigError("simulation.percentiles must be a list of numbers.")
+    if not percentiles or any(not (0.0 <= q <= 100.0) for q in percentiles):
+        raise ConfigError("simulation.percentiles must be between 0 and 100.")
+
+    return {
+        "trials": trials,
+        "seed": seed,
+        "supplier_dropout": dropout,
+        "price_volatility": volatility,
+        "budget": budget,
+        "percentiles": percentiles,
+    }
+
+
+def _dropout_rates(catalog: SupplierCatalog, dropout: Dict[str, float]) -> np.ndarray:
+    unknown = [name for name in dropout if name != "default" and name not in catalog.supplier_names]
+    if unknown:
+        raise ConfigError(
+            f"simulation.supplier_dropout names unknown supplier(s): {', '.join(unknown)}."
+        )
+    return np.array(
+        [dropout.get(name, dropout["default"]) for name in catalog.supplier_names], dtype=np.float64
+    )
+
+
+def _percentile_key(q: float) -> str:
+    return f"p{q:g}"
+
+
+def simulate_supply_risk(
+    bom: pd.DataFrame,
+    suppliers: Union[SupplierCatalog, Dict[str, Any]],
+    config: Optional[Dict[str, Any]] = None,
+    trials: Optional[int] = None,
+    seed: Optional[int] = None,
+    budget: Optional[float] = None,
+) -> SimulationSummary:
+    """
+    Monte Carlo simulation of supplier dropouts and price moves.
+
+    In every trial each supplier is unavailable with its
+    simulation.supplier_dropout probability, and its prices move by a
+    lognormal factor exp(price_volatility * z), z ~ N(0, 1). Each line is
+    bought from its cheapest available supplier at quoted prices (the
+    tier for Quantity x cost.default_volume, as analyze_costs) and pays
+    that supplier's moved price; a line is unavailable when all of its
+    priced suppliers dropped out. Lines no supplier prices at all are
+    left out (`unpriced`), as in CostSummary.missing_prices. `trials`,
+    `seed` and `budget` override the config.
+
+    Sampling is vectorized: all draws are made up front from
+    numpy.random.default_rng(seed), availability uniforms then price
+    normals, each a trials x suppliers array, so a seed reproduces the
+    run bit for bit. Lines with the same supplier preference order share
+    their outcome in every trial, so the trials are evaluated over
+    (trials x distinct orders) arrays rather than per line.
+
+    Costs are per board. A trial in which some line cannot be bought is
+    blocked: the build cannot be completed at any price, so it has no
+    cost (NaN in trial_costs), counts as over budget, and is left out of
+    mean_cost and cost_percentiles, which describe the trials where
+    everything could be bought (None if there are none). Returns a
+    SimulationSummary.
+    """
+    if config is None:
+        config = {}
+    settings = simulation_settings(config)
+    trials = settings["trials"] if trials is None else int(trials)
+    seed = settings["seed"] if seed is None else int(seed)
+    budget = settings["budget"] if budget is None else float(budget)
+    if trials < 1:
+        raise ConfigError(f"trials must be at least 1, got {trials}.")
+
+    catalog = as_catalog(suppliers)
+    dropout = _dropout_rates(catalog, settings["supplier_dropout"])
+    lines = _bom_lines(bom)
+    qty = lines["Quantity"].to_numpy()
+    n_lines = len(lines)
+
+    # Priced (line, supplier entry) pairs, cheapest first per line; ties
+    # keep supplier file order
+    positions, _ = catalog.match(lines["PartNumber"].to_numpy(), match_mode(config))
+    pair_line, pair_entry = catalog.entries_for(positions)
+    pair_price = catalog.entry_unit_prices(pair_entry, qty[pair_line] * cost_volume(config)).ravel()
+    priced = ~np.isnan(pair_price)
+    pair_line, pair_entry, pair_price = pair_line[priced], pair_entry[priced], pair_price[priced]
+    order = np.lexsort((np.arange(len(pair_line)), pair_price, pair_line))
+    pair_line, pair_entry, pair_price = pair_line[order], pair_entry[order], pair_price[order]
+    pair_supplier = np.asarray(catalog.entry_supplier[pair_entry], dtype=np.int64)
+
+    supplier_count = np.bincount(pair_line, minlength=n_lines)
+    first_pair = np.concatenate([[0], np.cumsum(supplier_count)[:-1]])
+    rank = np.arange(len(pair_line)) - first_pair[pair_line]
+
+    # Group lines by supplier preference order: one row of supplier
+    # indices per priced line (-1 padded), summed line costs per rank
+    sourced = np.flatnonzero(supplier_count > 0)
+    width = int(supplier_count.max()) if len(pair_line) else 0
+    preference = np.full((n_lines, width), -1, dtype=np.int64)
+    preference[pair_line, rank] = pair_supplier
+    group_order, line_group = np.unique(preference[sourced], axis=0, return_inverse=True)
+    line_group = line_group.ravel()
+    pair_group = np.full(n_lines, -1, dtype=np.int64)
+    pair_group[sourced] = line_group
+    n_groups = len(group_order)
+    group_cost = np.zeros((n_groups, width))
+    np.add.at(group_cost, (pair_group[pair_line], rank), qty[pair_line] * pair_price)
+
+    rng = np.random.default_rng(seed)
+    available = rng.random((trials, len(dropout))) >= dropout
+    factor = np.exp(settings["price_volatility"] * rng.standard_normal((trials, len(dropout))))
+
+    trial_costs = np.zeros(trials)
+    any_unavailable = np.zeros(trials, dtype=bool)
+    group_unavailable = np.zeros(n_groups, dtype=np.int64)
+    block = max(1, BLOCK_CELLS // max(n_groups, 1))
+    for start in range(0, trials, block):
+        stop = min(start + block, trials)
+        unfilled = np.ones((stop - start, n_groups), dtype=bool)
+        for rank_j in range(width):
+            supplier = group_order[:, rank_j]
+            listed = supplier >= 0
+            safe = np.where(listed, supplier, 0)
+            buy = unfilled & available[start:stop, safe] & listed
+            trial_costs[start:stop] += (
+                np.where(buy, factor[start:stop, safe], 0.0) * group_cost[:, rank_j]
+            ).sum(axis=1)
+            unfilled &= ~buy
+        any_unavailable[start:stop] = unfilled.any(axis=1)
+        group_unavailable += unfilled.sum(axis=0)
+
+    line_unavailable = np.zeros(n_lines)
+    line_unavailable[sourced] = group_unavailable[line_group] / trials
+    line_table = pd.DataFrame(
+        {
+            "PartNumber": lines["PartNumber"].to_numpy(),
+            "supplier_count": supplier_count,
+            "unavailable_probability": line_unavailable,
+        },
+        columns=SIMULATION_LINE_COLUMNS,
+    ).loc[sourced].reset_index(drop=True)
+
+    # Blocked trials have no cost and always miss the budget
+    trial_costs[any_unavailable] = np.nan
+    bought = trial_costs[~any_unavailable]
+    mean_cost: Optional[float] = None
+    percentiles: List[Optional[float]] = [None] * len(settings["percentiles"])
+    if len(bought):
+        mean_cost = float(round(float(bought.mean()), 4))
+        percentiles = [float(round(float(v), 4)) for v in np.percentile(bought, settings["percentiles"])]
+    return SimulationSummary(
+        currency=cost_currency(catalog, config),
+        trials=trials,
+        seed=seed,
+        baseline_cost=float(round(float(group_cost[:, 0].sum()), 4)) if width else 0.0,
+        mean_cost=mean_cost,
+        cost_percentiles={
+            _percentile_key(q): v for q, v in zip(settings["percentiles"], percentiles)
+        },
+        unavailable_probability=float(any_unavailable.mean()),
+        budget=budget,
+        over_budget_probability=(
+            None if budget is None else float((any_unavailable | (trial_costs > budget)).mean())
+        ),
+        unpriced=lines["PartNumber"].to_numpy()[supplier_count == 0].tolist(),
+        line_table=line_table,
+        trial_costs=trial_costs,
+    )
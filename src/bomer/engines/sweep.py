@@ -0,0 +1,162 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from bomer.core.catalog import SupplierCatalog, as_catalog
+from bomer.core.exceptions import ConfigError
+from bomer.core.partnumbers import match_mode
+from bomer.engines.cost import _bom_lines, cost_volume
+from bomer.engines.risk import obsolete_flags, risk_weights
+
+SWEEP_COLUMNS: List[str] = [
+    "scenario",
+    "single_source_weight",
+    "missing_price_weight",
+    "lifecycle_weight",
+    "volume",
+    "excluded_suppliers",
+    "unit_cost",
+    "total_cost",
+    "missing_prices",
+    "risk_score",
+]
+
+Weights = Tuple[float, float, float]
+
+
+def _check_weights(weights: Sequence[Sequence[float]]) -> np.ndarray:
+    try:
+        matrix = np.asarray(weights, dtype=np.float64).reshape(-1, 3)
+    except (TypeError, ValueError):
+        raise ConfigError(
+            "Risk weights must be (single_source, missing_price, lifecycle) triples."
+        )
+    if len(matrix) == 0 or np.any((matrix < 0) | (matrix > 1)) or np.isnan(matrix).any():
+        raise ConfigError("Risk weights must be between 0 and 1.")
+    return matrix
+
+
+def _check_volumes(volumes: Sequence[float]) -> np.ndarray:
+    values = np.asarray(volumes, dtype=np.float64).ravel()
+    if len(values) == 0 or not np.all(values > 0):
+        raise ConfigError("Build volumes must be positive.")
+    return values
+
+
+def _exclusion_masks(catalog: SupplierCatalog, exclusions: Sequence[Sequence[str]]) -> np.ndarray:
+    """
+    Boolean (n_exclusions, n_suppliers) matrix of excluded suppliers.
+    """
+    index = {name: i for i, name in enumerate(catalog.supplier_names)}
+    masks = np.zeros((len(exclusions), len(catalog.supplier_names)), dtype=bool)
+    for row, names in enumerate(exclusions):
+        unknown = [name for name in names if name not in index]
+        if unknown:
+            raise ConfigError(f"Unknown supplier(s) to exclude: {', '.join(unknown)}.")
+        masks[row, [index[name] for name in names]] = True
+    return masks
+
+
+def sweep_scenarios(
+    bom: pd.DataFrame,
+    suppliers: Union[SupplierCatalog, Dict[str, Any]],
+    weights: Optional[Sequence[Weights]] = None,
+    volumes: Optional[Sequence[float]] = None,
+    exclusions: Optional[Sequence[Sequence[str]]] = None,
+    config: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Cost and risk of the BOM for every combination of risk weights
+    (single_source, missing_price, lifecycle), build volume and set of
+    excluded suppliers, in one pass.
+
+    Parts are matched and their supplier entries gathered once. The tier
+    price of every entry at every volume is one matrix; each exclusion
+    set masks it, takes the per-line minimum and sums it for all volumes
+    at once. Supplier counts per line and exclusion set give the risk
+    ratios, and the scores for all weight vectors are one broadcast
+    expression. Defaults: the weights, cost.default_volume and (no)
+    exclusions of `config`.
+
+    Returns one row per scenario (columns SWEEP_COLUMNS), weights varying
+    fastest, then volumes, then exclusion sets:
+    - unit_cost: cost per board, as CostSummary.total_cost
+    - total_cost: unit_cost x volume
+    - missing_prices: lines without a price from the remaining suppliers
+    - risk_score: as RiskSummary.risk_score, counting only the remaining
+      suppliers
+    """
+    if config is None:
+        config = {}
+
+    catalog = as_catalog(suppliers)
+    weight_matrix = _check_weights([risk_weights(config)] if weights is None else weights)
+    volume_values = _check_volumes([cost_volume(config)] if volumes is None else volumes)
+    exclusion_sets = [()] if exclusions is None else [tuple(names) for names in exclusions]
+    excluded = _exclusion_masks(catalog, exclusion_sets)
+
+    lines = _bom_lines(bom)
+    qty = lines["Quantity"].to_numpy()
+    positions, _ = catalog.match(lines["PartNumber"].to_numpy(), match_mode(config))
+    n_obsolete = int(obsolete_flags(bom).sum())
+
+    # One row per (line, supplier entry), one column per volume
+    pair_line, pair_entry = catalog.entries_for(positions)
+    pair_supplier = np.asarray(catalog.entry_supplier[pair_entry], dtype=np.int64)
+    pair_prices = catalog.entry_unit_prices(pair_entry, np.outer(qty[pair_line], volume_values))
+    group_start = np.flatnonzero(np.r_[True, pair_line[1:] != pair_line[:-1]])[: len(pair_line)]
+    group_line = pair_line[group_start]
+
+    n_lines, n_volumes = len(lines), len(volume_values)
+    unit_cost = np.zeros((len(exclusion_sets), n_volumes))
+    missing = np.zeros((len(exclusion_sets), n_volumes), dtype=np.int64)
+    ratios = np.zeros((len(exclusion_sets), 3))
+    for row, mask in enumerate(excluded):
+        allowed = ~mask[pair_supplier]
+        best = np.full((n_lines, n_volumes), np.nan)
+        counts = np.zeros(n_lines, dtype=np.int64)
+        if len(pair_entry):
+            best[group_line] = np.fmin.reduceat(
+                np.where(allowed[:, None], pair_prices, np.nan), group_start, axis=0
+            )
+            counts[group_line] = np.add.reduceat(allowed.astype(np.int64), group_start)
+        unit_cost[row] = np.round(np.nansum(qty[:, None] * best, axis=0), 4)
+        missing[row] = np.isnan(best).sum(axis=0)
+        ratios[row] = ((counts == 1).sum(), (counts == 0).sum(), n_obsolete)
+    ratios /= max(n_lines, 1)
+
+    # (exclusion, weights) risk scores, summed in the same order and
+    # rounded the same way as summarize_risk so the scores agree exactly
+    scores = 100 * (
+        ratios[:, None, 0] * weight_matrix[None, :, 0]
+        + ratios[:, None, 1] * weight_matrix[None, :, 1]
+        + ratios[:, None, 2] * weight_matrix[None, :, 2]
+    )
+    risk = np.array([round(float(score), 2) for score in scores.ravel()]).reshape(scores.shape)
+
+    e_idx, v_idx, w_idx = (
+        grid.ravel()
+        for grid in np.meshgrid(
+            np.arange(len(exclusion_sets)),
+            np.arange(n_volumes),
+            np.arange(len(weight_matrix)),
+            indexing="ij",
+        )
+    )
+    labels = np.array([",".join(names) for names in exclusion_sets], dtype=object)
+    return pd.DataFrame(
+        {
+            "scenario": np.arange(len(e_idx)),
+            "single_source_weight": weight_matrix[w_idx, 0],
+            "missing_price_weight": weight_matrix[w_idx, 1],
+            "lifecycle_weight": weight_matrix[w_idx, 2],
+            "volume": volume_values[v_idx],
+            "excluded_suppliers": labels[e_idx],
+            "unit_cost": unit_cost[e_idx, v_idx],
+            "total_cost": np.round(unit_cost[e_idx, v_idx] * volume_values[v_idx], 4),
+            "missing_prices": missing[e_idx, v_idx],
+            "risk_score": risk[e_idx, w_idx],
+        },
+        columns=SWEEP_COLUMNS,
+    )
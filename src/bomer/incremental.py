@@ -0,0 +1,317 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bomer.api import resolve_suppliers_path
+from bomer.core.catalog import SupplierCatalog
+from bomer.core.catalog_cache import load_catalog_for_config, source_fingerprint
+from bomer.core.config import load_config
+from bomer.core.loader import load_bom
+from bomer.core.partnumbers import match_mode
+from bomer.core.schema import bom_columns, normalize_bom_columns, schema_settings, validate_bom
+from bomer.core.validation import clean_strings
+from bomer.engines.cost import cost_currency, cost_volume, price_lines, summarize_costs
+from bomer.engines.hierarchy import analyze_hierarchy, build_tree, explode_bom, is_hierarchical
+from bomer.engines.optimizer import optimize_bom
+from bomer.engines.risk import risk_lines, summarize_risk
+from bomer.instrumentation import StageRecorder
+from bomer.reporting.report_writer import write_normalized_bom
+
+# Bump whenever the stored state layout changes; older states are ignored.
+STATE_VERSION = 2
+
+STATE_FILE = "state.pkl"
+
+_RISK_FLAGS = ("single_source", "missing_price", "obsolete")
+
+
+def _part_signatures(normalized: pd.DataFrame) -> pd.Series:
+    """
+    Order-independent fingerprint of the lines contributing to each
+    PartNumber (the only columns optimize_bom keeps: PartNumber and
+    Quantity), indexed by PartNumber.
+    """
+    rows = normalized.loc[normalized["PartNumber"].notna(), ["PartNumber", "Quantity"]]
+    hashes = pd.util.hash_pandas_object(rows, index=False).to_numpy()
+    codes, uniques = pd.factorize(rows["PartNumber"])
+
+    signature = np.zeros(len(uniques), dtype=np.uint64)
+    np.add.at(signature, codes, hashes)
+    counts = np.bincount(codes, minlength=len(uniques)).astype(np.uint64)
+    signature ^= counts * np.uint64(0x9E3779B97F4A7C15)
+    return pd.Series(signature, index=pd.Index(uniques, dtype=object))
+
+
+def _config_fingerprint(config: Dict[str, Any]) -> str:
+    return json.dumps(config, sort_keys=True, default=str)
+
+
+def _suppliers_fingerprint(suppliers_path: Path) -> Any:
+    try:
+        return source_fingerprint(suppliers_path)
+    except OSError:
+        return None
+
+
+def load_state(state_dir: Path) -> Optional[Dict[str, Any]]:
+    path = state_dir / STATE_FILE
+    if not path.exists():
+        return None
+    try:
+        state = pd.read_pickle(path)
+    except Exception:
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def save_state(state_dir: Path, state: Dict[str, Any]) -> None:
+    state_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=STATE_FILE + ".", dir=state_dir)
+    os.close(fd)
+    try:
+        pd.to_pickle(state, tmp_name)
+        os.replace(tmp_name, state_dir / STATE_FILE)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def _patch(
+    previous: Dict[str, Any],
+    normalized: pd.DataFrame,
+    changed: pd.Index,
+    catalog: SupplierCatalog,
+    volume: float,
+    match: str,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Recompute optimize/cost/risk lines for the changed PartNumbers only
+    and splice them into the stored per-part frames, keeping the
+    PartNumber sort order optimize_bom() produces.
+    """
+    old_opt = previous["optimized_bom"]
+    keep = ~old_opt["PartNumber"].isin(changed).to_numpy()
+
+    subset = normalized[normalized["PartNumber"].isin(changed)]
+    new_opt = optimize_bom(subset)
+
+    optimized = pd.concat([old_opt[keep], new_opt], ignore_index=True)
+    prices = pd.concat(
+        [previous["price_lines"][keep], price_lines(new_opt, catalog, volume, match)],
+        ignore_index=True,
+    )
+    risks = pd.concat(
+        [previous["risk_lines"][keep], risk_lines(new_opt, catalog, match)],
+        ignore_index=True,
+    )
+
+    order = optimized.sort_values("PartNumber", kind="stable").index.to_numpy()
+    return (
+        optimized.iloc[order].reset_index(drop=True),
+        prices.iloc[order].reset_index(drop=True),
+        risks.iloc[order].reset_index(drop=True),
+    )
+
+
+def _risk_flag_changes(old: pd.DataFrame, new: pd.DataFrame) -> List[Dict[str, Any]]:
+    merged = old.merge(new, on="PartNumber", suffixes=("_old", "_new"))
+    changes: List[Dict[str, Any]] = []
+    for flag in _RISK_FLAGS:
+        differs = merged[f"{flag}_old"] != merged[f"{flag}_new"]
+        for part, before, after in zip(
+            merged.loc[differs, "PartNumber"].tolist(),
+            merged.loc[differs, f"{flag}_old"].tolist(),
+            merged.loc[differs, f"{flag}_new"].tolist(),
+        ):
+            changes.append({"PartNumber": part, "flag": flag, "old": bool(before), "new": bool(after)})
+    changes.sort(key=lambda c: (c["PartNumber"], c["flag"]))
+    return changes
+
+
+def run_incremental_analysis(
+    bom_path: Path,
+    state_dir: Path,
+    suppliers_path: Optional[Path] = None,
+    config_path: Optional[Path] = None,
+    catalog: Optional[SupplierCatalog] = None,
+    config: Optional[Dict[str, Any]] = None,
+    normalized_bom_path: Optional[Path] = None,
+    recorder: Optional[StageRecorder] = None,
+) -> Dict[str, Any]:
+    """
+    Revision-aware variant of run_analysis().
+
+    The new BOM is normalized and validated as usual, then diffed per
+    PartNumber against the revision stored in `state_dir`. Only added,
+    removed or modified PartNumbers go through optimize_bom, the price
+    lookup and the risk flags; the stored per-part frames are patched
+    and the summaries rebuilt from them, so results match a full run.
+    A full recompute happens when there is no usable state, when the
+    config or suppliers file changed since it was written, and always for
+    hierarchical BOMs (Parent column); the delta is still reported
+    against the stored revision. A `catalog` passed in is assumed to be
+    built from `suppliers_path`.
+
+    Returns the run_analysis() dictionary plus:
+      - delta: dict with cost/risk changes, added/removed/changed parts
+        and per-part risk flag changes
+
+    `catalog` is None in the result if nothing needed recomputing and no
+    catalog was passed in (the suppliers are then not loaded at all).
+    Stages are recorded on `recorder` as in run_analysis().
+    """
+    if recorder is None:
+        recorder = StageRecorder()
+
+    if config is None:
+        with recorder.stage("config"):
+            cfg_path_str = str(config_path) if config_path is not None else None
+            config = load_config(cfg_path_str)
+    suppliers_path = resolve_suppliers_path(suppliers_path, config)
+
+    with recorder.stage("load") as stage:
+        bom_df = load_bom(
+            bom_path, columns=bom_columns(config), fast=schema_settings(config)["fast_parser"]
+        )
+        stage.rows = len(bom_df)
+    with recorder.stage("normalize") as stage:
+        normalized_bom = normalize_bom_columns(bom_df, config=config)
+        stage.rows = len(normalized_bom)
+    with recorder.stage("validate") as stage:
+        issues = validate_bom(normalized_bom)
+        stage.rows = len(issues)
+    if normalized_bom_path is not None:
+        with recorder.stage("write_normalized") as stage:
+            write_normalized_bom(normalized_bom, normalized_bom_path)
+            stage.rows = len(normalized_bom)
+
+    with recorder.stage("diff") as stage:
+        signatures = _part_signatures(normalized_bom)
+        config_fp = _config_fingerprint(config)
+        suppliers_fp = _suppliers_fingerprint(suppliers_path)
+
+        # Assembly quantities scale whole subtrees, so trees are always recomputed
+        tree = build_tree(normalized_bom) if is_hierarchical(normalized_bom) else None
+
+        previous = load_state(state_dir)
+        reusable = (
+            tree is None
+            and previous is not None
+            and previous["config"] == config_fp
+            and previous["suppliers"] is not None
+            and previous["suppliers"] == suppliers_fp
+        )
+
+        old_signatures = (
+            previous["signatures"]
+            if previous is not None
+            else pd.Series([], dtype=np.uint64, index=pd.Index([], dtype=object))
+        )
+        joined = pd.concat([old_signatures.rename("old"), signatures.rename("new")], axis=1)
+        added = joined.index[joined["old"].isna()]
+        removed = joined.index[joined["new"].isna()]
+        modified = joined.index[joined["old"].notna() & joined["new"].notna() & (joined["old"] != joined["new"])]
+        changed = added.append(removed).append(modified)
+        stage.rows = int(len(changed))
+
+    full_recompute = not reusable
+    volume = cost_volume(config)
+    match = match_mode(config)
+    if (full_recompute or len(changed)) and catalog is None:
+        with recorder.stage("suppliers") as stage:
+            catalog = load_catalog_for_config(
+                suppliers_path,
+                config,
+                parts=clean_strings(normalized_bom["PartNumber"]).unique(),
+            )
+            stage.rows = len(catalog.parts)
+
+    with recorder.stage("recompute") as stage:
+        if full_recompute:
+            optimized_bom = optimize_bom(normalized_bom) if tree is None else explode_bom(tree)
+            prices = price_lines(optimized_bom, catalog, volume, match)
+            risks = risk_lines(optimized_bom, catalog, match)
+        elif len(changed):
+            optimized_bom, prices, risks = _patch(previous, normalized_bom, changed, catalog, volume, match)
+        else:
+            optimized_bom, prices, risks = (
+                previous["optimized_bom"],
+                previous["price_lines"],
+                previous["risk_lines"],
+            )
+        stage.rows = len(optimized_bom)
+
+    with recorder.stage("summarize") as stage:
+        currency = cost_currency(catalog, config) if catalog is not None else previous["currency"]
+        cost_summary = summarize_costs(prices, currency, volume)
+        risk_summary = summarize_risk(risks, config)
+        stage.rows = len(prices)
+    hierarchy = None
+    if tree is not None:
+        with recorder.stage("hierarchy") as stage:
+            hierarchy = analyze_hierarchy(tree, optimized_bom, catalog, config)
+            stage.rows = hierarchy.assembly_count
+
+    delta = {
+        "full_recompute": full_recompute,
+        "recomputed_parts": int(len(changed)),
+        "previous_total_cost": previous["total_cost"] if previous is not None else None,
+        "total_cost": cost_summary.total_cost,
+        "cost_change": (
+            None
+            if previous is None
+            else round(cost_summary.total_cost - previous["total_cost"], 4)
+        ),
+        "previous_risk_score": previous["risk_score"] if previous is not None else None,
+        "risk_score": risk_summary.risk_score,
+        "risk_score_change": (
+            None
+            if previous is None
+            else round(risk_summary.risk_score - previous["risk_score"], 2)
+        ),
+        "parts_added": sorted(str(p) for p in added),
+        "parts_removed": sorted(str(p) for p in removed),
+        "parts_changed": sorted(str(p) for p in modified),
+        "risk_flag_changes": (
+            [] if previous is None else _risk_flag_changes(previous["risk_lines"], risks)
+        ),
+    }
+
+    with recorder.stage("save_state"):
+        save_state(
+            state_dir,
+            {
+                "version": STATE_VERSION,
+                "config": config_fp,
+                "suppliers": suppliers_fp,
+                "currency": currency,
+                "signatures": signatures,
+                "optimized_bom": optimized_bom,
+                "price_lines": prices,
+                "risk_lines": risks,
+                "total_cost": cost_summary.total_cost,
+                "risk_score": risk_summary.risk_score,
+            },
+        )
+
+    return {
+        "normalized_bom": normalized_bom,
+        "optimized_bom": optimized_bom,
+        "issues": issues,
+        "cost_summary": cost_summary,
+        "risk_summary": risk_summary,
+        "hierarchy": hierarchy,
+        "catalog": catalog,
+        "config": config,
+        "bom_path": bom_path,
+        "suppliers_path": suppliers_path,
+        "delta": delta,
+        "profile": recorder.to_list(),
+    }
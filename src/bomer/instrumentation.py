@@ -0,0 +1,170 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+# hook(event, record): event is "start" or "end"; on "start" only
+# record.name is meaningful
+StageHook = Callable[[str, "StageRecord"], None]
+
+_hooks: List[StageHook] = []
+_hooks_lock = threading.Lock()
+
+
+def add_stage_hook(hook: StageHook) -> Callable[[], None]:
+    """
+    Subscribe `hook` to the start and end of every pipeline stage, in
+    every analysis of this process. Returns a function that unsubscribes.
+
+    Hooks run synchronously in the thread running the stage (stages may
+    run concurrently, see StageScheduler); exceptions they raise propagate
+    into the analysis.
+    """
+    with _hooks_lock:
+        _hooks.append(hook)
+
+    def remove() -> None:
+        with _hooks_lock:
+            if hook in _hooks:
+                _hooks.remove(hook)
+
+    return remove
+
+
+def _emit(event: str, record: "StageRecord") -> None:
+    with _hooks_lock:
+        hooks = list(_hooks)
+    for hook in hooks:
+        hook(event, record)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """
+    High-water mark of the process resident set size in MB, if known.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+@dataclass
+class StageRecord:
+    """
+    Measurements of one pipeline stage:
+
+    - start: seconds since the recorder was created
+    - wall_seconds / cpu_seconds: elapsed and process CPU time
+    - peak_memory_mb: peak traced allocation of the stage when tracemalloc
+      is tracing, else how much the process peak RSS grew during it
+    - rows: rows the stage produced (None if not applicable)
+    - error: exception type name if the stage failed, else None
+    - thread_id: thread the stage ran on (trace only, not in to_dict)
+    """
+
+    name: str
+    start: float = 0.0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_memory_mb: Optional[float] = None
+    rows: Optional[int] = None
+    error: Optional[str] = None
+    thread_id: int = field(default=0, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = asdict(self)
+        del record["thread_id"]
+        for key in ("start", "wall_seconds", "cpu_seconds"):
+            record[key] = round(record[key], 6)
+        if record["peak_memory_mb"] is not None:
+            record["peak_memory_mb"] = round(record["peak_memory_mb"], 3)
+        return record
+
+
+class StageRecorder:
+    """
+    Collects a StageRecord per stage of one analysis run and notifies the
+    hooks registered with add_stage_hook().
+
+        recorder = StageRecorder()
+        with recorder.stage("load") as stage:
+            df = load_bom(path)
+            stage.rows = len(df)
+    """
+
+    def __init__(self) -> None:
+        self.records: List[StageRecord] = []
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        record = StageRecord(name=name, thread_id=threading.get_ident())
+        _emit("start", record)
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        rss_before = _peak_rss_mb()
+        cpu_before = time.process_time()
+        wall_before = time.perf_counter()
+
+        # A failing stage is still measured, recorded and ended before
+        # its exception propagates
+        try:
+            yield record
+        except BaseException as exc:
+            record.error = type(exc).__name__
+            raise
+        finally:
+            record.start = wall_before - self._origin
+            record.wall_seconds = time.perf_counter() - wall_before
+            record.cpu_seconds = time.process_time() - cpu_before
+            if tracing:
+                record.peak_memory_mb = (tracemalloc.get_traced_memory()[1] - traced_before) / 2**20
+            elif rss_before is not None:
+                record.peak_memory_mb = (_peak_rss_mb() or rss_before) - rss_before
+            self.records.append(record)
+            _emit("end", record)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [record.to_dict() for record in self.records]
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        The stages as Chrome trace events (chrome://tracing, Perfetto),
+        each on the thread it ran on, so overlapping stages get their own
+        track.
+        """
+        return {
+            "traceEvents": [
+                {
+                    "name": record.name,
+                    "cat": "bomer",
+                    "ph": "X",
+                    "ts": round(record.start * 1e6, 3),
+                    "dur": round(record.wall_seconds * 1e6, 3),
+                    "pid": self._pid,
+                    "tid": record.thread_id,
+                    "args": {
+                        "cpu_seconds": round(record.cpu_seconds, 6),
+                        "peak_memory_mb": record.peak_memory_mb,
+                        "rows": record.rows,
+                        "error": record.error,
+                    },
+                }
+                for record in self.records
+            ],
+            "displayTimeUnit": "ms",
+        }
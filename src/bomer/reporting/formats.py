@@ -0,0 +1,143 @@
+import importlib.util
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Set
+
+from bomer.core.exceptions import ConfigError
+
+if TYPE_CHECKING:  # pandas is only needed once a table is written
+    import pandas as pd
+
+# Output formats for tabular artifacts, by file extension
+TABLE_FORMATS = {
+    "csv": ".csv",
+    "csv.gz": ".csv.gz",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+
+# Formats that need the optional pyarrow dependency
+ARROW_FORMATS = ("parquet", "feather")
+
+# Used instead of an Arrow format when pyarrow is not installed
+FALLBACK_FORMAT = "csv.gz"
+
+# Artifact names accepted by write_analysis_reports(skip=...) and --skip
+ARTIFACTS = (
+    "normalized_bom",
+    "optimized_bom",
+    "cost_lines",
+    "risk_lines",
+    "analysis",
+    "issues",
+    "summary",
+    "delta",
+    "assemblies",
+    "levels",
+)
+
+
+def check_artifacts(names: Iterable[str]) -> Set[str]:
+    """
+    Validate artifact names to skip; raises ConfigError on unknown names.
+    """
+    names = set(names)
+    unknown = sorted(names - set(ARTIFACTS))
+    if unknown:
+        raise ConfigError(
+            f"Unknown artifact(s) {', '.join(unknown)}; expected any of {', '.join(ARTIFACTS)}."
+        )
+    return names
+
+
+def resolve_table_format(name: str) -> str:
+    """
+    Validate a --format value. Parquet and Feather fall back to gzip
+    compressed CSV (with a warning) when pyarrow is not installed.
+    """
+    if name not in TABLE_FORMATS:
+        raise ConfigError(
+            f"Unknown output format {name!r}; expected one of {', '.join(TABLE_FORMATS)}."
+        )
+    if name in ARROW_FORMATS and importlib.util.find_spec("pyarrow") is None:
+        warnings.warn(f"pyarrow is not installed; writing {FALLBACK_FORMAT} instead of {name}.")
+        return FALLBACK_FORMAT
+    return name
+
+
+def table_path(output_dir: Path, name: str, fmt: str) -> Path:
+    return output_dir / (name + TABLE_FORMATS[fmt])
+
+
+def format_of(path: Path) -> str:
+    """
+    Table format implied by the file name (plain CSV if not recognised).
+    """
+    name = path.name.lower()
+    for fmt, suffix in sorted(TABLE_FORMATS.items(), key=lambda item: -len(item[1])):
+        if name.endswith(suffix):
+            return fmt
+    return "csv"
+
+
+def write_table(df: "pd.DataFrame", path: Path) -> None:
+    """
+    Write a DataFrame in the format given by the file extension.
+    """
+    writer = TableWriter(path)
+    try:
+        writer.write(df)
+    finally:
+        writer.close()
+
+
+class TableWriter:
+    """
+    Write a table chunk by chunk (streaming pipelines) in the format given
+    by the file extension.
+
+    CSV formats append rows after a single header; Parquet and Feather
+    keep one open Arrow writer, with later chunks cast to the schema of
+    the first.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.fmt = format_of(path)
+        self._writer: Optional[Any] = None
+        self._schema: Optional[Any] = None
+        self._rows_written = False
+
+    def write(self, df: "pd.DataFrame") -> None:
+        if self.fmt in ("csv", "csv.gz"):
+            df.to_csv(
+                self.path,
+                index=False,
+                mode="a" if self._rows_written else "w",
+                header=not self._rows_written,
+                compression="gzip" if self.fmt == "csv.gz" else None,
+            )
+            self._rows_written = True
+            return
+
+        import pyarrow as pa
+
+        if self._writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._schema = table.schema
+            if self.fmt == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(str(self.path), self._schema)
+            else:
+                options = pa.ipc.IpcWriteOptions(compression="lz4")
+                self._writer = pa.ipc.new_file(str(self.path), self._schema, options=options)
+        else:
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+        self._rows_written = True
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
@@ -0,0 +1,115 @@
+import json
+import math
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Rows converted to Python objects at a time when streaming a table
+RECORD_BATCH = 65_536
+
+
+def _make_dumps() -> Callable[[Any], bytes]:
+    if orjson is not None:
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+        def dumps(value: Any) -> bytes:
+            return orjson.dumps(value, option=options)
+
+        return dumps
+
+    encoder = json.JSONEncoder(
+        separators=(",", ":"), ensure_ascii=False, allow_nan=False, default=_numpy_default
+    )
+
+    def dumps(value: Any) -> bytes:
+        return encoder.encode(_finite(value)).encode("utf-8")
+
+    return dumps
+
+
+def _finite(value: Any) -> Any:
+    """
+    `value` with NaN and infinite floats replaced by None (null), as
+    orjson writes them; the stdlib would write invalid JSON (NaN).
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _numpy_default(value: Any) -> Any:
+    if hasattr(value, "tolist"):
+        return _finite(value.tolist())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Compact JSON encoding to bytes: orjson when installed, else the stdlib.
+# Both write non-finite floats as null.
+dumps = _make_dumps()
+
+
+def _newline(level: int, compact: bool) -> bytes:
+    return b"" if compact else b"\n" + b"  " * level
+
+
+def _write_records(f: BinaryIO, table: pd.DataFrame, level: int, compact: bool) -> None:
+    """
+    Write a DataFrame as a JSON array of row objects, one per line,
+    converting RECORD_BATCH rows to Python objects at a time.
+    """
+    if table.empty:
+        f.write(b"[]")
+        return
+
+    columns = [str(c) for c in table.columns]
+    row_start = _newline(level + 1, compact)
+    f.write(b"[")
+    for start in range(0, len(table), RECORD_BATCH):
+        batch = table.iloc[start:start + RECORD_BATCH]
+        values = [batch[c].tolist() for c in batch.columns]
+        encoded = [dumps(dict(zip(columns, row))) for row in zip(*values)]
+        if start:
+            f.write(b",")
+        f.write(row_start + (b"," + row_start).join(encoded))
+    f.write(_newline(level, compact) + b"]")
+
+
+def _write_value(f: BinaryIO, value: Any, level: int, compact: bool) -> None:
+    if isinstance(value, pd.DataFrame):
+        _write_records(f, value, level, compact)
+    elif isinstance(value, dict) and value:
+        key_start = _newline(level + 1, compact)
+        f.write(b"{")
+        for i, (key, item) in enumerate(value.items()):
+            if i:
+                f.write(b",")
+            f.write(key_start + dumps(str(key)) + (b":" if compact else b": "))
+            _write_value(f, item, level + 1, compact)
+        f.write(_newline(level, compact) + b"}")
+    else:
+        f.write(dumps(value))
+
+
+def write_json_document(document: Any, path: Path, compact: bool = False) -> None:
+    """
+    Stream a JSON document to `path` without materialising it.
+
+    DataFrames anywhere in the (nested dict) document are written as
+    arrays of row objects straight from their columns. By default the
+    document is indented like json.dump(indent=2) except that each row
+    object is written on a single line (JSON Lines style, like
+    issues.json); compact=True leaves out all whitespace.
+    """
+    with path.open("wb") as f:
+        _write_value(f, document, 0, compact)
+        f.write(b"\n")
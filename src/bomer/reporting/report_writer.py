@@ -1,19 +1,110 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
-from bomer.engines.models import CostSummary, RiskSummary
+from bomer.core.validation import issue_count
+from bomer.engines.models import CostSummary, LineTable, PurchasePlan, RiskSummary, SimulationSummary
+from bomer.reporting.formats import ARTIFACTS, check_artifacts, table_path, write_table
+from bomer.reporting.json_writer import write_json_document
 
 
 def write_normalized_bom(df: pd.DataFrame, path: Path) -> None:
-    df.to_csv(path, index=False)
+    """
+    Write the normalized BOM in the format given by the file extension
+    (chunked pipelines append through formats.TableWriter instead).
+    """
+    write_table(df, path)
 
 
 def write_optimized_bom(df: pd.DataFrame, path: Path) -> None:
-    df.to_csv(path, index=False)
+    write_table(df, path)
+
+
+def _line_records(line_table: Optional[pd.DataFrame], lines: Sequence[Any]) -> Any:
+    """
+    The per-line section of a summary: its DataFrame when columnar
+    (written row by row without copies), else one dict per line object.
+    """
+    if line_table is not None:
+        return line_table
+    if isinstance(lines, LineTable):
+        return lines.frame
+    return [asdict(line) for line in lines]
+
+
+def _cost_summary_dict(cost_summary: CostSummary) -> Dict[str, Any]:
+    line_items = _line_records(cost_summary.line_table, cost_summary.line_items)
+    return {
+        "currency": cost_summary.currency,
+        "total_cost": cost_summary.total_cost,
+        "volume": cost_summary.volume,
+        "line_items": line_items,
+        "missing_prices": list(cost_summary.missing_prices),
+    }
+
+
+def _risk_summary_dict(risk_summary: RiskSummary) -> Dict[str, Any]:
+    lines = _line_records(risk_summary.line_table, risk_summary.lines)
+    return {
+        "risk_score": risk_summary.risk_score,
+        "single_source_ratio": risk_summary.single_source_ratio,
+        "missing_price_ratio": risk_summary.missing_price_ratio,
+        "obsolete_ratio": risk_summary.obsolete_ratio,
+        "lines": lines,
+    }
+
+
+def _analysis_document(
+    optimized_bom: pd.DataFrame,
+    cost_summary: CostSummary,
+    risk_summary: RiskSummary,
+    bom_path: Path,
+    suppliers_path: Path,
+    profile: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    The analysis.json structure, with the per-line sections left as
+    DataFrames where the summaries have a line_table. `profile` (per-stage
+    measurements of the run) goes into metadata.stages if given.
+    """
+    metadata: Dict[str, Any] = {
+        "bom_path": str(bom_path),
+        "suppliers_path": str(suppliers_path),
+        "part_count": int(len(optimized_bom)),
+    }
+    if profile is not None:
+        metadata["stages"] = profile
+    return {
+        "metadata": metadata,
+        "cost": _cost_summary_dict(cost_summary),
+        "risk": _risk_summary_dict(risk_summary),
+    }
+
+
+def build_analysis_dict(
+    optimized_bom: pd.DataFrame,
+    cost_summary: CostSummary,
+    risk_summary: RiskSummary,
+    bom_path: Path,
+    suppliers_path: Path,
+    profile: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    The analysis.json structure as a plain dict.
+    """
+    document = _analysis_document(
+        optimized_bom, cost_summary, risk_summary, bom_path, suppliers_path, profile
+    )
+    for section, key in (("cost", "line_items"), ("risk", "lines")):
+        lines = document[section][key]
+        if isinstance(lines, pd.DataFrame):
+            document[section][key] = lines.to_dict(orient="records")
+    return document
 
 
 def write_analysis_json(
@@ -23,24 +114,91 @@ def write_analysis_json(
     bom_path: Path,
     suppliers_path: Path,
     path: Path,
+    compact: bool = False,
+    profile: Optional[List[Dict[str, Any]]] = None,
 ) -> None:
-    analysis: Dict[str, Any] = {
-        "metadata": {
-            "bom_path": str(bom_path),
-            "suppliers_path": str(suppliers_path),
-            "part_count": int(len(optimized_bom)),
-        },
-        "cost": asdict(cost_summary),
-        "risk": asdict(risk_summary),
-    }
+    """
+    Stream analysis.json: line tables are encoded row by row straight to
+    the file (see write_json_document), one line per row unless compact.
+    """
+    write_json_document(
+        _analysis_document(
+            optimized_bom, cost_summary, risk_summary, bom_path, suppliers_path, profile
+        ),
+        path,
+        compact=compact,
+    )
 
+
+def write_issues_json(issues: List[Dict[str, Any]], path: Path) -> None:
+    """
+    Write grouped validation issues, one JSON object per line of the
+    top-level array, with row indices emitted as a flat integer list.
+    """
     with path.open("w", encoding="utf-8") as f:
-        json.dump(analysis, f, indent=2)
+        f.write("[")
+        for i, issue in enumerate(issues):
+            record = dict(issue)
+            record["row_indices"] = np.asarray(issue["row_indices"]).tolist()
+            f.write(("," if i else "") + "\n  " + json.dumps(record))
+        f.write("\n]\n" if issues else "]\n")
 
 
-def write_issues_json(issues: List[Dict[str, Any]], path: Path) -> None:
+def write_delta_json(delta: Dict[str, Any], path: Path) -> None:
     with path.open("w", encoding="utf-8") as f:
-        json.dump(issues, f, indent=2)
+        json.dump(delta, f, indent=2)
+
+
+def write_purchase_plan(plan: PurchasePlan, output_dir: Path) -> None:
+    """
+    Write purchase_plan.csv (one row per part) and purchase_plan.json
+    (plan totals plus one entry per supplier with its order lines).
+    """
+    plan.lines.to_csv(output_dir / "purchase_plan.csv", index=False)
+
+    lines_by_supplier = {
+        name: group.drop(columns="Supplier").to_dict(orient="records")
+        for name, group in plan.lines.groupby("Supplier", sort=False)
+    }
+    document = {
+        "currency": plan.currency,
+        "method": plan.method,
+        "total_cost": plan.total_cost,
+        "item_cost": plan.item_cost,
+        "order_cost": plan.order_cost,
+        "supplier_count": plan.supplier_count,
+        "unassigned": plan.unassigned,
+        "suppliers": [
+            dict(record, lines=lines_by_supplier.get(record["Supplier"], []))
+            for record in plan.suppliers.to_dict(orient="records")
+        ],
+    }
+    with (output_dir / "purchase_plan.json").open("w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+
+def write_simulation(summary: SimulationSummary, output_dir: Path) -> None:
+    """
+    Write simulation.json: the outcome distribution plus the parts that
+    were unavailable in any trial, most often unavailable first.
+    """
+    at_risk = summary.line_table[summary.line_table["unavailable_probability"] > 0]
+    at_risk = at_risk.sort_values("unavailable_probability", ascending=False, kind="stable")
+    document = {
+        "currency": summary.currency,
+        "trials": summary.trials,
+        "seed": summary.seed,
+        "baseline_cost": summary.baseline_cost,
+        "mean_cost": summary.mean_cost,
+        "cost_percentiles": summary.cost_percentiles,
+        "unavailable_probability": summary.unavailable_probability,
+        "budget": summary.budget,
+        "over_budget_probability": summary.over_budget_probability,
+        "unpriced": summary.unpriced,
+        "parts_at_risk": at_risk.to_dict(orient="records"),
+    }
+    with (output_dir / "simulation.json").open("w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
 
 
 def write_summary_text(
@@ -59,6 +217,12 @@ def write_summary_text(
     lines.append(
         f"Total cost: {cost_summary.total_cost:.4f} {cost_summary.currency}"
     )
+    if cost_summary.line_table is not None and "MatchType" in cost_summary.line_table:
+        counts = cost_summary.line_table["MatchType"].value_counts()
+        lines.append(
+            "Price matches: "
+            + ", ".join(f"{int(counts.get(how, 0))} {how}" for how in ("exact", "normalized", "fuzzy"))
+        )
     lines.append("")
     lines.append("Risk:")
     lines.append(f"- risk_score: {risk_summary.risk_score}")
@@ -70,7 +234,78 @@ def write_summary_text(
     )
     lines.append(f"- obsolete_ratio: {risk_summary.obsolete_ratio:.3f}")
     lines.append("")
-    lines.append(f"Issues detected: {len(issues)}")
+    lines.append(f"Issues detected: {issue_count(issues)}")
+    for issue in issues:
+        lines.append(f"- {issue['rule']}: {issue['count']}")
 
     with path.open("w", encoding="utf-8") as f:
         f.write("\n".join(lines) + "\n")
+
+
+def write_analysis_reports(
+    result: Dict[str, Any],
+    output_dir: Path,
+    fmt: str = "csv",
+    skip: Iterable[str] = (),
+    compact_json: bool = False,
+) -> None:
+    """
+    Write the standard per-analysis artifacts for a run_analysis() result:
+    optimized_bom, cost_lines and risk_lines tables, analysis.json,
+    issues.json and summary.txt, plus delta.json for incremental runs and
+    assemblies / levels tables for hierarchical BOMs.
+
+    Tables are written in `fmt` (see bomer.reporting.formats) and
+    analysis.json without whitespace if `compact_json`; artifacts
+    named in `skip` (see ARTIFACTS) are left out. Artifacts are
+    independent, so they are written concurrently.
+
+    The normalized BOM is written by run_analysis() itself (see its
+    normalized_bom_path argument), as streaming runs produce it on the fly.
+    """
+    skipped = check_artifacts(skip)
+    optimized_bom = result["optimized_bom"]
+    cost_summary = result["cost_summary"]
+    risk_summary = result["risk_summary"]
+    issues = result["issues"]
+
+    tables: Dict[str, Optional[pd.DataFrame]] = {
+        "optimized_bom": optimized_bom,
+        "cost_lines": cost_summary.line_table,
+        "risk_lines": risk_summary.line_table,
+    }
+    if result.get("hierarchy") is not None:
+        tables["assemblies"] = result["hierarchy"].assemblies
+        tables["levels"] = result["hierarchy"].levels
+
+    jobs: Dict[str, Tuple[Callable[..., None], Tuple[Any, ...]]] = {
+        name: (write_table, (table, table_path(output_dir, name, fmt)))
+        for name, table in tables.items()
+        if table is not None
+    }
+    jobs["analysis"] = (
+        write_analysis_json,
+        (
+            optimized_bom,
+            cost_summary,
+            risk_summary,
+            result["bom_path"],
+            result["suppliers_path"],
+            output_dir / "analysis.json",
+            compact_json,
+            result.get("profile"),
+        ),
+    )
+    jobs["issues"] = (write_issues_json, (issues, output_dir / "issues.json"))
+    jobs["summary"] = (
+        write_summary_text,
+        (optimized_bom, cost_summary, risk_summary, issues, output_dir / "summary.txt"),
+    )
+    if result.get("delta") is not None:
+        jobs["delta"] = (write_delta_json, (result["delta"], output_dir / "delta.json"))
+
+    selected = [job for name, job in jobs.items() if name not in skipped]
+    with ThreadPoolExecutor(max_workers=max(len(selected), 1)) as pool:
+        futures = [pool.submit(func, *args) for func, args in selected]
+    for future in futures:
+        future.result()
@@ -0,0 +1,245 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from bomer.api import resolve_suppliers_path, run_analysis
+from bomer.core.catalog import SupplierCatalog
+from bomer.core.catalog_cache import load_catalog_for_config
+from bomer.core.config import load_config
+from bomer.core.exceptions import BomerError
+from bomer.reporting.report_writer import build_analysis_dict
+
+# Number of most recent request latencies kept for percentile reporting
+LATENCY_WINDOW = 10_000
+
+# Upper bound for request bodies (inline BOM CSV)
+MAX_BODY_BYTES = 256 * 1024 * 1024
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+class WarmState:
+    """
+    Config and supplier catalog kept in memory between requests.
+
+    current() checks the mtimes of the config file and the suppliers file
+    and reloads both when either changed on disk. Readers get a consistent
+    (config, catalog, suppliers_path) snapshot; reloads swap it atomically.
+    """
+
+    def __init__(self, config_path: Optional[Path] = None, suppliers_path: Optional[Path] = None) -> None:
+        self.config_path = config_path if config_path is not None else Path("bomer.yaml")
+        self._suppliers_override = suppliers_path
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Tuple[Dict[str, Any], SupplierCatalog, Path]] = None
+        self._stamp: Optional[Tuple[Optional[int], Optional[int]]] = None
+        self.reloads = 0
+
+    def _load(self) -> None:
+        config = load_config(str(self.config_path))
+        suppliers_path = resolve_suppliers_path(self._suppliers_override, config)
+        catalog = load_catalog_for_config(suppliers_path, config)
+        self._snapshot = (config, catalog, suppliers_path)
+        self._stamp = (_mtime(self.config_path), _mtime(suppliers_path))
+        self.reloads += 1
+
+    def current(self) -> Tuple[Dict[str, Any], SupplierCatalog, Path]:
+        with self._lock:
+            if self._snapshot is None:
+                self._load()
+            else:
+                suppliers_path = self._snapshot[2]
+                if (_mtime(self.config_path), _mtime(suppliers_path)) != self._stamp:
+                    self._load()
+            assert self._snapshot is not None
+            return self._snapshot
+
+
+class LatencyStats:
+    """
+    Thread-safe rolling window of request latencies.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+            self.requests += 1
+            if not ok:
+                self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = np.asarray(self._latencies, dtype=float) * 1000.0
+            requests, errors = self.requests, self.errors
+        stats: Dict[str, Any] = {"requests": requests, "errors": errors, "window": int(len(latencies))}
+        if len(latencies):
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            stats["latency_ms"] = {
+                "p50": round(float(p50), 3),
+                "p90": round(float(p90), 3),
+                "p99": round(float(p99), 3),
+                "max": round(float(latencies.max()), 3),
+            }
+        return stats
+
+
+def analyze_request(state: WarmState, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one analysis for a request payload:
+
+    {"bom_path": "path/to/bom.csv"}  or  {"bom_csv": "<CSV text>"}
+
+    plus optional "chunksize" (a positive integer). Returns the
+    analysis.json structure.
+    """
+    config, catalog, suppliers_path = state.current()
+    chunksize = payload.get("chunksize")
+    if chunksize is not None and (
+        isinstance(chunksize, bool) or not isinstance(chunksize, int) or chunksize < 1
+    ):
+        raise ValueError(f"'chunksize' must be a positive integer, got {chunksize!r}.")
+
+    if "bom_path" in payload:
+        result = run_analysis(
+            bom_path=Path(str(payload["bom_path"])),
+            suppliers_path=suppliers_path,
+            catalog=catalog,
+            config=config,
+            chunksize=chunksize,
+        )
+    elif "bom_csv" in payload:
+        fd, tmp_name = tempfile.mkstemp(suffix=".csv", prefix="bomer-serve-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(str(payload["bom_csv"]))
+            result = run_analysis(
+                bom_path=Path(tmp_name),
+                suppliers_path=suppliers_path,
+                catalog=catalog,
+                config=config,
+                chunksize=chunksize,
+            )
+            result["bom_path"] = "<inline>"
+        finally:
+            os.unlink(tmp_name)
+    else:
+        raise ValueError("Request must contain 'bom_path' or 'bom_csv'.")
+
+    return build_analysis_dict(
+        result["optimized_bom"],
+        result["cost_summary"],
+        result["risk_summary"],
+        result["bom_path"],
+        result["suppliers_path"],
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "BomerServer"
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "reloads": self.server.state.reloads})
+        elif self.path == "/stats":
+            self._send_json(200, self.server.stats.snapshot())
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/analyze":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        started = time.perf_counter()
+        status = 200
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                raise ValueError("Request body too large.")
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object.")
+            body = analyze_request(self.server.state, payload)
+        except (BomerError, ValueError) as exc:
+            status, body = 400, {"error": str(exc)}
+        except Exception as exc:  # pragma: no cover - keep the service alive
+            status, body = 500, {"error": f"{type(exc).__name__}: {exc}"}
+
+        self.server.stats.record(time.perf_counter() - started, ok=status == 200)
+        self._send_json(status, body)
+
+
+class BomerServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP/JSON front end for run_analysis() with warm caches.
+
+    Endpoints:
+    - POST /analyze  analysis.json structure for the posted BOM
+    - GET  /stats    request counts and latency percentiles
+    - GET  /health   liveness and number of config/catalog (re)loads
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        state: WarmState,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.state = state
+        self.stats = LatencyStats()
+        self.verbose = verbose
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    config_path: Optional[Path] = None,
+    suppliers_path: Optional[Path] = None,
+    verbose: bool = False,
+) -> None:
+    """
+    Load config and suppliers, then serve requests until interrupted.
+    """
+    state = WarmState(config_path=config_path, suppliers_path=suppliers_path)
+    state.current()
+
+    with BomerServer((host, port), state, verbose=verbose) as server:
+        print(f"[BOMER] Serving on http://{host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,150 @@
+"""
+Deterministic synthetic BOMs and supplier catalogs (benchmarks, tests).
+
+Everything is drawn from a seeded NumPy generator, so the same arguments
+always produce the same data.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# (part number prefix, manufacturer, description, designator letter)
+PART_FAMILIES = [
+    ("RC0603FR-07", "Yageo", "Resistor 0603 1%", "R"),
+    ("GRM188R71H", "Murata", "Capacitor MLCC 0603", "C"),
+    ("LM358D", "Texas Instruments", "Dual op-amp", "U"),
+    ("BSS138-", "onsemi", "N-channel MOSFET", "Q"),
+    ("BLM18PG", "Murata", "Ferrite bead 0603", "FB"),
+    ("1N4148W-", "Diodes Inc", "Switching diode", "D"),
+    ("ATMEGA328P-", "Microchip", "8-bit MCU", "U"),
+    ("TPS62160D", "Texas Instruments", "Buck converter", "U"),
+]
+
+# Column names used instead of the canonical ones in messy BOMs
+MESSY_COLUMNS = {
+    "PartNumber": "MPN",
+    "Quantity": "Qty",
+    "Manufacturer": "Mfr",
+    "LifecycleStatus": "Lifecycle",
+    "Designator": "RefDes",
+}
+
+# Drawn uniformly, so 80% Active, 10% NRND, 10% Obsolete
+LIFECYCLE_STATUSES = np.array(["Active"] * 8 + ["NRND", "Obsolete"], dtype=object)
+
+
+def generate_part_numbers(n_parts: int, seed: int = 0) -> np.ndarray:
+    """
+    `n_parts` distinct part numbers spread over PART_FAMILIES.
+    """
+    rng = np.random.default_rng(seed)
+    family = rng.integers(0, len(PART_FAMILIES), n_parts)
+    prefixes = np.array([f[0] for f in PART_FAMILIES], dtype=object)
+    serial = np.char.zfill(np.arange(n_parts).astype(str), 7).astype(object)
+    return prefixes[family] + serial
+
+
+def generate_suppliers(
+    parts: np.ndarray,
+    n_suppliers: int = 5,
+    coverage: float = 0.9,
+    tiered_share: float = 0.3,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Suppliers JSON document pricing `parts`.
+
+    - coverage: share of parts priced by at least one supplier
+    - each priced part has 1 to 3 suppliers (fewer parts have more)
+    - tiered_share: share of price entries with quantity breaks
+    """
+    rng = np.random.default_rng(seed)
+    n_parts = len(parts)
+    priced = np.flatnonzero(rng.random(n_parts) < coverage)
+    base = np.round(rng.lognormal(mean=-2.0, sigma=1.5, size=n_parts), 4) + 0.0001
+
+    # Each priced part goes to `per_part` consecutive suppliers from a random first one
+    per_part = np.minimum(rng.geometric(0.55, len(priced)), min(3, n_suppliers))
+    first = rng.integers(0, n_suppliers, len(priced))
+    pair_part = np.repeat(priced, per_part)
+    offsets = np.arange(len(pair_part)) - np.repeat(np.cumsum(per_part) - per_part, per_part)
+    pair_supplier = (np.repeat(first, per_part) + offsets) % n_suppliers
+    pair_price = np.round(base[pair_part] * rng.uniform(0.85, 1.25, len(pair_part)), 4)
+    tiered = rng.random(len(pair_part)) < tiered_share
+
+    prices: List[Dict[str, Any]] = [{} for _ in range(n_suppliers)]
+    for part, supplier, price, has_tiers in zip(
+        parts[pair_part].tolist(), pair_supplier.tolist(), pair_price.tolist(), tiered.tolist()
+    ):
+        if has_tiers:
+            prices[supplier][part] = [
+                [1, price],
+                [100, round(price * 0.9, 4)],
+                [1000, round(price * 0.75, 4)],
+            ]
+        else:
+            prices[supplier][part] = price
+
+    return {
+        "currency": "USD",
+        "suppliers": [
+            {"name": f"Supplier{i:02d}", "order_cost": float(rng.integers(0, 50)), "prices": prices[i]}
+            for i in range(n_suppliers)
+        ],
+    }
+
+
+def generate_bom(
+    parts: np.ndarray,
+    n_lines: int,
+    duplicate_rate: float = 0.1,
+    messiness: float = 0.0,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    BOM with `n_lines` rows drawn from `parts`.
+
+    - duplicate_rate: share of rows repeating the part of an earlier row
+      (what optimize_bom aggregates)
+    - messiness (0-1): with any messiness, aliased column names
+      (MESSY_COLUMNS); then that share of part numbers padded with
+      whitespace, half of it lower-cased, a tenth with missing quantity
+    """
+    rng = np.random.default_rng(seed)
+    n_unique = max(int(round(n_lines * (1 - duplicate_rate))), 1 if n_lines else 0)
+    distinct = rng.choice(len(parts), size=min(n_unique, len(parts)), replace=False)
+    rows = np.concatenate([distinct, rng.choice(distinct, n_lines - len(distinct))])
+    rows = rows[rng.permutation(len(rows))] if len(rows) else rows
+
+    part_numbers = pd.Series(parts[rows], dtype=object)
+    family = np.zeros(len(rows), dtype=np.int64)
+    for i, (prefix, _, _, _) in enumerate(PART_FAMILIES):
+        family[part_numbers.str.startswith(prefix).to_numpy(dtype=bool)] = i
+    manufacturers, descriptions, letters = (
+        np.array([f[k] for f in PART_FAMILIES], dtype=object)[family] for k in (1, 2, 3)
+    )
+
+    part_column = part_numbers.to_numpy()
+    quantity = rng.integers(1, 20, len(rows)).astype(float)
+    lifecycle = LIFECYCLE_STATUSES[rng.integers(0, len(LIFECYCLE_STATUSES), len(rows))]
+
+    if messiness > 0:
+        padded = rng.random(len(rows)) < messiness
+        part_column = np.where(padded, "  " + part_column + " ", part_column)
+        lowered = rng.random(len(rows)) < messiness / 2
+        part_column = np.where(lowered, pd.Series(part_column).str.lower().to_numpy(), part_column)
+        quantity[rng.random(len(rows)) < messiness / 10] = np.nan
+
+    bom = pd.DataFrame(
+        {
+            "PartNumber": part_column,
+            "Quantity": quantity,
+            "Manufacturer": manufacturers,
+            "Description": descriptions,
+            "LifecycleStatus": lifecycle,
+            "Designator": letters + np.arange(1, len(rows) + 1).astype(str).astype(object),
+        }
+    )
+    return bom.rename(columns=MESSY_COLUMNS) if messiness > 0 else bom
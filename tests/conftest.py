@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch):
+    # Keep compiled catalogs out of the real per-user cache directory
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
@@ -0,0 +1,70 @@
+import pandas as pd
+
+from bomer.engines import allocation
+from bomer.engines.allocation import allocate_suppliers
+from bomer.reporting.report_writer import write_purchase_plan
+
+SUPPLIERS = {
+    "suppliers": [
+        {"name": "Cheap", "order_cost": 50, "prices": {"P1": 0.10, "P2": 0.20}},
+        {
+            "name": "Big",
+            "order_cost": 10,
+            "prices": {"P1": 0.12, "P2": 0.25, "P3": {"price": 1.0, "moq": 100, "multiple": 50}},
+        },
+        {"name": "Reel", "prices": {"P3": {"breaks": [[1, 2.0], [500, 0.5]], "multiple": 500}}},
+    ]
+}
+
+BOM = pd.DataFrame({"PartNumber": ["P1", "P2", "P3", "P4"], "Quantity": [100, 50, 30, 1]})
+
+
+def test_consolidates_on_landed_cost():
+    plan = allocate_suppliers(BOM, SUPPLIERS)
+
+    # Cheap saves 4.5 on P1/P2 but costs 50 to order from; P3's MOQ of 100
+    # at Big (100.0) beats a 500-piece reel at Reel (250.0)
+    assert plan.method == "exact"
+    assert list(plan.lines["Supplier"]) == ["Big", "Big", "Big"]
+    assert list(plan.lines["OrderQuantity"]) == [100.0, 50.0, 100.0]
+    assert plan.total_cost == 134.5
+    assert plan.order_cost == 10.0
+    assert plan.unassigned == ["P4"]
+    assert list(plan.suppliers["TotalCost"]) == [134.5]
+
+
+def test_local_search_matches_exact_on_small_instance(monkeypatch):
+    suppliers = {
+        "suppliers": [
+            {
+                "name": f"S{s}",
+                "order_cost": 5.0 * s,
+                "prices": {f"P{i}": 1.0 + (i * 7 + s * 3) % 5 for i in range(12) if (i + s) % 3},
+            }
+            for s in range(6)
+        ]
+    }
+    bom = pd.DataFrame({"PartNumber": [f"P{i}" for i in range(12)], "Quantity": [2] * 12})
+
+    exact = allocate_suppliers(bom, suppliers, max_suppliers=2)
+    monkeypatch.setattr(allocation, "EXACT_MAX_SUPPLIERS", 0)
+    heuristic = allocate_suppliers(bom, suppliers, max_suppliers=2)
+
+    assert heuristic.method == "local_search"
+    assert heuristic.supplier_count <= 2
+    assert heuristic.unassigned == exact.unassigned
+    assert heuristic.total_cost == exact.total_cost
+
+
+def test_no_priced_parts_gives_an_empty_plan(tmp_path):
+    plan = allocate_suppliers(
+        pd.DataFrame({"PartNumber": ["X", "Y"], "Quantity": [1, 2]}),
+        {"suppliers": [{"name": "A", "prices": {"P1": 1.0}}]},
+    )
+
+    assert plan.total_cost == 0.0
+    assert plan.supplier_count == 0
+    assert plan.unassigned == ["X", "Y"]
+    assert plan.lines.empty and plan.suppliers.empty
+    write_purchase_plan(plan, tmp_path)
+    assert (tmp_path / "purchase_plan.json").exists()
@@ -0,0 +1,166 @@
+import json
+
+import pandas as pd
+import pytest
+
+from bomer.api import run_analysis
+from bomer.core.exceptions import ConfigError, SupplierLoadError
+from bomer.instrumentation import add_stage_hook
+from bomer.reporting.report_writer import write_analysis_reports
+
+
+def _write_inputs(tmp_path):
+    bom = tmp_path / "bom.csv"
+    bom.write_text(
+        "MPN,Qty,RefDes\n"
+        "P1,2,R1\n"
+        "P2,,R2\n"
+        "P1,3,R1\n"
+        "P3,1.5,C1\n"
+        "P2,4,C2\n",
+        encoding="utf-8",
+    )
+    suppliers = tmp_path / "suppliers.json"
+    suppliers.write_text(
+        json.dumps({"suppliers": [{"name": "A", "prices": {"P1": 0.5, "P2": 1.0}}]}),
+        encoding="utf-8",
+    )
+    return bom, suppliers
+
+
+def test_streaming_matches_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bom, suppliers = _write_inputs(tmp_path)
+
+    full = run_analysis(bom, suppliers, normalized_bom_path=tmp_path / "full.csv")
+    streamed = run_analysis(
+        bom,
+        suppliers,
+        chunksize=2,
+        normalized_bom_path=tmp_path / "streamed.csv",
+    )
+
+    assert streamed["normalized_bom"] is None
+    assert (tmp_path / "full.csv").read_bytes() == (tmp_path / "streamed.csv").read_bytes()
+    assert streamed["optimized_bom"].equals(full["optimized_bom"])
+    assert streamed["cost_summary"].total_cost == full["cost_summary"].total_cost
+    assert [(i["rule"], list(i["row_indices"])) for i in streamed["issues"]] == [
+        (i["rule"], list(i["row_indices"])) for i in full["issues"]
+    ]
+
+
+def test_compressed_reports_and_skipped_artifacts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bom, suppliers = _write_inputs(tmp_path)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    full = run_analysis(bom, suppliers, normalized_bom_path=tmp_path / "full.csv")
+    streamed = run_analysis(
+        bom,
+        suppliers,
+        chunksize=2,
+        normalized_bom_path=out / "normalized_bom.csv.gz",
+    )
+    write_analysis_reports(streamed, out, fmt="csv.gz", skip={"issues", "risk_lines"})
+
+    assert pd.read_csv(out / "normalized_bom.csv.gz").equals(pd.read_csv(tmp_path / "full.csv"))
+    assert pd.read_csv(out / "cost_lines.csv.gz")["PartNumber"].tolist() == ["P1", "P2"]
+    assert sorted(p.name for p in out.iterdir()) == [
+        "analysis.json",
+        "cost_lines.csv.gz",
+        "normalized_bom.csv.gz",
+        "optimized_bom.csv.gz",
+        "summary.txt",
+    ]
+    with pytest.raises(ConfigError):
+        write_analysis_reports(full, out, skip={"everything"})
+
+
+def test_stage_profile_and_hooks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bom, suppliers = _write_inputs(tmp_path)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    events = []
+    remove = add_stage_hook(lambda event, record: events.append((event, record.name)))
+    try:
+        result = run_analysis(bom, suppliers)
+    finally:
+        remove()
+    run_analysis(bom, suppliers)
+
+    stages = [record["name"] for record in result["profile"]]
+    assert stages == ["config", "load", "normalize", "validate", "suppliers", "optimize", "cost", "risk"]
+    assert events[:2] == [("start", "config"), ("end", "config")]
+    assert len(events) == 2 * len(stages)
+    rows = {record["name"]: record["rows"] for record in result["profile"]}
+    assert rows["load"] == 5 and rows["optimize"] == 3 and rows["cost"] == 2
+
+    write_analysis_reports(result, out)
+    metadata = json.loads((out / "analysis.json").read_text(encoding="utf-8"))["metadata"]
+    assert metadata["stages"] == result["profile"]
+    assert all(record["wall_seconds"] >= 0 for record in metadata["stages"])
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_concurrent_stages_match_sequential(tmp_path, monkeypatch, executor):
+    monkeypatch.chdir(tmp_path)
+    bom, suppliers = _write_inputs(tmp_path)
+
+    sequential = run_analysis(bom, suppliers, normalized_bom_path=tmp_path / "seq.csv")
+    concurrent = run_analysis(
+        bom, suppliers, normalized_bom_path=tmp_path / "conc.csv", jobs=3, executor=executor
+    )
+
+    assert (tmp_path / "seq.csv").read_bytes() == (tmp_path / "conc.csv").read_bytes()
+    assert concurrent["optimized_bom"].equals(sequential["optimized_bom"])
+    assert concurrent["cost_summary"].line_table.equals(sequential["cost_summary"].line_table)
+    assert concurrent["risk_summary"].line_table.equals(sequential["risk_summary"].line_table)
+    assert [(i["rule"], list(i["row_indices"])) for i in concurrent["issues"]] == [
+        (i["rule"], list(i["row_indices"])) for i in sequential["issues"]
+    ]
+    assert {r["name"] for r in concurrent["profile"]} == {r["name"] for r in sequential["profile"]}
+
+    with pytest.raises(SupplierLoadError):
+        run_analysis(bom, tmp_path / "missing.json", jobs=3, executor=executor)
+
+
+def test_bom_without_part_numbers_gives_an_empty_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _, suppliers = _write_inputs(tmp_path)
+    bom = tmp_path / "unnamed.csv"
+    bom.write_text("Part,Quantity\nResistor,10\nCapacitor,5\n", encoding="utf-8")
+
+    result = run_analysis(bom, suppliers)
+
+    assert result["optimized_bom"].empty
+    assert result["cost_summary"].total_cost == 0.0
+    assert result["cost_summary"].missing_prices == []
+    (tmp_path / "out").mkdir()
+    write_analysis_reports(result, tmp_path / "out")
+    assert (tmp_path / "out" / "analysis.json").exists()
+
+
+def test_pruned_columns_load_in_worker_processes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bom, suppliers = _write_inputs(tmp_path)
+    config = {"schema": {"prune": True}}
+
+    sequential = run_analysis(bom, suppliers, config=config)
+    concurrent = run_analysis(bom, suppliers, config=config, jobs=3, executor="process")
+
+    assert "Designator" in concurrent["normalized_bom"].columns
+    assert concurrent["optimized_bom"].equals(sequential["optimized_bom"])
+    assert concurrent["cost_summary"].total_cost == sequential["cost_summary"].total_cost
+
+
+def test_fast_parser_cannot_stream(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bom, suppliers = _write_inputs(tmp_path)
+    config = {"schema": {"fast_parser": True}}
+
+    assert run_analysis(bom, suppliers, config=config)["cost_summary"].total_cost == 2.5 + 4.0
+    with pytest.raises(ConfigError, match="fast_parser"):
+        run_analysis(bom, suppliers, config=config, chunksize=2)
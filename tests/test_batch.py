@@ -0,0 +1,25 @@
+import json
+
+from bomer.batch import discover_boms, run_batch
+
+
+def test_run_batch_writes_index_and_failures(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    boms = tmp_path / "boms"
+    boms.mkdir()
+    (boms / "good.csv").write_text("MPN,Qty\nP1,2\nP2,1\n", encoding="utf-8")
+    (boms / "bad.csv").write_text("", encoding="utf-8")
+    suppliers = tmp_path / "suppliers.json"
+    suppliers.write_text(
+        json.dumps({"suppliers": [{"name": "A", "prices": {"P1": 0.5, "P2": 1.0}}]}),
+        encoding="utf-8",
+    )
+
+    out = tmp_path / "out"
+    batch = run_batch(discover_boms(boms), out, suppliers_path=suppliers, jobs=2)
+
+    status = {record["bom"].rsplit("/", 1)[-1]: record["status"] for record in batch["index"]}
+    assert status == {"bad.csv": "failed", "good.csv": "ok"}
+    assert [f["error_type"] for f in batch["failures"]] == ["BomLoadError"]
+    assert json.loads((out / "good" / "analysis.json").read_text())["cost"]["total_cost"] == 2.0
+    assert json.loads((out / "index.json").read_text()) == batch["index"]
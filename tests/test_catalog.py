@@ -0,0 +1,26 @@
+import math
+
+from bomer.core.catalog import SupplierCatalog
+
+
+def test_catalog_indexes_parts_once():
+    catalog = SupplierCatalog.from_dict(
+        {
+            "currency": "EUR",
+            "suppliers": [
+                {"name": "A", "prices": {"P1": 0.5, "P3": "call"}},
+                {"name": "B", "prices": {"P1": 0.4, "P2": 1.0}},
+                {"name": "C", "prices": {"P1": 0.4}},
+            ],
+        }
+    )
+
+    assert catalog.currency == "EUR"
+    assert list(catalog.parts) == ["P1", "P2", "P3"]
+    assert list(catalog.supplier_count) == [3, 1, 1]
+    assert list(catalog.min_price[:2]) == [0.4, 1.0]
+    assert math.isnan(catalog.min_price[2])
+    # Ties go to the first supplier in file order
+    assert [catalog.supplier_names[i] if i >= 0 else None for i in catalog.best_supplier] == ["B", "B", None]
+    assert catalog.suppliers_for("P1") == ["A", "B", "C"]
+    assert list(catalog.positions(["P2", "nope", "P1"])) == [1, -1, 0]
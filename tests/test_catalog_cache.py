@@ -0,0 +1,90 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from bomer.core.catalog_cache import (
+    cache_settings,
+    compile_catalog,
+    load_cached_catalog,
+    load_catalog_for_config,
+    open_compiled_catalog,
+)
+from bomer.core.config import validate_config
+from bomer.core.exceptions import ConfigError
+
+
+def _write_suppliers(path, price):
+    data = {"suppliers": [{"name": "A", "prices": {"P1": price, "P2": 1.0}}]}
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_compiled_catalog_is_reused_and_invalidated(tmp_path):
+    suppliers = tmp_path / "suppliers.json"
+    cache_dir = tmp_path / "cache"
+    _write_suppliers(suppliers, 0.5)
+
+    assert open_compiled_catalog(suppliers, cache_dir) is None
+
+    catalog = load_cached_catalog(suppliers, cache_dir)
+    assert catalog.parts.dtype.kind == "S"
+    assert list(catalog.positions(["P2", "P3"])) == [1, -1]
+    assert catalog.supplier_prices("P1") == {"A": 0.5}
+
+    # Changing the source must invalidate the cache entry
+    _write_suppliers(suppliers, 0.75)
+    stat = suppliers.stat()
+    os.utime(suppliers, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert open_compiled_catalog(suppliers, cache_dir) is None
+
+    catalog = load_cached_catalog(suppliers, cache_dir)
+    assert catalog.supplier_prices("P1") == {"A": 0.75}
+
+
+@pytest.mark.parametrize("value", ["false", "no", 0])
+def test_cache_flags_must_be_booleans(value):
+    with pytest.raises(ConfigError, match="suppliers.cache must be true or false"):
+        cache_settings({"suppliers": {"cache": value}})
+    with pytest.raises(ConfigError, match="suppliers.cache must be true or false"):
+        validate_config({"suppliers": {"cache": value}})
+    assert cache_settings({"suppliers": {"cache": False}})["enabled"] is False
+
+
+def test_default_cache_dir_is_per_user(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert cache_settings({})["cache_dir"] == tmp_path / "xdg" / "bomer"
+
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    assert cache_settings({})["cache_dir"] == tmp_path / "home" / ".cache" / "bomer"
+    assert cache_settings({"suppliers": {"cache_dir": "shared"}})["cache_dir"] == Path("shared")
+
+    suppliers = tmp_path / "suppliers.json"
+    _write_suppliers(suppliers, 0.5)
+    load_catalog_for_config(suppliers, {})
+    assert (tmp_path / "home" / ".cache" / "bomer" / "catalog").is_dir()
+    assert not (tmp_path / ".bomer_cache").exists()
+
+
+def test_concurrent_compiles_share_one_entry(tmp_path):
+    suppliers = tmp_path / "suppliers.json"
+    cache_dir = tmp_path / "cache"
+    _write_suppliers(suppliers, 0.5)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        entries = list(pool.map(lambda _: compile_catalog(suppliers, cache_dir), range(8)))
+
+    assert len(set(entries)) == 1
+    assert sorted(p.name for p in entries[0].parent.iterdir()) == [entries[0].name]
+    assert open_compiled_catalog(suppliers, cache_dir).supplier_prices("P1") == {"A": 0.5}
+
+    # A new version replaces the old one without touching it in place
+    _write_suppliers(suppliers, 0.75)
+    stat = suppliers.stat()
+    os.utime(suppliers, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    entry = compile_catalog(suppliers, cache_dir)
+    assert entry != entries[0]
+    assert [p.name for p in entry.parent.iterdir()] == [entry.name]
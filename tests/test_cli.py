@@ -0,0 +1,107 @@
+import json
+import pstats
+import subprocess
+import sys
+
+import pytest
+
+from bomer.cli import main
+
+HEAVY_MODULES = ("pandas", "numpy", "yaml")
+
+
+@pytest.mark.parametrize("statement", ["import bomer", "import bomer.cli; bomer.cli._build_parser()"])
+def test_startup_does_not_import_heavy_dependencies(statement):
+    code = f"import sys; {statement}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    loaded = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout.strip()
+    assert loaded == ""
+
+
+def test_argument_errors_are_reported_before_loading_inputs(capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(["analyze", "--bom", "missing.csv", "--skip", "bogus"])
+    assert exc.value.code == 1
+    assert "Unknown artifact(s) bogus" in capsys.readouterr().out
+
+
+def test_profile_writes_pstats_and_trace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "bom.csv").write_text("PartNumber,Quantity\nP1,2\nP2,1\n", encoding="utf-8")
+    (tmp_path / "suppliers.json").write_text(
+        json.dumps({"suppliers": [{"name": "A", "prices": {"P1": 0.5}}]}), encoding="utf-8"
+    )
+
+    main(["analyze", "--bom", "bom.csv", "--suppliers", "suppliers.json", "--output-dir", "out", "--profile"])
+
+    pstats.Stats(str(tmp_path / "out" / "profile.pstats"))
+    trace = json.loads((tmp_path / "out" / "trace.json").read_text(encoding="utf-8"))
+    names = [event["name"] for event in trace["traceEvents"]]
+    assert names[0] == "config" and names[-1] == "write_reports"
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace["traceEvents"])
+
+
+def test_sweep_writes_scenario_table(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "bom.csv").write_text("PartNumber,Quantity\nP1,2\nP1,1\nP2,1\n", encoding="utf-8")
+    (tmp_path / "suppliers.json").write_text(
+        json.dumps(
+            {
+                "suppliers": [
+                    {"name": "A", "prices": {"P1": 0.5, "P2": 2.0}},
+                    {"name": "B", "prices": {"P1": 0.4}},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    main(
+        [
+            "sweep", "--bom", "bom.csv", "--suppliers", "suppliers.json", "--output-dir", "out",
+            "--weights", "0.4,0.3,0.3", "--weights", "1,0,0", "--volumes", "1,10", "--exclude", "B",
+        ]
+    )
+
+    lines = (tmp_path / "out" / "sweep.csv").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1 + 2 * 2 * 2
+    header = lines[0].split(",")
+    rows = [dict(zip(header, line.split(","))) for line in lines[1:]]
+    # P1 aggregated to 3 pieces: 3 x 0.4 from B, 3 x 0.5 once B is excluded; P2 2.0
+    assert {(r["excluded_suppliers"], float(r["unit_cost"])) for r in rows} == {("", 3.2), ("B", 3.5)}
+    # weights (1, 0, 0): single-source ratio 1/2 with both suppliers, 2/2 without B
+    single = [r for r in rows if r["single_source_weight"] == "1.0"]
+    assert {(r["excluded_suppliers"], float(r["risk_score"])) for r in single} == {("", 50.0), ("B", 100.0)}
+
+
+def test_simulate_writes_simulation_json(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "bom.csv").write_text("PartNumber,Quantity\nP1,2\nP2,1\n", encoding="utf-8")
+    (tmp_path / "suppliers.json").write_text(
+        json.dumps({"suppliers": [{"name": "A", "prices": {"P1": 0.5}}]}), encoding="utf-8"
+    )
+    argv = ["analyze", "--bom", "bom.csv", "--suppliers", "suppliers.json", "--output-dir", "out"]
+
+    main(argv + ["--simulate", "--trials", "500", "--seed", "1", "--budget", "0.9"])
+    document = json.loads((tmp_path / "out" / "simulation.json").read_text(encoding="utf-8"))
+
+    assert document["trials"] == 500 and document["seed"] == 1
+    assert document["baseline_cost"] == 1.0
+    assert document["unpriced"] == ["P2"]
+    assert [part["PartNumber"] for part in document["parts_at_risk"]] == ["P1"]
+    assert 0 < document["unavailable_probability"] < 0.2
+    assert 0 < document["over_budget_probability"] < 1
+
+
+def test_profile_is_written_when_a_stage_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "suppliers.json").write_text(json.dumps({"suppliers": []}), encoding="utf-8")
+
+    argv = ["analyze", "--bom", "missing.csv", "--suppliers", "suppliers.json", "--output-dir", "out"]
+    with pytest.raises(SystemExit):
+        main(argv + ["--profile"])
+
+    trace = json.loads((tmp_path / "out" / "trace.json").read_text(encoding="utf-8"))
+    last = trace["traceEvents"][-1]
+    assert last["name"] == "load" and last["args"]["error"] == "BomLoadError"
@@ -1,6 +1,6 @@
 import pandas as pd
 
-from bomer.engines.cost import analyze_costs
+from bomer.engines.cost import analyze_costs, cost_curve
 
 
 def test_analyze_costs_basic():
@@ -28,3 +28,70 @@ def test_analyze_costs_basic():
     assert cost_summary.currency == "USD"
     # P2 should not be missing
     assert "P2" not in cost_summary.missing_prices
+
+
+def test_analyze_costs_line_table_matches_line_items():
+    bom = pd.DataFrame(
+        {
+            "PartNumber": [" P1 ", "P3", "P2"],
+            "Quantity": [2, 1, "bad"],
+        }
+    )
+
+    suppliers_data = {
+        "suppliers": [
+            {"name": "A", "prices": {"P1": 0.5, "P2": "n/a"}},
+            {"name": "B", "prices": {"P1": 0.25, "P2": 2.0}},
+        ],
+    }
+
+    cost_summary = analyze_costs(bom, suppliers_data)
+
+    table = cost_summary.line_table
+    assert list(table.columns) == [
+        "PartNumber",
+        "Quantity",
+        "UnitPrice",
+        "LineCost",
+        "MatchedPart",
+        "MatchType",
+    ]
+    assert list(table["PartNumber"]) == ["P1", "P2"]
+    assert list(table["LineCost"]) == [0.5, 0.0]
+    assert [item.PartNumber for item in cost_summary.line_items] == ["P1", "P2"]
+    assert cost_summary.missing_prices == ["P3"]
+    assert cost_summary.total_cost == 0.5
+
+
+def test_price_breaks_follow_build_volume():
+    bom = pd.DataFrame({"PartNumber": ["P1", "P2"], "Quantity": [2, 1]})
+    suppliers_data = {
+        "suppliers": [
+            {"name": "A", "prices": {"P1": [[1, 1.0], [100, 0.8], [1000, 0.5]], "P2": 2.0}},
+            {"name": "B", "prices": {"P1": [{"min_qty": 1, "price": 0.9}]}},
+        ],
+    }
+
+    # 2 x 60 = 120 units of P1: A's 100+ tier (0.8) beats B's flat 0.9
+    cost_summary = analyze_costs(bom, suppliers_data, config={"cost": {"default_volume": 60}})
+    assert cost_summary.volume == 60.0
+    assert list(cost_summary.line_table["UnitPrice"]) == [0.8, 2.0]
+    assert cost_summary.total_cost == 3.6
+
+    curve = cost_curve(bom, suppliers_data, [1, 60, 500])
+    assert list(curve["unit_cost"]) == [3.8, 3.6, 3.0]
+    assert list(curve["total_cost"]) == [3.8, 216.0, 1500.0]
+
+
+def test_empty_bom_costs_nothing():
+    bom = pd.DataFrame({"PartNumber": pd.Series([], dtype=object), "Quantity": pd.Series([], dtype=float)})
+    suppliers_data = {"suppliers": [{"name": "A", "prices": {"P1": 0.5}}]}
+
+    summary = analyze_costs(bom, suppliers_data)
+    assert summary.total_cost == 0.0
+    assert summary.missing_prices == []
+    assert len(summary.line_items) == 0
+
+    curve = cost_curve(bom, suppliers_data, [1, 100])
+    assert list(curve["unit_cost"]) == [0.0, 0.0]
+    assert list(curve["missing_prices"]) == [0, 0]
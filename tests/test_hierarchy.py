@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from bomer.core.catalog import SupplierCatalog
+from bomer.core.exceptions import BomStructureError
+from bomer.engines.hierarchy import analyze_hierarchy, build_tree, explode_bom
+
+
+def _nested_bom():
+    # Sub is shared by ModA and ModB; R1 appears on three levels
+    return pd.DataFrame(
+        {
+            "PartNumber": ["Board", "ModA", "ModB", "R1", "R1", "C1", "Sub", "Sub", "R1"],
+            "Quantity": [2, 1, 2, 3, 1, 2, 2, 1, 4],
+            "Parent": [None, "Board", "Board", "ModA", "ModB", "ModB", "ModA", "ModB", "Sub"],
+        }
+    )
+
+
+def test_explode_multiplies_quantities_down_the_tree():
+    tree = build_tree(_nested_bom())
+    exploded = explode_bom(tree)
+
+    assert list(exploded["PartNumber"]) == ["C1", "R1"]
+    # R1 per Board: ModA (3 + 2 x 4) + 2 x ModB (1 + 4) = 21, two Boards
+    assert list(exploded["Quantity"]) == [8.0, 42.0]
+    assert tree.depth == 4
+
+
+def test_rollup_per_assembly_and_level():
+    tree = build_tree(_nested_bom())
+    catalog = SupplierCatalog.from_dict(
+        {"suppliers": [{"name": "A", "prices": {"R1": 0.1, "C1": 1.0}}]}
+    )
+    summary = analyze_hierarchy(tree, explode_bom(tree), catalog, {})
+
+    table = summary.assemblies.set_index("PartNumber")
+    assert summary.assembly_count == 4
+    assert table.loc["Board", "UnitCost"] == 6.1
+    assert table.loc["Sub", "Multiplicity"] == 8.0
+    assert table.loc["ModB", "ExtendedCost"] == 10.0
+    assert table.loc["Board", "RiskScore"] == 40.0
+    assert list(summary.levels["Assemblies"]) == [1, 2, 1, 0]
+
+
+def test_cycle_is_reported():
+    bom = pd.DataFrame(
+        {
+            "PartNumber": ["A", "B", "C", "B"],
+            "Quantity": [1, 1, 1, 1],
+            "Parent": [None, "A", "B", "C"],
+        }
+    )
+    with pytest.raises(BomStructureError, match="C -> B -> C"):
+        build_tree(bom)
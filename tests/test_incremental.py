@@ -0,0 +1,76 @@
+import json
+
+from bomer.api import run_analysis
+from bomer.incremental import run_incremental_analysis
+
+
+def _write_suppliers(tmp_path):
+    suppliers = tmp_path / "suppliers.json"
+    suppliers.write_text(
+        json.dumps(
+            {
+                "suppliers": [
+                    {"name": "A", "prices": {"P1": 0.5, "P2": 1.0, "P4": 2.0}},
+                    {"name": "B", "prices": {"P1": 0.4}},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    return suppliers
+
+
+def test_incremental_matches_full_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    suppliers = _write_suppliers(tmp_path)
+    state = tmp_path / "state"
+    bom = tmp_path / "bom.csv"
+
+    bom.write_text("MPN,Qty\nP1,2\nP2,1\nP3,1\nP1,3\n", encoding="utf-8")
+    first = run_incremental_analysis(bom, state, suppliers)
+    assert first["delta"]["full_recompute"] is True
+    assert first["delta"]["cost_change"] is None
+
+    # P2 changes quantity, P3 is dropped, P4 is new, P1 is untouched
+    bom.write_text("MPN,Qty\nP1,3\nP2,5\nP4,1\nP1,2\n", encoding="utf-8")
+    second = run_incremental_analysis(bom, state, suppliers)
+    full = run_analysis(bom, suppliers)
+
+    delta = second["delta"]
+    assert delta["full_recompute"] is False
+    assert delta["parts_added"] == ["P4"]
+    assert delta["parts_removed"] == ["P3"]
+    assert delta["parts_changed"] == ["P2"]
+    assert delta["recomputed_parts"] == 3
+    assert delta["cost_change"] == round(full["cost_summary"].total_cost - first["cost_summary"].total_cost, 4)
+
+    assert second["optimized_bom"].equals(full["optimized_bom"])
+    assert second["cost_summary"].total_cost == full["cost_summary"].total_cost
+    assert second["risk_summary"].risk_score == full["risk_summary"].risk_score
+    assert second["risk_summary"].lines == full["risk_summary"].lines
+    assert second["cost_summary"].line_items == full["cost_summary"].line_items
+
+    third = run_incremental_analysis(bom, state, suppliers)
+    assert third["delta"]["recomputed_parts"] == 0
+    assert third["catalog"] is None
+    assert third["cost_summary"].total_cost == full["cost_summary"].total_cost
+
+
+def test_supplier_change_reports_risk_flags(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    suppliers = _write_suppliers(tmp_path)
+    state = tmp_path / "state"
+    bom = tmp_path / "bom.csv"
+    bom.write_text("MPN,Qty\nP1,2\nP2,1\n", encoding="utf-8")
+    run_incremental_analysis(bom, state, suppliers)
+
+    suppliers.write_text(
+        json.dumps({"suppliers": [{"name": "A", "prices": {"P1": 0.5}}]}),
+        encoding="utf-8",
+    )
+    delta = run_incremental_analysis(bom, state, suppliers)["delta"]
+
+    assert delta["full_recompute"] is True
+    assert delta["parts_changed"] == []
+    assert {"PartNumber": "P1", "flag": "single_source", "old": False, "new": True} in delta["risk_flag_changes"]
+    assert {"PartNumber": "P2", "flag": "missing_price", "old": False, "new": True} in delta["risk_flag_changes"]
@@ -0,0 +1,106 @@
+import bz2
+import gzip
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bomer.core.exceptions import BomLoadError, SupplierLoadError
+from bomer.core.jsonstream import JsonStreamReader
+from bomer.core.loader import iter_bom_chunks, load_bom, load_suppliers, stream_suppliers
+
+SUPPLIERS = {
+    "suppliers": [
+        {"prices": {"P1": 0.5, "P\"2": "n/a", "P3": 12.25e-1}, "name": "A"},
+        {"name": "B", "notes": {"x": [1, "}"]}, "prices": {"P1": 0.4, "P3": 1}},
+    ],
+    "currency": "EUR",
+}
+
+
+def test_stream_reader_handles_tiny_chunks():
+    reader = JsonStreamReader(io.StringIO(json.dumps(SUPPLIERS["suppliers"][0])), chunk_size=3)
+
+    found = {}
+    for key in reader.iter_object():
+        if key == "prices":
+            found.update(reader.iter_items())
+        else:
+            found[key] = reader.value()
+
+    assert found == {"P1": 0.5, 'P"2': "n/a", "P3": 1.225, "name": "A"}
+
+
+def test_stream_suppliers_matches_full_load(tmp_path):
+    path = tmp_path / "suppliers.json"
+    path.write_text(json.dumps(SUPPLIERS, indent=2), encoding="utf-8")
+
+    full = load_suppliers(path)
+    streamed = stream_suppliers(path)
+
+    assert streamed.currency == "EUR"
+    assert streamed.supplier_names == ["A", "B"]
+    assert list(streamed.parts) == list(full.parts)
+    assert np.array_equal(streamed.min_price, full.min_price, equal_nan=True)
+    assert list(streamed.supplier_count) == list(full.supplier_count)
+
+    filtered = stream_suppliers(path, parts=["P3"])
+    assert list(filtered.parts) == ["P3"]
+    assert filtered.supplier_prices("P3") == {"A": 1.225, "B": 1.0}
+
+
+def test_compressed_and_json_lines_suppliers(tmp_path):
+    reference = tmp_path / "suppliers.json"
+    reference.write_text(json.dumps(SUPPLIERS), encoding="utf-8")
+    lines = [json.dumps({"currency": "EUR"})] + [json.dumps(s) for s in SUPPLIERS["suppliers"]]
+    jsonl = tmp_path / "suppliers.jsonl.gz"
+    with gzip.open(jsonl, "wt", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n\n")
+    # gzip detected from the magic bytes, not the name
+    disguised = tmp_path / "feed.json"
+    disguised.write_bytes(gzip.compress(reference.read_bytes()))
+
+    full = load_suppliers(reference)
+    for path in (jsonl, disguised):
+        for catalog in (load_suppliers(path), stream_suppliers(path)):
+            assert catalog.currency == "EUR"
+            assert catalog.supplier_names == ["A", "B"]
+            assert list(catalog.parts) == list(full.parts)
+            assert np.array_equal(catalog.min_price, full.min_price, equal_nan=True)
+
+    (tmp_path / "suppliers.xlsx").write_bytes(b"PK\x03\x04")
+    with pytest.raises(SupplierLoadError, match="Unsupported suppliers format"):
+        load_suppliers(tmp_path / "suppliers.xlsx")
+
+
+def test_compressed_tsv_bom_matches_csv(tmp_path):
+    csv_path = tmp_path / "bom.csv"
+    csv_path.write_text("MPN,Qty\nP1,2\nP2,\n", encoding="utf-8")
+    tsv_path = tmp_path / "bom.tsv.bz2"
+    tsv_path.write_bytes(bz2.compress(b"MPN\tQty\nP1\t2\nP2\t\n"))
+
+    expected = load_bom(csv_path)
+    assert load_bom(tsv_path).equals(expected)
+    assert pd.concat(iter_bom_chunks(tsv_path, 1)).equals(expected)
+    (tmp_path / "bom.bin").write_bytes(b"\x00\x01\x02")
+    with pytest.raises(BomLoadError, match="Unsupported BOM format"):
+        load_bom(tmp_path / "bom.bin")
+
+
+def test_chunked_bom_matches_in_memory_load(tmp_path):
+    # Types the pyarrow parser infers differently (dates), blank and
+    # leading-zero cells, and a column that is int in one chunk only
+    path = tmp_path / "bom.csv"
+    path.write_text(
+        "MPN,Qty,LastBuy,Note,Code\n"
+        "P1,2,2024-01-05, ,007\n"
+        "P2,,2024-02-01,x,010\n"
+        "P3,1.5,,,5\n",
+        encoding="utf-8",
+    )
+
+    full = load_bom(path)
+    for chunksize in (1, 2, 10):
+        assert pd.concat(iter_bom_chunks(path, chunksize)).equals(full)
@@ -0,0 +1,83 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bomer.core.catalog import SupplierCatalog
+from bomer.core.catalog_cache import load_cached_catalog
+from bomer.core.config import validate_config
+from bomer.core.exceptions import ConfigError
+from bomer.core.partnumbers import canonicalize
+from bomer.engines.cost import analyze_costs
+
+SUPPLIERS = {
+    "suppliers": [
+        {"name": "A", "prices": {"RC0603FR-0710KL": 0.01, "LM358DR": 0.2, "GRM188R71H104KA93D": 0.02}},
+        {"name": "B", "prices": {"LM358DR": 0.25}},
+    ],
+}
+
+
+def test_canonicalize_strips_case_separators_and_packaging():
+    keys = canonicalize([" rc0603fr-0710kl ", "LM358DR-TR", "ATMEGA328P-AU/CT", None])
+    assert list(keys) == [b"RC0603FR0710KL", b"LM358DR", b"ATMEGA328PAU", b""]
+
+
+def test_match_records_how_each_part_was_found():
+    catalog = SupplierCatalog.from_dict(SUPPLIERS)
+    parts = ["LM358DR", "rc0603fr0710kl", "LM358DR#PBF", "GRM188R71H104KA93DTR", "XYZ"]
+
+    positions, how = catalog.match(parts, "exact")
+    assert list(how) == ["exact", "none", "none", "none", "none"]
+
+    positions, how = catalog.match(parts, "normalized")
+    assert list(how) == ["exact", "normalized", "normalized", "none", "none"]
+    assert list(catalog.part_names(positions)[:3]) == ["LM358DR", "RC0603FR-0710KL", "LM358DR"]
+
+    positions, how = catalog.match(parts, "fuzzy")
+    assert list(how) == ["exact", "normalized", "normalized", "fuzzy", "none"]
+    assert catalog.part_names(positions)[3] == "GRM188R71H104KA93D"
+
+
+def test_fuzzy_match_only_accepts_packaging_tails():
+    catalog = SupplierCatalog.from_dict(SUPPLIERS)
+    parts = [
+        "RC0603FR-07100KL",  # 100K, not the 10K in the catalog
+        "RC0603FR-071KL",
+        "GRM188R71H104KA93",  # missing a real character, not packaging
+        "GRM188R71H104KA93DREEL7",
+        "LM358DRTRPBF",
+        "LM358",
+    ]
+
+    positions, how = catalog.match(parts, "fuzzy")
+
+    assert list(how) == ["none", "none", "none", "fuzzy", "fuzzy", "none"]
+    assert list(catalog.part_names(positions[3:5])) == ["GRM188R71H104KA93D", "LM358DR"]
+
+
+def test_cost_lines_follow_matching_mode(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bom = pd.DataFrame({"PartNumber": ["lm358dr", "RC0603FR-0710KL"], "Quantity": [2, 10]})
+
+    exact = analyze_costs(bom, SUPPLIERS)
+    assert exact.missing_prices == ["lm358dr"]
+
+    summary = analyze_costs(bom, SUPPLIERS, config={"matching": {"mode": "normalized"}})
+    assert summary.missing_prices == []
+    assert summary.total_cost == 0.5
+    assert [item.MatchType for item in summary.line_items] == ["normalized", "exact"]
+    assert summary.line_items[0].MatchedPart == "LM358DR"
+
+    # The compiled cache stores the normalized index alongside the catalog
+    path = tmp_path / "suppliers.json"
+    path.write_text(json.dumps(SUPPLIERS), encoding="utf-8")
+    cached = load_cached_catalog(path, tmp_path / ".bomer_cache")
+    assert cached.norm_keys is not None
+    positions, how = cached.match(["lm358dr"], "normalized")
+    assert list(how) == ["normalized"]
+    assert np.asarray(cached.part_names(positions)).tolist() == ["LM358DR"]
+
+    with pytest.raises(ConfigError):
+        validate_config({"matching": {"mode": "sloppy"}})
@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bomer.engines.cost import analyze_costs
+from bomer.engines.risk import analyze_risk
+from bomer.reporting import json_writer
+from bomer.reporting.report_writer import build_analysis_dict, write_analysis_json
+
+
+@pytest.mark.parametrize("stdlib", [False, True])
+@pytest.mark.parametrize("compact", [False, True])
+def test_streamed_analysis_json_matches_dict(tmp_path, monkeypatch, stdlib, compact):
+    if stdlib:
+        monkeypatch.setattr(json_writer, "orjson", None)
+        monkeypatch.setattr(json_writer, "dumps", json_writer._make_dumps())
+    monkeypatch.setattr(json_writer, "RECORD_BATCH", 2)
+
+    bom = pd.DataFrame({"PartNumber": ["P1", "P2", "P3", "Ω-1"], "Quantity": [1, 2, np.int64(3), 4]})
+    suppliers = {"suppliers": [{"name": "A", "prices": {"P1": 0.5, "P2": 1.25, "Ω-1": 2}}]}
+    cost = analyze_costs(bom, suppliers)
+    risk = analyze_risk(bom, suppliers)
+
+    path = tmp_path / "analysis.json"
+    write_analysis_json(bom, cost, risk, "bom.csv", "suppliers.json", path, compact=compact)
+
+    text = path.read_text(encoding="utf-8")
+    assert json.loads(text) == build_analysis_dict(bom, cost, risk, "bom.csv", "suppliers.json")
+    assert (text.count("\n") == 1) == compact
+
+
+@pytest.mark.parametrize("stdlib", [False, True])
+def test_non_finite_numbers_are_written_as_null(tmp_path, monkeypatch, stdlib):
+    if stdlib:
+        monkeypatch.setattr(json_writer, "orjson", None)
+        monkeypatch.setattr(json_writer, "dumps", json_writer._make_dumps())
+    elif json_writer.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    document = {
+        "total": float("nan"),
+        "scores": {"max": np.float32("inf"), "values": np.array([1.5, np.nan, -np.inf])},
+        "lines": pd.DataFrame({"PartNumber": ["P1", "P2"], "UnitPrice": [np.nan, np.inf]}),
+    }
+    path = tmp_path / "doc.json"
+    json_writer.write_json_document(document, path)
+
+    def reject(constant):
+        raise ValueError(f"invalid JSON constant {constant}")
+
+    assert json.loads(path.read_text(encoding="utf-8"), parse_constant=reject) == {
+        "total": None,
+        "scores": {"max": None, "values": [1.5, None, None]},
+        "lines": [{"PartNumber": "P1", "UnitPrice": None}, {"PartNumber": "P2", "UnitPrice": None}],
+    }
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from bomer.core.catalog import SupplierCatalog
+from bomer.engines.models import RiskLine, RiskLines
 from bomer.engines.risk import analyze_risk
 
 
@@ -29,3 +31,43 @@ def test_analyze_risk_basic():
     assert any(line.missing_price for line in risk_summary.lines)
     # P2 is obsolete
     assert any(line.obsolete and line.PartNumber == "P2" for line in risk_summary.lines)
+
+
+def test_analyze_risk_with_catalog():
+    suppliers_data = {
+        "suppliers": [
+            {"name": "A", "prices": {"P1": 0.5}},
+            {"name": "B", "prices": {"P1": 0.4, "P2": 1.0}},
+        ]
+    }
+
+    catalog = SupplierCatalog.from_dict(suppliers_data)
+
+    bom = pd.DataFrame({"PartNumber": ["P1", "P2", "P3"]})
+    risk_summary = analyze_risk(bom, catalog)
+
+    assert list(risk_summary.line_table["supplier_count"]) == [2, 1, 0]
+    assert risk_summary.single_source_ratio == 1 / 3
+    assert risk_summary.missing_price_ratio == 1 / 3
+
+
+def test_risk_lines_are_columnar_with_row_views():
+    bom = pd.DataFrame({"PartNumber": ["P1", "P2", "P3"], "Quantity": [1, 1, 1]})
+    suppliers_data = {
+        "suppliers": [
+            {"name": "A", "prices": {"P1": 1.0, "P2": 2.0}},
+            {"name": "B", "prices": {"P1": 1.5}},
+        ],
+    }
+
+    lines = analyze_risk(bom, suppliers_data).lines
+    assert isinstance(lines, RiskLines)
+    assert lines[0] == RiskLine("P1", 2, False, False, False)
+    assert type(lines[-1].missing_price) is bool
+
+    single = lines.where("single_source")
+    assert [line.PartNumber for line in single] == ["P2"]
+    assert single.frame.equals(lines.frame[lines.frame["single_source"]])
+    assert lines[1:] == [RiskLine("P2", 1, True, False, False), RiskLine("P3", 0, False, True, False)]
+    assert list(lines.column("supplier_count")) == [2, 1, 0]
+    assert RiskLines.from_rows(list(lines)) == lines
@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+from bomer.core.exceptions import BomLoadError, ConfigError
+from bomer.core.scheduler import Stage, StageScheduler
+from bomer.instrumentation import StageRecorder, add_stage_hook
+
+
+def _slow(value):
+    time.sleep(0.2)
+    return value
+
+
+def _fail():
+    raise BomLoadError("broken BOM")
+
+
+def test_independent_stages_overlap():
+    stages = [
+        Stage("a", lambda: _slow(1)),
+        Stage("b", lambda: _slow(2)),
+        Stage("sum", lambda a, b: a + b, inputs=("a", "b")),
+    ]
+    started = time.perf_counter()
+    values = StageScheduler(jobs=2).run(stages)
+    assert values["sum"] == 3
+    assert time.perf_counter() - started < 0.35
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_stage_errors_propagate(jobs):
+    ran = []
+    stages = [
+        Stage("load", _fail),
+        Stage("other", lambda: ran.append("other")),
+        Stage("after", lambda bom: ran.append("after"), inputs=("load",)),
+    ]
+    recorder = StageRecorder()
+    events = []
+    remove = add_stage_hook(lambda event, record: events.append((event, record.name)))
+    try:
+        with pytest.raises(BomLoadError, match="broken BOM"):
+            StageScheduler(jobs=jobs, recorder=recorder).run(stages)
+    finally:
+        remove()
+    assert "after" not in ran
+
+    # The failed stage is recorded and its "end" emitted
+    failed = [record for record in recorder.records if record.name == "load"]
+    assert len(failed) == 1 and failed[0].error == "BomLoadError"
+    assert ("end", "load") in events
+    assert sorted(name for event, name in events if event == "start") == sorted(
+        name for event, name in events if event == "end"
+    )
+
+
+def test_unknown_inputs_are_rejected():
+    with pytest.raises(ConfigError, match="needs missing"):
+        StageScheduler().run([Stage("a", lambda x: x, inputs=("missing",))])
+
+
+def test_trace_puts_overlapping_stages_on_their_own_threads():
+    barrier = threading.Barrier(2, timeout=5)
+    stages = [Stage("a", barrier.wait), Stage("b", barrier.wait)]
+    recorder = StageRecorder()
+    StageScheduler(jobs=2, recorder=recorder).run(stages)
+
+    events = recorder.chrome_trace()["traceEvents"]
+    assert {event["name"] for event in events} == {"a", "b"}
+    assert events[0]["tid"] != events[1]["tid"]
+    assert "thread_id" not in recorder.to_list()[0]
@@ -1,6 +1,7 @@
 import pandas as pd
 
-from bomer.core.schema import normalize_bom_columns, validate_bom
+from bomer.core.loader import load_bom
+from bomer.core.schema import bom_columns, normalize_bom_columns, validate_bom
 
 
 def test_normalize_bom_columns_aliases():
@@ -29,3 +30,61 @@ def test_validate_bom_detects_missing_quantity():
 
     issues = validate_bom(df)
     assert any(issue["field"] == "Quantity" for issue in issues)
+
+
+def test_validate_bom_groups_issues_by_rule():
+    df = pd.DataFrame(
+        {
+            "PartNumber": ["R1", "", "R1", "C1"],
+            "Quantity": [1, "x", -2, 3],
+            "Manufacturer": ["Yageo", "TI", "Vishay", "Murata"],
+            "Designator": ["R1, R2", "U1", "R2", "C1"],
+        }
+    )
+
+    issues = {issue["rule"]: issue for issue in validate_bom(df)}
+
+    assert list(issues["empty_part_number"]["row_indices"]) == [1]
+    assert list(issues["quantity_not_numeric"]["row_indices"]) == [1]
+    assert list(issues["quantity_not_positive"]["row_indices"]) == [2]
+    assert list(issues["duplicate_designator"]["row_indices"]) == [0, 2]
+    assert list(issues["conflicting_manufacturer"]["row_indices"]) == [0, 2]
+    assert issues["quantity_not_numeric"]["sample"] == ["x"]
+
+
+def test_normalize_compacts_columns():
+    df = pd.DataFrame(
+        {
+            "MPN": [" R1", "R1", "C1", "R1 ", "R1", "C1", "R1", "R1"],
+            "Qty": [1, 2, 3, 4, 5, 6, 7, 8],
+            "Mfr": ["Yageo", " Yageo", "Murata", "Yageo"] * 2,
+            "Lifecycle": ["Active", "Active", None, "Active"] * 2,
+        }
+    )
+
+    norm = normalize_bom_columns(df)
+    loose = normalize_bom_columns(df, config={"schema": {"compact": False}})
+
+    assert list(norm["PartNumber"]) == ["R1", "R1", "C1", "R1", "R1", "C1", "R1", "R1"]
+    if getattr(norm["PartNumber"].dtype, "storage", "python") == "python":
+        # Arrow-backed strings (pyarrow installed) have no objects to share
+        assert norm["PartNumber"].iloc[0] is norm["PartNumber"].iloc[3]
+    assert norm["Quantity"].dtype == "int8"
+    assert isinstance(norm["Manufacturer"].dtype, pd.CategoricalDtype)
+    assert list(norm["Manufacturer"].cat.categories) == ["Yageo", "Murata"]
+    assert norm["LifecycleStatus"].isna().tolist() == [False, False, True, False] * 2
+    assert loose["PartNumber"].iloc[0] == " R1"
+    assert loose["Quantity"].dtype == "int64"
+
+
+def test_prune_loads_only_analysis_columns(tmp_path):
+    path = tmp_path / "bom.csv"
+    path.write_text("MPN,Qty,Notes,Mfr\nR1,2,keep dry,Yageo\n", encoding="utf-8")
+    config = {"schema": {"prune": True}}
+
+    bom = load_bom(path, columns=bom_columns(config))
+    norm = normalize_bom_columns(bom, config=config)
+
+    assert list(bom.columns) == ["MPN", "Qty", "Mfr"]
+    assert "Notes" not in norm.columns
+    assert bom_columns({}) is None
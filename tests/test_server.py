@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from bomer.server import BomerServer, WarmState
+
+
+def _post(url, payload):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_server_analyzes_and_reloads_suppliers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    suppliers = tmp_path / "suppliers.json"
+    suppliers.write_text(json.dumps({"suppliers": [{"name": "A", "prices": {"P1": 0.5}}]}))
+
+    state = WarmState(config_path=tmp_path / "bomer.yaml", suppliers_path=suppliers)
+    server = BomerServer(("127.0.0.1", 0), state)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        analysis = _post(url + "/analyze", {"bom_csv": "MPN,Qty\nP1,4\n"})
+        assert analysis["cost"]["total_cost"] == 2.0
+        assert analysis["metadata"]["part_count"] == 1
+
+        suppliers.write_text(json.dumps({"suppliers": [{"name": "A", "prices": {"P1": 0.25}}]}))
+        stat = suppliers.stat()
+        os.utime(suppliers, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        analysis = _post(url + "/analyze", {"bom_csv": "MPN,Qty\nP1,4\n"})
+        assert analysis["cost"]["total_cost"] == 1.0
+        assert state.reloads == 2
+
+        with urllib.request.urlopen(url + "/stats") as response:
+            stats = json.loads(response.read())
+        assert stats["requests"] == 2
+        assert set(stats["latency_ms"]) == {"p50", "p90", "p99", "max"}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_server_rejects_bad_chunksize(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    suppliers = tmp_path / "suppliers.json"
+    suppliers.write_text(json.dumps({"suppliers": [{"name": "A", "prices": {"P1": 0.5}}]}))
+
+    state = WarmState(config_path=tmp_path / "bomer.yaml", suppliers_path=suppliers)
+    server = BomerServer(("127.0.0.1", 0), state)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/analyze"
+
+    try:
+        for chunksize in ["10", -1, 0, 2.5, True]:
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                _post(url, {"bom_csv": "MPN,Qty\nP1,4\n", "chunksize": chunksize})
+            assert excinfo.value.code == 400
+            assert "chunksize" in json.loads(excinfo.value.read())["error"]
+
+        analysis = _post(url, {"bom_csv": "MPN,Qty\nP1,4\n", "chunksize": 1})
+        assert analysis["cost"]["total_cost"] == 2.0
+    finally:
+        server.shutdown()
+        server.server_close()
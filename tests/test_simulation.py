@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bomer.core.config import validate_config
+from bomer.core.exceptions import ConfigError
+from bomer.engines.cost import analyze_costs
+from bomer.engines.simulation import simulate_supply_risk
+
+SUPPLIERS = {
+    "currency": "EUR",
+    "suppliers": [
+        {"name": "A", "prices": {"P1": 0.5, "P2": [[1, 2.0], [10, 1.5]], "P3": 3.0}},
+        {"name": "B", "prices": {"P1": 0.4, "P3": 2.5}},
+        {"name": "C", "prices": {"P2": 1.8, "P3": "n/a"}},
+    ],
+}
+BOM = pd.DataFrame({"PartNumber": ["P1", "P2", "P3", "P9"], "Quantity": [4, 6, 1, 2]})
+
+
+def _reference_costs(config, trials, seed):
+    """
+    Per-trial loop over lines: cheapest available supplier at quoted
+    prices, paying its moved price. Draws as documented.
+    """
+    names = [s["name"] for s in SUPPLIERS["suppliers"]]
+    rng = np.random.default_rng(seed)
+    dropout = np.array([config["simulation"]["supplier_dropout"].get(n, 0.0) for n in names])
+    available = rng.random((trials, len(names))) >= dropout
+    factor = np.exp(config["simulation"]["price_volatility"] * rng.standard_normal((trials, len(names))))
+
+    quoted = {}
+    for name in names:
+        single = {"suppliers": [s for s in SUPPLIERS["suppliers"] if s["name"] == name]}
+        lines = analyze_costs(BOM, single, config=config).line_table
+        quoted[name] = dict(zip(lines["PartNumber"], lines["LineCost"]))
+
+    costs, blocked = np.zeros(trials), np.zeros(trials, dtype=bool)
+    for t in range(trials):
+        for part in BOM["PartNumber"]:
+            offers = sorted((quoted[n][part], i) for i, n in enumerate(names) if part in quoted[n])
+            if not offers:
+                continue
+            open_offers = [(cost, i) for cost, i in offers if available[t, i]]
+            if open_offers:
+                cost, i = open_offers[0]
+                costs[t] += cost * factor[t, i]
+            else:
+                blocked[t] = True
+    costs[blocked] = np.nan
+    return costs, blocked
+
+
+def test_simulation_matches_per_trial_reference():
+    config = {
+        "cost": {"default_volume": 2},
+        "simulation": {
+            "supplier_dropout": {"default": 0.0, "A": 0.3, "B": 0.5, "C": 0.2},
+            "price_volatility": 0.2,
+        },
+    }
+    summary = simulate_supply_risk(BOM, SUPPLIERS, config=config, trials=400, seed=11, budget=6.0)
+    costs, blocked = _reference_costs(config, 400, 11)
+
+    np.testing.assert_allclose(summary.trial_costs, costs, rtol=1e-12)
+    assert summary.unavailable_probability == blocked.mean() > 0
+    # Blocked trials always miss the budget and are left out of the costs
+    assert summary.over_budget_probability == (blocked | (costs > 6.0)).mean()
+    assert summary.mean_cost == pytest.approx(costs[~blocked].mean(), abs=1e-4)
+    assert summary.cost_percentiles["p50"] == pytest.approx(np.percentile(costs[~blocked], 50), abs=1e-4)
+    assert summary.unpriced == ["P9"]
+    assert summary.currency == "EUR"
+    assert list(summary.line_table["PartNumber"]) == ["P1", "P2", "P3"]
+    # P1 needs A or B, P2 needs A or C, P3 needs A or B (C has no numeric price)
+    assert list(summary.line_table["supplier_count"]) == [2, 2, 2]
+
+
+def test_simulation_without_dropout_or_volatility_is_the_cost_analysis():
+    config = {"simulation": {"supplier_dropout": 0.0, "price_volatility": 0.0}}
+    summary = simulate_supply_risk(BOM, SUPPLIERS, config=config, trials=50)
+    total = analyze_costs(BOM, SUPPLIERS, config=config).total_cost
+
+    assert summary.baseline_cost == total
+    assert set(summary.cost_percentiles.values()) == {total}
+    assert summary.unavailable_probability == 0.0
+    assert summary.over_budget_probability is None
+
+
+def test_simulation_is_reproducible_per_seed():
+    config = {"simulation": {"supplier_dropout": 0.2, "trials": 1000}}
+    first = simulate_supply_risk(BOM, SUPPLIERS, config=config, seed=3)
+    again = simulate_supply_risk(BOM, SUPPLIERS, config=config, seed=3)
+    other = simulate_supply_risk(BOM, SUPPLIERS, config=config, seed=4)
+
+    assert np.array_equal(first.trial_costs, again.trial_costs, equal_nan=True)
+    assert first.cost_percentiles == again.cost_percentiles
+    assert not np.array_equal(first.trial_costs, other.trial_costs, equal_nan=True)
+
+
+def test_simulation_settings_are_validated():
+    with pytest.raises(ConfigError, match="supplier_dropout"):
+        validate_config({"simulation": {"supplier_dropout": 1.5}})
+    with pytest.raises(ConfigError, match="trials"):
+        validate_config({"simulation": {"trials": 0}})
+    with pytest.raises(ConfigError, match="unknown supplier"):
+        simulate_supply_risk(BOM, SUPPLIERS, config={"simulation": {"supplier_dropout": {"Z": 0.1}}})
+
+
+def test_simulation_where_every_trial_is_blocked():
+    config = {"simulation": {"supplier_dropout": 1.0}}
+    summary = simulate_supply_risk(BOM, SUPPLIERS, config=config, trials=20, budget=100.0)
+
+    assert summary.unavailable_probability == 1.0
+    assert summary.over_budget_probability == 1.0
+    assert summary.mean_cost is None
+    assert set(summary.cost_percentiles.values()) == {None}
+    assert np.isnan(summary.trial_costs).all()
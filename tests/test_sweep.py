@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from bomer.core.exceptions import ConfigError
+from bomer.engines.cost import analyze_costs, cost_curve
+from bomer.engines.risk import analyze_risk
+from bomer.engines.sweep import SWEEP_COLUMNS, sweep_scenarios
+from bomer.synthetic import generate_bom, generate_part_numbers, generate_suppliers
+
+
+def test_sweep_matches_analysis_per_scenario():
+    parts = generate_part_numbers(60, seed=0)
+    suppliers = generate_suppliers(parts, n_suppliers=4, coverage=0.8, seed=1)
+    bom = generate_bom(parts, 80, messiness=0.0, seed=2)
+    names = [s["name"] for s in suppliers["suppliers"]]
+
+    weights = [(0.4, 0.3, 0.3), (1.0, 0.0, 0.5)]
+    volumes = [1, 250, 5000]
+    exclusions = [(), (names[0],), (names[1], names[2])]
+    table = sweep_scenarios(bom, suppliers, weights, volumes, exclusions)
+
+    assert list(table.columns) == SWEEP_COLUMNS
+    assert len(table) == 18
+    assert list(table["scenario"]) == list(range(18))
+
+    for row in table.itertuples():
+        excluded = set(row.excluded_suppliers.split(",")) - {""}
+        remaining = {
+            **suppliers,
+            "suppliers": [s for s in suppliers["suppliers"] if s["name"] not in excluded],
+        }
+        config = {
+            "cost": {"default_volume": row.volume},
+            "risk": {
+                "single_source_weight": row.single_source_weight,
+                "missing_price_weight": row.missing_price_weight,
+                "lifecycle_weight": row.lifecycle_weight,
+            },
+        }
+        cost = analyze_costs(bom, remaining, config=config)
+        risk = analyze_risk(bom, remaining, config=config)
+        assert row.unit_cost == pytest.approx(cost.total_cost, abs=1e-4)
+        assert row.total_cost == pytest.approx(cost.total_cost * row.volume, rel=1e-9, abs=1e-3)
+        assert row.missing_prices == len(cost.missing_prices)
+        assert row.risk_score == risk.risk_score
+
+
+def test_sweep_defaults_and_errors():
+    bom = pd.DataFrame({"PartNumber": ["P1", "P2"], "Quantity": [2, 1]})
+    suppliers = {"suppliers": [{"name": "A", "prices": {"P1": 0.5}}]}
+    config = {"cost": {"default_volume": 10}, "risk": {"single_source_weight": 1.0}}
+
+    table = sweep_scenarios(bom, suppliers, config=config)
+    assert len(table) == 1
+    row = table.iloc[0]
+    assert row["volume"] == 10
+    assert row["unit_cost"] == 1.0
+    assert row["missing_prices"] == 1
+    # one single-sourced line and one without suppliers, out of two
+    assert row["risk_score"] == analyze_risk(bom, suppliers, config=config).risk_score == 65.0
+
+    with pytest.raises(ConfigError, match="Unknown supplier"):
+        sweep_scenarios(bom, suppliers, exclusions=[("Z",)])
+    with pytest.raises(ConfigError, match="between 0 and 1"):
+        sweep_scenarios(bom, suppliers, weights=[(2.0, 0.0, 0.0)])
+    with pytest.raises(ConfigError, match="positive"):
+        sweep_scenarios(bom, suppliers, volumes=[0])
+
+
+@pytest.mark.parametrize("parts", [["X1", "X2"], []], ids=["unmatched", "empty"])
+def test_boms_without_catalog_matches(parts):
+    bom = pd.DataFrame({"PartNumber": pd.Series(parts, dtype=object), "Quantity": [1.0, 3.0][: len(parts)]})
+    suppliers = {"suppliers": [{"name": "A", "prices": {"P1": 0.5}}]}
+
+    table = sweep_scenarios(bom, suppliers, volumes=[1, 10], exclusions=[(), ("A",)])
+    curve = cost_curve(bom, suppliers, [1, 10])
+    cost = analyze_costs(bom, suppliers)
+
+    assert list(table["unit_cost"]) == [0.0] * 4
+    assert list(table["missing_prices"]) == [len(parts)] * 4
+    assert list(table["risk_score"]) == [analyze_risk(bom, suppliers).risk_score] * 4
+    assert list(curve["unit_cost"]) == [0.0, 0.0]
+    assert list(curve["missing_prices"]) == [len(parts)] * 2
+    assert cost.total_cost == 0.0
+    assert cost.missing_prices == parts
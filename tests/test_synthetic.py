@@ -0,0 +1,25 @@
+from bomer.core.catalog import SupplierCatalog
+from bomer.core.schema import normalize_bom_columns
+from bomer.engines.cost import analyze_costs
+from bomer.synthetic import generate_bom, generate_part_numbers, generate_suppliers
+
+
+def test_generators_are_seeded_and_follow_parameters():
+    parts = generate_part_numbers(2000, seed=1)
+    assert len(set(parts)) == 2000
+
+    suppliers = generate_suppliers(parts, n_suppliers=4, coverage=0.5, seed=2)
+    assert suppliers == generate_suppliers(parts, n_suppliers=4, coverage=0.5, seed=2)
+    priced = set().union(*(s["prices"] for s in suppliers["suppliers"]))
+    assert 0.4 < len(priced) / len(parts) < 0.6
+
+    bom = generate_bom(parts, 1000, duplicate_rate=0.25, messiness=0.5, seed=3)
+    assert bom.equals(generate_bom(parts, 1000, duplicate_rate=0.25, messiness=0.5, seed=3))
+    assert list(bom.columns) == ["MPN", "Qty", "Mfr", "Description", "Lifecycle", "RefDes"]
+
+    normalized = normalize_bom_columns(bom)
+    assert normalized["PartNumber"].str.strip().str.upper().nunique() == 750
+    assert normalized["Quantity"].isna().any()
+
+    summary = analyze_costs(normalized, SupplierCatalog.from_dict(suppliers))
+    assert 0 < len(summary.missing_prices) < len(normalized)